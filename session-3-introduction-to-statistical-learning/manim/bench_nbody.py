@@ -0,0 +1,46 @@
+import argparse
+import time
+
+import numpy as np
+
+from nbody import barnes_hut_accelerations, pairwise_accelerations, random_cluster
+
+
+# Accuracy vs. speed of the Barnes-Hut force mode against the exact direct sum.
+# Usage: python bench_nbody.py --bodies 1000 5000 20000 --theta 0.3 0.5 0.8
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Barnes-Hut against the direct N-body sum.")
+    parser.add_argument("--bodies", type=int, nargs="+", default=[500, 2000, 10000])
+    parser.add_argument("--theta", type=float, nargs="+", default=[0.3, 0.5, 0.8])
+    parser.add_argument("--leaf-size", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'N':>8} {'method':>12} {'theta':>6} {'time (s)':>10} {'speedup':>8} {'median err':>11} {'p99 err':>9}")
+    for n in args.bodies:
+        positions, _, masses = random_cluster(n, seed=args.seed)
+        # Give the disc some thickness so the tree is a real octree
+        positions[:, 2] = np.random.default_rng(args.seed).normal(0, 0.2, n)
+
+        exact, direct_time = timed(pairwise_accelerations, positions, masses, chunk_size=1000)
+        print(f"{n:>8} {'direct':>12} {'-':>6} {direct_time:>10.3f} {1.0:>8.2f} {0.0:>11.2e} {0.0:>9.2e}")
+
+        exact_norm = np.linalg.norm(exact, axis=1)
+        for theta in args.theta:
+            approx, bh_time = timed(barnes_hut_accelerations, positions, masses, theta=theta,
+                                    leaf_size=args.leaf_size)
+            rel_err = np.linalg.norm(approx - exact, axis=1) / exact_norm
+            print(f"{n:>8} {'barnes_hut':>12} {theta:>6.2f} {bh_time:>10.3f} {direct_time / bh_time:>8.2f} "
+                  f"{np.median(rel_err):>11.2e} {np.percentile(rel_err, 99):>9.2e}")
+
+
+if __name__ == "__main__":
+    main()
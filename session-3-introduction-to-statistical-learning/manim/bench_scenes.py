@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from render_all import discover_scenes
+
+
+# Benchmark suite for the scenes, with regression tracking.
+# Usage: python bench_scenes.py [--only SceneA ...] [--no-stress] [--repeat N]
+#                               [--baseline FILE] [--threshold 0.1] [--save-baseline]
+#
+# Every scene is rendered headless at low quality, one at a time, with caching
+# disabled and the global seed fixed by manim.cfg. For each scene we record the
+# render time, time per frame, peak RSS of the manim process and output size.
+# Each run is appended to media/benchmarks/history.jsonl and compared against
+# the baseline; any metric that got worse by more than --threshold is reported
+# as a regression (and the exit code is 1).
+
+HERE = Path(__file__).resolve().parent
+BENCH_DIR = HERE / "media" / "benchmarks"
+
+# Production-scale variants, defined in stress_scenes.py
+STRESS_SCENES = ["LorenzAttractorStress", "ThreeBodyProblemLoopStress", "SDE_SceneStress"]
+
+# Metrics compared against the baseline (all of them: lower is better)
+METRICS = ["seconds", "ms_per_frame", "peak_rss_mb"]
+
+
+def count_frames(path):
+    # Number of video frames in a rendered file, if ffprobe is available
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None or path.suffix not in (".mp4", ".mov", ".webm", ".gif"):
+        return None
+    result = subprocess.run(
+        [ffprobe, "-v", "error", "-select_streams", "v:0", "-count_packets",
+         "-show_entries", "stream=nb_read_packets", "-of", "csv=p=0", str(path)],
+        capture_output=True, text=True)
+    return int(result.stdout.strip()) if result.returncode == 0 and result.stdout.strip().isdigit() else None
+
+
+def bench_scene(module, scene, media_dir):
+    # Render one scene in a fresh manim process and measure it
+    command = [sys.executable, "-m", "manim", "render", "-ql", "--disable_caching", "--media_dir", str(media_dir),
+               module, scene]
+    with tempfile.TemporaryFile() as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=HERE, stdout=log, stderr=subprocess.STDOUT)
+        # wait4 gives the resource usage of this child only (ru_maxrss is in KB on Linux)
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        log.seek(0)
+        output_log = log.read().decode(errors="replace")
+
+    if process.returncode != 0:
+        return {"status": "failed", "error": output_log[-2000:]}
+
+    outputs = [p for p in (media_dir / "videos" / Path(module).stem).rglob(f"{scene}.*")
+               if "partial_movie_files" not in p.parts]
+    output = max(outputs, key=lambda p: p.stat().st_mtime) if outputs else None
+    frames = count_frames(output) if output else None
+    return {
+        "status": "ok",
+        "seconds": round(seconds, 3),
+        "frames": frames,
+        "ms_per_frame": round(1e3 * seconds / frames, 3) if frames else None,
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "output_bytes": output.stat().st_size if output else None,
+    }
+
+
+def git_commit():
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def compare(results, baseline, threshold):
+    # Metrics that are more than `threshold` (a fraction) worse than in the baseline
+    regressions = []
+    for scene, result in results.items():
+        base = baseline.get("results", {}).get(scene)
+        if result["status"] != "ok" or not base or base.get("status") != "ok":
+            continue
+        for metric in METRICS:
+            new, old = result.get(metric), base.get(metric)
+            if new is None or not old:
+                continue
+            change = new / old - 1
+            if change > threshold:
+                regressions.append((scene, metric, old, new, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scene renders and track regressions.")
+    parser.add_argument("--only", nargs="+", metavar="SCENE", help="Benchmark only these scenes")
+    parser.add_argument("--no-stress", action="store_true", help="Skip the production-scale variants")
+    parser.add_argument("--repeat", type=int, default=1, help="Render each scene N times and keep the fastest")
+    parser.add_argument("--baseline", type=Path, default=BENCH_DIR / "baseline.json")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown, e.g. 0.1 for 10%%")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args()
+
+    scenes = [(s["module"], s["scene"]) for s in discover_scenes()]
+    if not args.no_stress:
+        scenes += [("stress_scenes.py", name) for name in STRESS_SCENES]
+    if args.only:
+        scenes = [(module, scene) for module, scene in scenes if scene in args.only]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as media_dir:
+        for module, scene in scenes:
+            runs = [bench_scene(module, scene, Path(media_dir)) for _ in range(args.repeat)]
+            ok = [r for r in runs if r["status"] == "ok"]
+            result = min(ok, key=lambda r: r["seconds"]) if ok else runs[-1]
+            results[scene] = result
+            if result["status"] == "ok":
+                per_frame = f"{result['ms_per_frame']:8.1f}" if result["ms_per_frame"] else f"{'-':>8}"
+                print(f"{scene:<30} {result['seconds']:>8.2f}s {per_frame} ms/frame "
+                      f"{result['peak_rss_mb']:>8.1f} MB RSS {result['output_bytes'] / 1e6:>7.2f} MB out")
+            else:
+                print(f"{scene:<30} FAILED")
+
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "results": results,
+    }
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    with open(BENCH_DIR / "history.jsonl", "a") as history:
+        history.write(json.dumps(run) + "\n")
+
+    exit_code = 0 if all(r["status"] == "ok" for r in results.values()) else 1
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline, args.threshold)
+        print(f"\nCompared with baseline from {baseline.get('timestamp')} ({baseline.get('commit')}):")
+        for scene, metric, old, new, change in regressions:
+            print(f"  REGRESSION {scene:<30} {metric:<13} {old:>10} -> {new:<10} (+{100 * change:.1f}%)")
+        if not regressions:
+            print(f"  no regressions above {100 * args.threshold:.0f}%")
+        else:
+            exit_code = 1
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(run, indent=2))
+        print(f"Saved baseline to {args.baseline}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
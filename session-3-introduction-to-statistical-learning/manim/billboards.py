@@ -0,0 +1,76 @@
+from manim import *
+import numpy as np
+
+
+def camera_view(camera):
+    # The ThreeDCamera's current view: (rotation matrix, frame center, focal distance, zoom).
+    # The matrix is made from the angle trackers, not taken from the camera, which only
+    # refreshes its copy when it starts drawing a frame (after the updaters have run).
+    return (
+        camera.generate_rotation_matrix(),
+        np.array(camera.frame_center),
+        camera.get_focal_distance(),
+        camera.get_zoom(),
+    )
+
+
+def project(points, view):
+    # Project a whole (N, 3) array of world points to the screen, like
+    # ThreeDCamera.project_points, with one matrix multiply.
+    # Returns (screen points (N, 3) with z = 0, depth (N,), perspective scale (N,)).
+    rotation, center, focal_distance, zoom = view
+    rotated = (np.asarray(points, dtype=float) - center) @ rotation.T
+    depth = rotated[:, 2]
+    # Points behind the camera are thrown off screen, as the camera does
+    scale = zoom * np.where(depth < focal_distance, focal_distance / (focal_distance - depth), 1e6)
+    screen = rotated * scale[:, np.newaxis]
+    screen[:, 2] = 0
+    return screen, depth, scale
+
+
+class BillboardParticles(VGroup):
+    # Many 3D particles drawn as flat discs that always face the camera.
+    # A Sphere is a mesh of faces that the camera re-projects and depth-sorts every frame;
+    # here every particle position (and every trail point) is projected in one matrix
+    # multiply per frame, each disc is a copy of one unit-circle outline moved and scaled
+    # in the same NumPy pass, and the discs are drawn far to near.
+    # The group is drawn in screen coordinates, so add it with add_fixed_in_frame_mobjects,
+    # then call set_view with the world positions (and optionally trails) every frame.
+    def __init__(self, camera, positions, colors=WHITE, radius=0.05, trail_width=1.5, trail_opacity=0.6, **kwargs):
+        super().__init__(**kwargs)
+        self.camera = camera
+        self.radius = radius
+        n = len(positions)
+        colors = colors if isinstance(colors, (list, tuple)) else [colors] * n
+        self.outline = Circle(radius=1, num_components=9).get_points()
+
+        self.trails = VGroup(*[
+            VMobject(stroke_color=color, stroke_width=trail_width, stroke_opacity=trail_opacity)
+            for color in colors
+        ])
+        self.discs = [VMobject(fill_color=color, fill_opacity=1, stroke_width=0) for color in colors]
+        self.particles = VGroup(*self.discs)
+        self.add(self.trails, self.particles)
+        self.set_view(positions)
+
+    def set_view(self, positions, trails=None):
+        # positions: (N, 3) world points. trails: optional list of N (T_i, 3) world polylines.
+        n = len(positions)
+        trails = [] if trails is None else list(trails)
+        points = np.concatenate([np.asarray(positions, dtype=float).reshape(-1, 3), *trails])
+        screen, depth, scale = project(points, camera_view(self.camera))
+
+        # Every disc outline at once: (N, points per outline, 3)
+        outlines = screen[:n, np.newaxis] + (self.radius * scale[:n])[:, np.newaxis, np.newaxis] * self.outline
+        for disc, outline in zip(self.discs, outlines):
+            disc.points = outline
+        self.particles.submobjects = [self.discs[i] for i in np.argsort(depth[:n], kind="stable")]
+
+        if trails:
+            ends = np.cumsum([len(trail) for trail in trails])
+            for trail, points in zip(self.trails, np.split(screen[n:], ends[:-1])):
+                if len(points) > 1:
+                    trail.set_points_as_corners(points)
+                else:
+                    trail.clear_points()
+        return self
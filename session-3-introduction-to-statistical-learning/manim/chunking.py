@@ -0,0 +1,74 @@
+from manim import *
+import os
+
+
+# Chunked rendering of long, updater-driven waits.
+# render_all.py can split one scene over several manim processes. Each process
+# gets MANIM_CHUNK="k/n" in its environment and renders only the k-th of n
+# equal slices of the scene's long segment; the encoded slices are then joined
+# losslessly with ffmpeg. Scenes opt in by mixing in ChunkedScene and calling
+# self.chunked_wait(duration) instead of self.wait(duration).
+#
+# Everything before the long segment is rendered by the first chunk only, and
+# everything after it by the last chunk only (the other chunks still run it, in
+# skipped sections, so the scene state is the same).
+
+CHUNK_ENV = "MANIM_CHUNK"
+
+
+def current_chunk():
+    # (index, count) of the slice this process renders; (0, 1) for a normal render
+    spec = os.environ.get(CHUNK_ENV)
+    if not spec:
+        return 0, 1
+    index, count = (int(x) for x in spec.split("/"))
+    return index, count
+
+
+def chunk_frames(total_frames, index, count):
+    # First and one-past-last frame of slice `index` out of `count`
+    bounds = np.linspace(0, total_frames, count + 1).round().astype(int)
+    return bounds[index], bounds[index + 1]
+
+
+class ChunkedScene:
+    # Mix in before the Scene class, e.g. class LorenzAttractor(ChunkedScene, ThreeDScene)
+    def setup(self):
+        super().setup()
+        self.chunk_index, self.chunk_count = current_chunk()
+        if self.chunk_index > 0:
+            self.next_section("before chunk", skip_animations=True)
+
+    def fast_forward(self, frames):
+        # Advance every updater through `frames` frames without rendering them.
+        # This replays exactly the time steps a wait would take, so the state
+        # at the end is the same as in an uninterrupted render.
+        dt = 1 / config.frame_rate
+        for _ in range(frames):
+            self.update_mobjects(dt)
+            self.update_self(dt)
+
+    def chunked_wait(self, duration, seek=None):
+        # Drop-in for self.wait(duration) that renders only this process's slice.
+        # `seek(seconds)` can restore the state at a time directly (e.g. from a
+        # precomputed trajectory); without it the updaters are fast-forwarded.
+        if self.chunk_count == 1:
+            self.wait(duration)
+            return
+
+        fps = config.frame_rate
+        total_frames = int(np.ceil(duration * fps))  # Frames in an uninterrupted wait(duration)
+        start, end = chunk_frames(total_frames, self.chunk_index, self.chunk_count)
+
+        self.next_section(f"chunk {self.chunk_index}")
+        if start:
+            if seek is not None:
+                seek(start / fps)
+            else:
+                self.fast_forward(start)
+        if end > start:
+            # Half a frame short, so rounding can never add a frame to the slice
+            self.wait((end - start - 0.5) / fps)
+
+        if self.chunk_index < self.chunk_count - 1:
+            self.next_section("after chunk", skip_animations=True)
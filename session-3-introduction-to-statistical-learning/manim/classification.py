@@ -0,0 +1,77 @@
+import numpy as np
+
+
+# Two-class classification engine for ClassificationScene.
+# Clusters are sampled in one call, a logistic regression is fitted with
+# gradient steps on (mini-)batches, and its probabilities are evaluated over a
+# whole grid of points at once, so decision regions can be drawn as one image.
+
+
+def sample_clusters(n_per_class, centers, scale=0.8, seed=0):
+    # Gaussian clusters around each center, all drawn in one call.
+    # Returns (points (n_classes * n_per_class, D), labels) with the classes in order.
+    rng = np.random.default_rng(seed)
+    centers = np.asarray(centers, dtype=float)
+    points = centers[:, np.newaxis, :] + rng.normal(scale=scale, size=(len(centers), n_per_class, centers.shape[1]))
+    return points.reshape(-1, centers.shape[1]), np.repeat(np.arange(len(centers)), n_per_class)
+
+
+def sigmoid(z):
+    return 0.5 * (1 + np.tanh(0.5 * z))  # The same as 1 / (1 + exp(-z)), without overflow
+
+
+class LogisticRegression:
+    # P(class 1 | x) = sigmoid(w . x + b), fitted by gradient descent on the mean log loss.
+    # Features are standardized while fitting, which keeps one learning rate good for any
+    # scale of data; the recorded weights are mapped back to the original features.
+    def __init__(self, steps=200, learning_rate=0.5, batch_size=None, seed=0):
+        self.steps = steps
+        self.learning_rate = learning_rate
+        self.batch_size = batch_size  # None: every point at every step
+        self.seed = seed
+
+    def fit(self, X, y):
+        X, y = np.asarray(X, dtype=float), np.asarray(y, dtype=float)
+        rng = np.random.default_rng(self.seed)
+        mean, std = X.mean(axis=0), X.std(axis=0)
+        Z = (X - mean) / std
+        batches = None if self.batch_size is None else rng.integers(len(X), size=(self.steps, self.batch_size))
+
+        theta = np.zeros(X.shape[1] + 1)  # Standardized weights, then bias
+        history = [theta.copy()]
+        for step in range(self.steps):
+            Zb, yb = (Z, y) if batches is None else (Z[batches[step]], y[batches[step]])
+            error = sigmoid(Zb @ theta[:-1] + theta[-1]) - yb
+            theta[:-1] -= self.learning_rate * (Zb.T @ error) / len(Zb)
+            theta[-1] -= self.learning_rate * error.mean()
+            history.append(theta.copy())
+
+        # (steps + 1, D + 1) weights and bias on the original features, after each step
+        history = np.array(history)
+        weights = history[:, :-1] / std
+        self.history = np.column_stack([weights, history[:, -1] - weights @ mean])
+        self.weights, self.bias = self.history[-1, :-1], self.history[-1, -1]
+        return self
+
+    def decision_function(self, X, step=-1):
+        # The logit w . x + b of every row, with the weights after the given step
+        return np.asarray(X, dtype=float) @ self.history[step, :-1] + self.history[step, -1]
+
+    def predict_proba(self, X, step=-1):
+        # P(class 1) of every row
+        return sigmoid(self.decision_function(X, step))
+
+    def predict(self, X):
+        return (self.decision_function(X) > 0).astype(int)
+
+
+def probability_grid(model, x_range, y_range, resolution=(384, 216), step=-1):
+    # P(class 1) and the distance to the decision boundary (w . x + b = 0) at every cell of
+    # a regular grid, in one vectorized pass. Both (ny, nx), with row 0 at y_range[0].
+    xs = np.linspace(*x_range, resolution[0])
+    ys = np.linspace(*y_range, resolution[1])
+    X, Y = np.meshgrid(xs, ys)
+    logit = model.decision_function(np.stack([X.ravel(), Y.ravel()], axis=1), step).reshape(X.shape)
+    norm = np.linalg.norm(model.history[step, :-1])
+    distance = np.abs(logit) / norm if norm > 0 else np.full(logit.shape, np.inf)  # No boundary before training
+    return sigmoid(logit), distance
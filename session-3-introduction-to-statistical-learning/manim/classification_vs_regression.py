@@ -1,68 +1,100 @@
 from manim import *
 import numpy as np
 
+from classification import LogisticRegression, probability_grid, sample_clusters
+from glyph_cache import cached_text
+from point_cloud import PointCloud
+
 
 class ClassificationScene(Scene):
+    # Points per class, and the resolution of the probability image (about one cell per
+    # 3-4 pixels at 1080p). Large classes are drawn with smaller points.
+    num_points = 25
+    resolution = (480, 270)
+    seed = 0
+
     def construct(self):
         self.camera.background_color = "#202020"  # Dark grey background
 
         # 1. Title
-        title = Text("Classification", font_size=48, color=BLUE).to_edge(UP)
+        title = cached_text("Classification", font_size=48, color=BLUE).to_edge(UP)
         self.play(Write(title))
         self.wait(0.5)
 
         # 2. Generate Data Points (Two Classes, no axes)
-        np.random.seed(0)
-        num_points = 25
-
-        # Class A (e.g., Apples - Red)
-        # We define their positions relative to a center point
-        class_A_center = RIGHT * 2 + DOWN * 0.5
-        class_A_points = VGroup()
-        for _ in range(num_points):
-            offset = np.random.normal(scale=0.8, size=3)  # Random x,y,z offset
-            offset[2] = 0  # Ensure it's 2D
-            class_A_points.add(Dot(class_A_center + offset, color=RED_E, radius=0.08))
-
-        # Class B (e.g., Oranges - Orange)
-        class_B_center = LEFT * 2 + UP * 0.5
-        class_B_points = VGroup()
-        for _ in range(num_points):
-            offset = np.random.normal(scale=0.8, size=3)
-            offset[2] = 0
-            class_B_points.add(Dot(class_B_center + offset, color=ORANGE, radius=0.08))
+        # Class A (e.g., Apples - Red) and Class B (e.g., Oranges - Orange), both sampled in one call
+        class_colors = [RED_E, ORANGE]
+        centers = np.array([[2.0, -0.5], [-2.0, 0.5]])
+        points, labels = sample_clusters(self.num_points, centers, scale=0.8, seed=self.seed)
+
+        radius = 0.08 if self.num_points <= 300 else 0.02
+        class_A_points, class_B_points = [
+            PointCloud(points[labels == c], colors=color, radius=radius) for c, color in enumerate(class_colors)
+        ]
 
         self.play(FadeIn(class_A_points, shift=UP), FadeIn(class_B_points, shift=DOWN))
         self.wait(1)
 
-        # 3. Draw Decision Boundary (Vertical Line)
-        decision_boundary_line = Line(
-            UP * 3.5,
-            DOWN * 3.5,
-            color=WHITE,
-            stroke_width=4,
-            z_index=2
-        ).move_to(ORIGIN)
-
-        db_label = Text("Decision Boundary", font_size=24, color=WHITE).next_to(decision_boundary_line, UP + RIGHT,
-                                                                                buff=0.1)
-
-        self.play(Create(decision_boundary_line), Write(db_label))
+        # 3. Learn the Decision Boundary
+        # A logistic regression for P(Orange); its boundary is where that is one half
+        model = LogisticRegression(batch_size=None if len(points) <= 4096 else 256, seed=self.seed).fit(points, labels)
+
+        # The whole screen is classified in one pass and drawn as a single image: shaded by
+        # how sure the model is, with the boundary as a thin white band
+        x_range = (-config.frame_width / 2, config.frame_width / 2)
+        y_range = (-config.frame_height / 2, config.frame_height / 2)
+        region_rgb = np.array([ManimColor(color).to_rgb() for color in class_colors]) * 255
+        boundary_width = 0.03  # Half-width of the boundary line, in scene units
+
+        def region_pixels(step):
+            p, distance = probability_grid(model, x_range, y_range, self.resolution, step)
+            pixels = np.empty(p.shape + (4,))
+            pixels[..., :3] = np.where((p > 0.5)[..., np.newaxis], region_rgb[1], region_rgb[0])
+            pixels[..., 3] = 255 * 0.5 * np.abs(2 * p - 1)
+            pixels[distance < boundary_width] = 255
+            return pixels[::-1]  # Image rows run from the top down
+
+        regions = ImageMobject(region_pixels(0).astype(np.uint8))
+        regions.stretch_to_fit_width(config.frame_width).stretch_to_fit_height(config.frame_height)
+        regions.set_z_index(-1)
+
+        # Label the boundary where it crosses the top of the picture
+        w, b = model.weights, model.bias
+        top = 2.9
+        boundary_top = np.array([-(w[1] * top + b) / w[0], top, 0]) if abs(w[0]) > 1e-9 else UP * top
+        db_label = cached_text("Decision Boundary", font_size=24, color=WHITE).next_to(boundary_top, RIGHT, buff=0.2)
+
+        # Training: every frame shows the regions after one more batch of gradient steps
+        step = ValueTracker(0)
+
+        def update_regions(mob):
+            regions.pixel_array[:] = region_pixels(int(step.get_value()))
+
+        regions.add_updater(update_regions)
+        self.add(regions)
+        self.play(step.animate.set_value(model.steps), run_time=3, rate_func=linear)
+        regions.remove_updater(update_regions)
+        self.play(Write(db_label))
         self.wait(1)
 
         # 4. Classify a New Point
-        new_point_pos = RIGHT * 1.0 + UP * 2.0  # Clearly on the "Red" side
+        new_point = np.array([1.0, 2.0])
+        new_point_pos = np.array([*new_point, 0])
         new_point_mobj = Dot(new_point_pos, color=YELLOW, radius=0.15, z_index=3)
-        new_point_label = Text("New Fruit", font_size=20, color=YELLOW).next_to(new_point_mobj, RIGHT, buff=0.1)
+        new_point_label = cached_text("New Fruit", font_size=20, color=YELLOW).next_to(new_point_mobj, RIGHT, buff=0.1)
 
         self.play(FadeIn(new_point_mobj, scale=0.5), Write(new_point_label))
         self.wait(1)
 
         # 5. Illustrate classification by changing color
+        p_orange = model.predict_proba(new_point[np.newaxis])[0]
+        predicted = int(p_orange > 0.5)
+        confidence = max(p_orange, 1 - p_orange)
         self.play(
-            new_point_mobj.animate.set_color(RED_E),
+            new_point_mobj.animate.set_color(class_colors[predicted]),
             new_point_label.animate.become(
-                Text("Classified as Apple", font_size=20, color=RED_E).next_to(new_point_mobj, RIGHT, buff=0.1))
+                cached_text(f"Classified as {['Apple', 'Orange'][predicted]} ({confidence:.0%})", font_size=20,
+                            color=class_colors[predicted]).next_to(new_point_mobj, RIGHT, buff=0.1))
         )
         self.wait(2)
 
@@ -102,9 +134,7 @@ class RegressionScene(Scene):
         # True relationship: price = 0.7 * size + 1.5 + noise
         house_prices = 0.7 * house_sizes + 1.5 + np.random.normal(0, 0.8, num_houses)
 
-        house_points = VGroup(*[
-            Dot(axes.c2p(s, p), color=WHITE, radius=0.06) for s, p in zip(house_sizes, house_prices)
-        ])
+        house_points = PointCloud.from_axes(axes, house_sizes, house_prices, colors=WHITE, radius=0.06)
 
         self.play(FadeIn(house_points, shift=DOWN))
         self.wait(1)
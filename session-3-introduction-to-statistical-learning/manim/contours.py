@@ -0,0 +1,29 @@
+from manim import *
+import numpy as np
+
+from point_cloud import axes_to_screen
+from pso import evaluate_grid
+
+
+# Filled-contour images of surfaces over a pair of axes, shared by the scenes that
+# draw an objective or loss landscape behind their data.
+
+
+def contour_image(axes, objective, x_range, y_range, resolution=(320, 200), bands=14, opacity=0.7):
+    # The objective surface as filled contour bands, computed once on a grid and
+    # shown as a single image behind the search space (low values dark blue, high red)
+    _, _, Z = evaluate_grid(objective, x_range, y_range, resolution)
+    return band_image(axes, Z, x_range, y_range, bands, opacity)
+
+
+def band_image(axes, Z, x_range, y_range, bands=14, opacity=0.7):
+    # Values on a regular grid over x_range, y_range (row 0 at y_range[0]) as log-spaced
+    # filled contour bands, in one image covering that part of the axes
+    levels = np.log1p(Z - Z.min())
+    levels = np.minimum((levels / levels.max() * bands).astype(int), bands - 1)
+    palette = np.array([
+        [*color.to_rgb(), opacity] for color in color_gradient([BLUE_E, TEAL_E, GREEN_E, YELLOW_E, RED_E], bands)
+    ]) * 255
+    image = ImageMobject(palette[levels[::-1]].astype(np.uint8))  # Image rows run from the top down
+    image.stretch_to_fit_width(axes.x_length).stretch_to_fit_height(axes.y_length)
+    return image.move_to(axes_to_screen(axes, np.mean(x_range), np.mean(y_range)))
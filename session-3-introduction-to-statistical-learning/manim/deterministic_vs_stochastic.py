@@ -1,7 +1,74 @@
 from manim import *
+import functools
 import numpy as np
 
+from chunking import ChunkedScene
+from glyph_cache import CachedDecimal, cached_tex, cached_text
+from nbody import NBodySystem
+from point_cloud import PointCloud, axes_to_screen
+from sde import brownian, brownian_path_chunks, euler_maruyama, geometric_brownian_motion, path_statistics
+from trails import FadingTrail
+
+
+def polylines_to_bezier_points(corners):
+    # Turn (paths, corners, 3) polylines into the point array of one VMobject
+    # holding every polyline as its own subpath, made of straight cubic Beziers.
+    start, end = corners[:, :-1], corners[:, 1:]
+    curves = np.stack([start, start + (end - start) / 3, start + 2 * (end - start) / 3, end], axis=2)
+    return curves.reshape(-1, 3)
+
+
+@functools.lru_cache(maxsize=None)
+def vertical_brace(length):
+    # A brace pointing RIGHT along a vertical segment of the given length.
+    # Cached per length, so a moving brace is only ever built once per size.
+    return Brace(Line(ORIGIN, UP * length), direction=RIGHT, buff=0)
+
+
+class SDEFan(VGroup):
+    # A fan of precomputed SDE sample paths revealed over time, with their
+    # running mean and a quantile band. All paths share one VMobject, so
+    # drawing hundreds of paths costs about the same as drawing one.
+    def __init__(self, axes, t, X, color=RED, speed=1.0, quantiles=(0.05, 0.95), **kwargs):
+        super().__init__(**kwargs)
+        y_min, y_max = axes.y_range[:2]
+        mean, band = path_statistics(X, quantiles)
+
+        # Everything is mapped to the screen once, up front (values clipped to the plot)
+        self.t = t
+        self.path_points = axes_to_screen(axes, t[:, np.newaxis], np.clip(X, y_min, y_max)).transpose(1, 0, 2)
+        self.mean_points = axes_to_screen(axes, t, np.clip(mean, y_min, y_max))
+        self.band_points = axes_to_screen(axes, t, np.clip(band, y_min, y_max))
+        self.speed = speed
+        self.time = 0.0
+
+        n_paths = X.shape[1]
+        self.band = VMobject().set_fill(color, opacity=0.25).set_stroke(width=0)
+        self.paths = VMobject().set_stroke(color, width=1, opacity=np.clip(30 / n_paths, 0.05, 0.6))
+        self.mean_line = VMobject().set_stroke(YELLOW, width=3)
+        self.add(self.band, self.paths, self.mean_line)
+
+        self.add_updater(lambda m, dt: m.update_fan(dt))
+
+    def update_fan(self, dt):
+        self.time += dt * self.speed
+        k = np.searchsorted(self.t, self.time, side="right")  # Number of samples to show
+        if k < 2:
+            return self
+
+        self.paths.set_points(polylines_to_bezier_points(self.path_points[:, :k]))
+        self.mean_line.set_points_as_corners(self.mean_points[:k])
+        # The band outline runs along the upper quantile and back along the lower one
+        self.band.set_points_as_corners(np.concatenate([
+            self.band_points[1, :k], self.band_points[0, k - 1::-1], self.band_points[1, :1]
+        ]))
+        return self
+
+
 class DeterministicVsStochasticFinal(Scene):
+    # Seed of the Brownian paths, so every render draws the same ones
+    seed = 0
+
     def construct(self):
 
         # --------------------------------------------------
@@ -92,29 +159,25 @@ class DeterministicVsStochasticFinal(Scene):
 
         self.play(Create(axes_stoch), Write(axes_labels))
 
-        # Brownian motion generator
-        def generate_brownian_path(n_steps, total_time):
-            dt = total_time / n_steps
-            dW = np.random.normal(scale=np.sqrt(dt), size=n_steps - 1)
-            W = np.zeros(n_steps)
-            W[1:] = np.cumsum(dW)
-            x_vals = np.linspace(0, total_time, n_steps)
-            return x_vals, W
-
+        # Brownian motion is streamed in chunks: each segment is generated only
+        # when the animation reaches it, so long horizons never sit in memory
         n_steps = 200
         total_time = 10
+        chunk_steps = 50
+        dt = total_time / n_steps
         path_colors = [ORANGE, YELLOW, PINK]
+        rng = np.random.default_rng(self.seed)  # One seeded Generator, so its state carries across chunks and paths
 
         # Draw 3 independent realizations
         for i in range(3):
-            x_vals, y_vals = generate_brownian_path(n_steps, total_time)
-            current_plot = axes_stoch.plot_line_graph(
-                x_values=x_vals,
-                y_values=y_vals,
-                line_color=path_colors[i],
-                add_vertex_dots=False
-            )
-            self.play(Create(current_plot, run_time=1.0))
+            for x_vals, y_vals in brownian_path_chunks(chunk_steps, dt, total_time=total_time, seed=rng):
+                segment_plot = axes_stoch.plot_line_graph(
+                    x_values=x_vals,
+                    y_values=y_vals,
+                    line_color=path_colors[i],
+                    add_vertex_dots=False
+                )
+                self.play(Create(segment_plot), run_time=chunk_steps / n_steps, rate_func=linear)
             self.wait(0.3)
 
         trace_label_stoch = Text("Different path each time", font_size=18, color=RED)\
@@ -129,6 +192,10 @@ class DeterministicVsStochasticFinal(Scene):
 
 
 class ChaosVsRandomness(Scene):
+    # Number of SDE sample paths on the right side, and the seed they are drawn with
+    num_paths = 100
+    seed = 0
+
     def construct(self):
         # 0. Global Setup
         self.camera.background_color = "#1a1a2e"  # Dark space background
@@ -173,73 +240,35 @@ class ChaosVsRandomness(Scene):
         v3 = np.array([0.7, 0.0, 0.0])
         color3 = GREEN_C
 
+        # The 3-body state lives in contiguous arrays inside the shared N-body engine
+        system = NBodySystem([p1, p2, p3], [v1, v2, v3], [m1, m2, m3], G=G_3body, softening=0.1)
+        colors = [color1, color2, color3]
+
         # Create Mobjects for the bodies
-        body1 = Dot(color=color1, radius=0.25).move_to(p1).set_z_index(3)
-        body2 = Dot(color=color2, radius=0.15).move_to(p2).set_z_index(3)
-        body3 = Dot(color=color3, radius=0.10).move_to(p3).set_z_index(3)
-        self.add(body1, body2, body3)
-
-        bodies_data = [
-            {"mobj": body1, "pos": p1, "vel": v1, "mass": m1, "color": color1, "prev_pos": p1,
-             "path_segments": VGroup().set_z_index(1)},
-            {"mobj": body2, "pos": p2, "vel": v2, "mass": m2, "color": color2, "prev_pos": p2,
-             "path_segments": VGroup().set_z_index(1)},
-            {"mobj": body3, "pos": p3, "vel": v3, "mass": m3, "color": color3, "prev_pos": p3,
-             "path_segments": VGroup().set_z_index(1)},
-        ]
-
-        for body_data in bodies_data:
-            self.add(body_data["path_segments"])
+        bodies = VGroup(*[
+            Dot(color=color, radius=radius).move_to(pos).set_z_index(3)
+            for pos, color, radius in zip(system.positions, colors, [0.25, 0.15, 0.10])
+        ])
+        self.add(bodies)
+
+        trails = VGroup(*[
+            FadingTrail(body.get_center, color, stroke_width=2, max_points=40, min_distance=0.05)
+            for body, color in zip(bodies, colors)
+        ]).set_z_index(1)
+        self.add(trails)
 
         # Physics Updater for 3-Body
         def update_nbody_physics(mobj, dt):
-            current_bodies_data = list(bodies_data)
-            accelerations = [np.array([0.0, 0.0, 0.0])] * len(current_bodies_data)
-
-            for i in range(len(current_bodies_data)):
-                for j in range(len(current_bodies_data)):
-                    if i != j:
-                        body_i = current_bodies_data[i];
-                        body_j = current_bodies_data[j]
-                        r_vec = body_j["pos"] - body_i["pos"]
-                        r_mag_sq = np.dot(r_vec, r_vec)
-                        r_mag = np.sqrt(r_mag_sq)
-                        epsilon = 0.1
-                        if r_mag > epsilon:
-                            accelerations[i] += (G_3body * body_j["mass"] / r_mag_sq) * (r_vec / r_mag)
-
-            for i, body_data in enumerate(current_bodies_data):
-                body_data["vel"] += accelerations[i] * dt
-                body_data["pos"] += body_data["vel"] * dt
-                body_data["mobj"].move_to(body_data["pos"])
-
-        # Path Fading Updater (re-usable)
-        def update_fading_path(segments_vgroup, dt, body_data, max_segments):
-            current_pos = body_data["mobj"].get_center()
-            if np.linalg.norm(current_pos - body_data["prev_pos"]) > 0.05:
-                new_segment = Line(
-                    body_data["prev_pos"], current_pos,
-                    color=body_data["color"], stroke_width=2
-                )
-                segments_vgroup.add(new_segment)
-                body_data["prev_pos"] = current_pos
-
-            if len(segments_vgroup) > max_segments:
-                segments_vgroup.remove(segments_vgroup[0])
-
-            for i, segment in enumerate(segments_vgroup):
-                segment.set_stroke(opacity=(i / max_segments))
+            old_positions = system.positions.copy()
+            system.step(dt)
+            for body, delta in zip(bodies, system.positions - old_positions):
+                body.shift(delta)
 
         # Add 3-Body Updaters
         simulation_driver_3body = Dot().set_opacity(0)
         simulation_driver_3body.add_updater(update_nbody_physics)
         self.add(simulation_driver_3body)
 
-        for body_data in bodies_data:
-            body_data["path_segments"].add_updater(
-                lambda m, dt, bd=body_data: update_fading_path(m, dt, bd, max_segments=40)
-            )
-
         # --------------------------------------------------
         # RIGHT SIDE: SDE (Stochastic)
         # --------------------------------------------------
@@ -255,61 +284,13 @@ class ChaosVsRandomness(Scene):
         axes_labels = axes_stoch.get_axis_labels(x_label=Text("t", font_size=20), y_label=Text("X_t", font_size=20))
         self.play(Create(axes_stoch), Write(axes_labels))
 
-        sde_start_pos = axes_stoch.c2p(0, 0)
-
-        # Create the SDE particle
-        sde_particle = Dot(color=RED, radius=0.08).move_to(sde_start_pos).set_z_index(3)
-        self.add(sde_particle)
-
-        # Data for the SDE particle state
-        sde_particle_data = {
-            "mobj": sde_particle,
-            "t": 0.0,  # Current time in simulation
-            "val": 0.0,  # Current value (W_t)
-            "color": RED,
-            "prev_pos": sde_start_pos,
-            "path_segments": VGroup().set_z_index(1)
-        }
-        self.add(sde_particle_data["path_segments"])
-
-        # SDE Particle Updater
-        def update_sde_particle(mobj, dt):
-            data = sde_particle_data  # Get the state
-
-            # Reset logic: 25.0 / 3 paths = ~8.33 sec per path
-            if data["t"] > (animation_duration / 3.0):
-                data["t"] = 0.0
-                data["val"] = 0.0
-                data["prev_pos"] = axes_stoch.c2p(0, 0)
-                data["mobj"].move_to(axes_stoch.c2p(0, 0))
-                # Clear the old path completely
-                data["path_segments"].remove(*data["path_segments"])
-                return  # Skip the rest of the update for this frame
-
-            # Update time and value
-            data["t"] += dt
-
-            # Calculate dW (the random step)
-            # We scale sqrt(dt) to make the walk more visually apparent
-            dW = np.random.normal(scale=np.sqrt(dt)) * 2.0
-            data["val"] += dW
-
-            # Keep value within plot bounds (simple clipping)
-            if data["val"] > 4.0: data["val"] = 4.0
-            if data["val"] < -4.0: data["val"] = -4.0
-
-            new_pos = axes_stoch.c2p(data["t"], data["val"])
-            data["mobj"].move_to(new_pos)
-
-        # Add SDE Updaters
-        sde_driver = Dot().set_opacity(0)
-        sde_driver.add_updater(update_sde_particle)
-        self.add(sde_driver)
-
-        # Add the *same* fading path updater, just with different data
-        sde_particle_data["path_segments"].add_updater(
-            lambda m, dt: update_fading_path(m, dt, sde_particle_data, max_segments=100)
-        )
+        # Simulate a whole fan of Brownian paths at once (seeded, so every render matches)
+        # and reveal them over the same 25 seconds as the 3-body system
+        t_end = 25.0 / 3.0
+        t, X = euler_maruyama(*brownian(sigma=0.8), x0=0.0, t_end=t_end, n_steps=250,
+                              n_paths=self.num_paths, seed=self.seed)
+        sde_fan = SDEFan(axes_stoch, t, X, color=RED, speed=t_end / animation_duration).set_z_index(1)
+        self.add(sde_fan)
 
         # --------------------------------------------------
         # Run Both Simulations
@@ -321,18 +302,22 @@ class ChaosVsRandomness(Scene):
         self.wait(animation_duration)
 
 
-class SDE_Scene(Scene):
+class SDE_Scene(ChunkedScene, Scene):
+    # Number of sample paths in the fan, and the seed they are drawn with
+    num_paths = 300
+    seed = 0
+
     def construct(self):
         # 0. Global Setup
         self.camera.background_color = "#1a1a2e"  # Dark space background
         animation_duration = 25.0
 
         # 1. Title and Layout
-        title = Text("Stochastic Process (SDE)", font_size=36).to_edge(UP)
-        sde_formula = MathTex(r"dX_t = \mu X_t dt + \sigma X_t dW_t", font_size=32, color=RED).next_to(title, DOWN,
+        title = cached_text("Stochastic Process (SDE)", font_size=36).to_edge(UP)
+        sde_formula = cached_tex(r"dX_t = \mu X_t dt + \sigma X_t dW_t", font_size=32, color=RED).next_to(title, DOWN,
                                                                                                        buff=0.5)
         # We'll show a simpler form for the label
-        #sde_label = MathTex(r"(Simulating dX_t = dW_t)", font_size=24, color=GREY).next_to(sde_formula, DOWN, buff=0.2)
+        #sde_label = cached_tex(r"(Simulating dX_t = dW_t)", font_size=24, color=GREY).next_to(sde_formula, DOWN, buff=0.2)
 
         self.play(Write(title), Write(sde_formula))
         self.wait(0.5)
@@ -344,93 +329,36 @@ class SDE_Scene(Scene):
         # Create Axes for the plot, centered
         axes_stoch = Axes(
             x_range=[0, 8.5, 2],  # Time from 0 to 8.33
-            y_range=[-4, 4, 1],  # Value
+            y_range=[0, 5, 1],  # Value (geometric Brownian motion stays positive)
             x_length=8,  # Make it larger since it's the only element
             y_length=5,
             axis_config={"color": GREY, "include_tip": False},
         ).move_to(DOWN * 0.5)  # Center it with a slight offset down
 
-        axes_labels = axes_stoch.get_axis_labels(x_label=Text("t", font_size=24), y_label=Text("X_t", font_size=24))
+        axes_labels = axes_stoch.get_axis_labels(x_label=cached_text("t", font_size=24), y_label=cached_text("X_t", font_size=24))
         self.play(Create(axes_stoch), Write(axes_labels))
 
-        sde_start_pos = axes_stoch.c2p(0, 0)
-
-        # Create the SDE particle
-        sde_particle = Dot(color=RED, radius=0.08).move_to(sde_start_pos).set_z_index(3)
-        self.add(sde_particle)
-
-        # Data for the SDE particle state
-        sde_particle_data = {
-            "mobj": sde_particle,
-            "t": 0.0,  # Current time in simulation
-            "val": 0.0,  # Current value (W_t)
-            "color": RED,
-            "prev_pos": sde_start_pos,
-            "path_segments": VGroup().set_z_index(1)
-        }
-        self.add(sde_particle_data["path_segments"])
-
-        # Path Fading Updater
-        def update_fading_path(segments_vgroup, dt, body_data, max_segments):
-            current_pos = body_data["mobj"].get_center()
-            if np.linalg.norm(current_pos - body_data["prev_pos"]) > 0.05:
-                new_segment = Line(
-                    body_data["prev_pos"], current_pos,
-                    color=body_data["color"], stroke_width=3  # Made path slightly thicker
-                )
-                segments_vgroup.add(new_segment)
-                body_data["prev_pos"] = current_pos
-
-            if len(segments_vgroup) > max_segments:
-                segments_vgroup.remove(segments_vgroup[0])
-
-            for i, segment in enumerate(segments_vgroup):
-                segment.set_stroke(opacity=(i / max_segments))
-
-        # SDE Particle Updater
-        def update_sde_particle(mobj, dt):
-            data = sde_particle_data  # Get the state
-
-            # Reset logic: 25.0 / 3 paths = ~8.33 sec per path
-            if data["t"] > (animation_duration / 3.0):
-                data["t"] = 0.0
-                data["val"] = 0.0
-                data["prev_pos"] = axes_stoch.c2p(0, 0)
-                data["mobj"].move_to(axes_stoch.c2p(0, 0))
-                # Clear the old path completely
-                data["path_segments"].remove(*data["path_segments"])
-                return  # Skip the rest of the update for this frame
-
-            # Update time and value
-            data["t"] += dt
-
-            # Calculate dW (the random step)
-            # We scale sqrt(dt) to make the walk more visually apparent
-            dW = np.random.normal(scale=np.sqrt(dt)) * 2.0
-            data["val"] += dW
-
-            # Keep value within plot bounds (simple clipping)
-            if data["val"] > 4.0: data["val"] = 4.0
-            if data["val"] < -4.0: data["val"] = -4.0
-
-            new_pos = axes_stoch.c2p(data["t"], data["val"])
-            data["mobj"].move_to(new_pos)
-
-        # Add SDE Updaters
-        sde_driver = Dot().set_opacity(0)
-        sde_driver.add_updater(update_sde_particle)
-        self.add(sde_driver)
-
-        # Add the fading path updater
-        sde_particle_data["path_segments"].add_updater(
-            lambda m, dt: update_fading_path(m, dt, sde_particle_data, max_segments=150)  # Longer tail
-        )
+        # Simulate the geometric Brownian motion from the formula for all paths at once
+        t_end = 25.0 / 3.0
+        t, X = euler_maruyama(*geometric_brownian_motion(mu=0.05, sigma=0.3), x0=1.0, t_end=t_end, n_steps=500,
+                              n_paths=self.num_paths, seed=self.seed)
+
+        # The fan of paths, their running mean and the 5%-95% band, revealed over time
+        sde_fan = SDEFan(axes_stoch, t, X, color=RED, speed=t_end / animation_duration).set_z_index(1)
+
+        legend = VGroup(
+            cached_text("Mean", font_size=20, color=YELLOW),
+            cached_text("5%-95% band", font_size=20, color=RED),
+        ).arrange(DOWN, aligned_edge=LEFT).next_to(axes_stoch, RIGHT, buff=0.2).align_to(axes_stoch, UP)
+        self.play(FadeIn(legend))
 
         # --------------------------------------------------
         # Run Simulation
         # --------------------------------------------------
 
-        self.wait(animation_duration)
+        # The fan starts with the long wait, so its state only depends on the time waited
+        self.add(sde_fan)
+        self.chunked_wait(animation_duration)
 
 
 class StochasticProcess(Scene):
@@ -481,11 +409,9 @@ class StochasticProcess(Scene):
         self.play(Write(f_label))
 
         # 4. Generate the "real" noisy data
-        scatter_points = VGroup()
-        for x_val in np.random.uniform(0.5, 9.5, 30):
-            epsilon = np.random.normal(0, 0.8)  # The irreducible error
-            y_val = f(x_val) + epsilon
-            scatter_points.add(Dot(axes.c2p(x_val, y_val), color=WHITE, radius=0.05, fill_opacity=0.7))
+        x_vals = np.random.uniform(0.5, 9.5, 30)
+        epsilon = np.random.normal(0, 0.8, len(x_vals))  # The irreducible error
+        scatter_points = PointCloud.from_axes(axes, x_vals, f(x_vals) + epsilon, colors=GREY_A, radius=0.05)
 
         data_label = Text("Real Data: Y = f(x) + \u03B5", color=WHITE, font_size=28).to_edge(UP, buff=0.5).shift(
             RIGHT * 3)
@@ -496,68 +422,63 @@ class StochasticProcess(Scene):
         self.wait(1)
 
         # 6. Create the "Slider" animation
+        # Every slider mobject is built once and then moved or reshaped in place each frame
+        # (no always_redraw), so LaTeX only runs here and never during the slide.
         x_tracker = ValueTracker(2)  # Start slider at x=2
 
         # The vertical slider line
-        slider_line = always_redraw(
-            lambda: DashedLine(
-                axes.c2p(x_tracker.get_value(), 0),
-                axes.c2p(x_tracker.get_value(), 10),
-                stroke_width=2,
-                color=YELLOW
-            )
-        )
-        x_label = always_redraw(
-            lambda: MathTex(f"x = {x_tracker.get_value():.1f}", font_size=24)
-            .next_to(slider_line, DOWN, buff=0.1)
+        slider_line = DashedLine(
+            axes.c2p(x_tracker.get_value(), 0),
+            axes.c2p(x_tracker.get_value(), 10),
+            stroke_width=2,
+            color=YELLOW
         )
+        # Only the digits of "x = ..." change, and they come from a pre-rendered cache
+        x_label = CachedDecimal(x_tracker.get_value(), prefix="x =", num_decimal_places=1, font_size=24)
 
         # Dot for the model's prediction
-        model_dot = always_redraw(
-            lambda: Dot(
-                axes.c2p(x_tracker.get_value(), f_hat(x_tracker.get_value())),
-                color=BLUE, radius=0.08
-            )
-        )
-        model_dot_label = always_redraw(
-            lambda: MathTex("\\hat{Y}", font_size=28, color=BLUE)
-            .next_to(model_dot, RIGHT, buff=0.1)
-        )
+        model_dot = Dot(color=BLUE, radius=0.08)
+        model_dot_label = MathTex("\\hat{Y}", font_size=28, color=BLUE)
 
         # Dot for the "actual" stochastic outcome
-        # This is the key: we re-sample epsilon *inside* the updater
-        def get_actual_point():
+        actual_dot = Dot(color=RED, radius=0.08)
+        actual_dot_label = MathTex("Y", font_size=28, color=RED)
+
+        # Brace to show epsilon
+        epsilon_brace = VMobject()
+        epsilon_label = MathTex("\\epsilon", "\\text{ (Noise)}", font_size=24, color=RED)
+
+        slider = VGroup(slider_line, x_label, model_dot, actual_dot, model_dot_label, actual_dot_label,
+                        epsilon_brace, epsilon_label)
+
+        def update_slider(mob):
             x_val = x_tracker.get_value()
+
+            slider_line.set_x(axes.c2p(x_val, 0)[0])
+            x_label.set_value(x_val).next_to(slider_line, DOWN, buff=0.1)
+
+            model_dot.move_to(axes.c2p(x_val, f_hat(x_val)))
+            model_dot_label.next_to(model_dot, RIGHT, buff=0.1)
+
+            # This is the key: we re-sample epsilon *inside* the updater
             epsilon = np.random.normal(0, 0.8)  # New \epsilon every frame
-            y_val = f(x_val) + epsilon
-            return axes.c2p(x_val, y_val)
+            actual_dot.move_to(axes.c2p(x_val, f(x_val) + epsilon))
+            actual_dot_label.next_to(actual_dot, RIGHT, buff=0.1)
 
-        actual_dot = always_redraw(
-            lambda: Dot(get_actual_point(), color=RED, radius=0.08)
-        )
-        actual_dot_label = always_redraw(
-            lambda: MathTex("Y", font_size=28, color=RED)
-            .next_to(actual_dot, RIGHT, buff=0.1)
-        )
+            # Reshape the brace from a cache of braces of each (rounded) length
+            start, end = model_dot.get_center(), actual_dot.get_center()
+            length = round(max(abs(end[1] - start[1]), 0.02), 2)
+            epsilon_brace.become(vertical_brace(length)).set_color(RED)
+            epsilon_brace.move_to((start + end) / 2 + RIGHT * (0.1 + epsilon_brace.width / 2))
+            epsilon_label.next_to(epsilon_brace, RIGHT, buff=0.1)
 
-        # Brace to show epsilon
-        epsilon_brace = always_redraw(
-            lambda: BraceBetweenPoints(
-                model_dot.get_center(),  # From prediction
-                actual_dot.get_center(),  # To actual
-                direction=RIGHT,
-                buff=0.1,
-                color=RED
-            )
-        )
-        epsilon_label = always_redraw(
-            lambda: MathTex("\\epsilon", "\\text{ (Noise)}", font_size=24, color=RED)
-            .next_to(epsilon_brace, RIGHT, buff=0.1)
-        )
+        update_slider(slider)
+        slider.add_updater(update_slider)
 
         self.play(Create(slider_line),
                   FadeIn(x_label, model_dot, actual_dot, model_dot_label, actual_dot_label, epsilon_brace,
                          epsilon_label))
+        self.add(slider)
 
         # 7. Animate the slider moving
         self.play(x_tracker.animate.set_value(9), run_time=6, rate_func=linear)
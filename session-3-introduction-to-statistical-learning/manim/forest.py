@@ -0,0 +1,191 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+# Random forest engine for the random forest scenes.
+# Bootstrap samples for every tree are drawn in one call, trees are grown in a
+# process pool, and each tree is stored as flat node arrays:
+#   feature   (nodes,)   split feature, or -1 for a leaf
+#   threshold (nodes,)   go left when x[feature] <= threshold
+#   left, right (nodes,) child node indices (-1 for leaves)
+#   value     (nodes, C) training class counts reaching the node
+# so predicting is a loop over tree depth, batched over all rows and all trees.
+
+
+def bootstrap_indices(n_rows, n_trees, max_samples=None, seed=None):
+    # Row indices of every bootstrap sample, drawn with replacement in one call: (n_trees, max_samples)
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    return rng.integers(n_rows, size=(n_trees, max_samples or n_rows))
+
+
+def best_split(X, y, n_classes, features, min_samples_leaf=1):
+    # The (gini gain, feature, threshold) of the best split of these rows over `features`.
+    # For each feature all thresholds are scored at once from cumulative class counts.
+    n = len(y)
+    one_hot = np.eye(n_classes)[y]
+    total = one_hot.sum(axis=0)
+    parent_gini = 1 - np.sum((total / n) ** 2)
+    best = (0.0, -1, 0.0)
+
+    for f in features:
+        order = np.argsort(X[:, f], kind="stable")
+        values = X[order, f]
+        left_counts = np.cumsum(one_hot[order], axis=0)[:-1]  # Left side after each row
+        right_counts = total - left_counts
+        n_left = np.arange(1, n)
+        n_right = n - n_left
+        gini_left = 1 - np.sum((left_counts / n_left[:, np.newaxis]) ** 2, axis=1)
+        gini_right = 1 - np.sum((right_counts / n_right[:, np.newaxis]) ** 2, axis=1)
+        gain = parent_gini - (n_left * gini_left + n_right * gini_right) / n
+
+        # Only split between distinct values, leaving enough rows on both sides
+        valid = (values[1:] > values[:-1]) & (n_left >= min_samples_leaf) & (n_right >= min_samples_leaf)
+        if not valid.any():
+            continue
+        i = np.flatnonzero(valid)[np.argmax(gain[valid])]
+        if gain[i] > best[0]:
+            best = (gain[i], f, (values[i] + values[i + 1]) / 2)
+    return best
+
+
+def fit_tree(X, y, n_classes, max_depth=None, min_samples_leaf=1, max_features=None, seed=None):
+    # Grow one CART classification tree (gini) and return it as a dict of flat arrays
+    rng = np.random.default_rng(seed)
+    n_features = X.shape[1]
+    max_features = n_features if max_features is None else max_features
+    feature, threshold, left, right, value = [], [], [], [], []
+
+    def new_node(rows):
+        feature.append(-1)
+        threshold.append(0.0)
+        left.append(-1)
+        right.append(-1)
+        value.append(np.bincount(y[rows], minlength=n_classes))
+        return len(feature) - 1
+
+    stack = [(new_node(np.arange(len(y))), np.arange(len(y)), 0)]
+    while stack:
+        node, rows, depth = stack.pop()
+        if (max_depth is not None and depth >= max_depth) or np.count_nonzero(value[node]) < 2:
+            continue
+        features = rng.choice(n_features, size=max_features, replace=False)
+        gain, f, t = best_split(X[rows], y[rows], n_classes, features, min_samples_leaf)
+        if f < 0:
+            continue
+        goes_left = X[rows, f] <= t
+        feature[node], threshold[node] = f, t
+        left[node] = new_node(rows[goes_left])
+        right[node] = new_node(rows[~goes_left])
+        stack.append((left[node], rows[goes_left], depth + 1))
+        stack.append((right[node], rows[~goes_left], depth + 1))
+
+    return {
+        "feature": np.array(feature),
+        "threshold": np.array(threshold),
+        "left": np.array(left),
+        "right": np.array(right),
+        "value": np.array(value),
+    }
+
+
+# The training data of a pool worker, sent once per worker by _init_worker rather than with every tree
+_worker_data = {}
+
+
+def _init_worker(X, y):
+    _worker_data["X"], _worker_data["y"] = X, y
+
+
+def _fit_tree_job(args):
+    # Process pool entry point: one tree on one bootstrap sample of the worker's data
+    rows, n_classes, max_depth, min_samples_leaf, max_features, seed = args
+    X, y = _worker_data["X"], _worker_data["y"]
+    return fit_tree(X[rows], y[rows], n_classes, max_depth, min_samples_leaf, max_features, seed)
+
+
+def tree_depth(tree):
+    # Number of levels below the root
+    depth = np.zeros(len(tree["feature"]), dtype=int)
+    for node in range(len(depth)):  # Children always come after their parent
+        if tree["feature"][node] >= 0:
+            depth[tree["left"][node]] = depth[tree["right"][node]] = depth[node] + 1
+    return depth.max()
+
+
+class RandomForest:
+    # Bagged CART trees with a random subset of features tried at every split.
+    # max_features="sqrt" tries sqrt(n_features) of them (at least one).
+    # Trees are grown in a process pool of `n_jobs` workers (all cores by default)
+    # once the work is large enough to pay for starting one.
+    parallel_min_rows = 20000  # Total bootstrap rows below which trees are grown in-process
+
+    def __init__(self, n_trees=100, max_depth=None, min_samples_leaf=1, max_features="sqrt",
+                 max_samples=None, n_jobs=None, seed=0):
+        self.n_trees = n_trees
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+        self.max_features = max_features
+        self.max_samples = max_samples
+        self.n_jobs = n_jobs or os.cpu_count()
+        self.seed = seed
+
+    def fit(self, X, y):
+        X, y = np.asarray(X, dtype=float), np.asarray(y)
+        self.n_classes = y.max() + 1
+        n_features = X.shape[1]
+        max_features = (max(1, int(np.sqrt(n_features))) if self.max_features == "sqrt"
+                        else self.max_features or n_features)
+
+        rng = np.random.default_rng(self.seed)
+        self.samples = bootstrap_indices(len(X), self.n_trees, self.max_samples, rng)
+        tree_seeds = rng.integers(2 ** 32, size=self.n_trees)
+        jobs = [
+            (rows, self.n_classes, self.max_depth, self.min_samples_leaf, max_features, seed)
+            for rows, seed in zip(self.samples, tree_seeds)
+        ]
+        if self.n_jobs > 1 and self.samples.size >= self.parallel_min_rows:
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker, initargs=(X, y)) as pool:
+                self.trees = list(pool.map(_fit_tree_job, jobs, chunksize=max(1, len(jobs) // (4 * self.n_jobs))))
+        else:
+            self.trees = [fit_tree(X[job[0]], y[job[0]], *job[1:]) for job in jobs]
+        self._stack_trees()
+        return self
+
+    def _stack_trees(self):
+        # All trees in one set of node arrays, child indices shifted to match
+        sizes = [len(tree["feature"]) for tree in self.trees]
+        self.roots = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        shift = np.repeat(self.roots, sizes)
+        self.feature = np.concatenate([tree["feature"] for tree in self.trees])
+        self.threshold = np.concatenate([tree["threshold"] for tree in self.trees])
+        self.left = np.concatenate([tree["left"] for tree in self.trees]) + shift
+        self.right = np.concatenate([tree["right"] for tree in self.trees]) + shift
+        self.value = np.concatenate([tree["value"] for tree in self.trees])
+
+    def apply(self, X):
+        # Leaf reached by every row in every tree: (n_trees, n_rows) node indices.
+        # All rows descend all trees together, one level per iteration.
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        nodes = np.repeat(self.roots[:, np.newaxis], len(X), axis=1)
+        rows = np.broadcast_to(np.arange(len(X)), nodes.shape)
+        active = self.feature[nodes] >= 0
+        while active.any():
+            n = nodes[active]
+            goes_left = X[rows[active], self.feature[n]] <= self.threshold[n]
+            nodes[active] = np.where(goes_left, self.left[n], self.right[n])
+            active = self.feature[nodes] >= 0
+        return nodes
+
+    def tree_predictions(self, X):
+        # The class each tree votes for, for every row: (n_trees, n_rows)
+        return np.argmax(self.value[self.apply(X)], axis=-1)
+
+    def predict_votes(self, X):
+        # Vote counts per class for every row: (n_rows, n_classes)
+        votes = self.tree_predictions(X)
+        return np.stack([np.count_nonzero(votes == c, axis=0) for c in range(self.n_classes)], axis=1)
+
+    def predict(self, X):
+        return np.argmax(self.predict_votes(X), axis=1)
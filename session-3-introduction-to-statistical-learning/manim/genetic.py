@@ -0,0 +1,85 @@
+import numpy as np
+
+
+# Vectorized genetic algorithm engine for GeneticAlgorithmScene.
+# The population is a (P, L) integer matrix: P individuals of L genes, each
+# gene an index into a palette of `n_alleles` values. Every stage of a
+# generation (fitness, tournament selection, crossover, mutation) is one
+# batched NumPy operation over the whole population.
+
+
+class GeneticAlgorithm:
+    def __init__(self, target, n_alleles, population_size=200, tournament_size=3,
+                 crossover_rate=0.9, mutation_rate=None, elitism=1, seed=0):
+        self.target = np.asarray(target, dtype=np.int8)
+        self.n_alleles = n_alleles
+        self.tournament_size = tournament_size
+        self.crossover_rate = crossover_rate
+        # One mutated gene per child on average, unless told otherwise
+        self.mutation_rate = 1.0 / len(self.target) if mutation_rate is None else mutation_rate
+        self.elitism = elitism
+        self.rng = np.random.default_rng(seed)
+        self.population = self.rng.integers(n_alleles, size=(population_size, len(self.target)), dtype=np.int8)
+
+    def fitness(self, population=None):
+        # Number of genes that match the target, for every individual
+        population = self.population if population is None else population
+        return np.count_nonzero(population == self.target, axis=1)
+
+    def select(self, fitness, n):
+        # `n` tournaments at once: each draws `tournament_size` random contenders
+        # and the fittest one wins (ties go to the first contender)
+        contenders = self.rng.integers(len(fitness), size=(n, self.tournament_size))
+        return contenders[np.arange(n), np.argmax(fitness[contenders], axis=1)]
+
+    def crossover(self, parents_a, parents_b):
+        # Single-point crossover: genes before the point come from parent A, the rest from B.
+        # Pairs that skip crossover get point = L, i.e. a copy of parent A.
+        n, length = len(parents_a), self.population.shape[1]
+        points = self.rng.integers(1, length, size=n)
+        points[self.rng.random(n) >= self.crossover_rate] = length
+        from_a = np.arange(length) < points[:, np.newaxis]
+        return np.where(from_a, self.population[parents_a], self.population[parents_b]), points
+
+    def mutate(self, children):
+        # Each gene is replaced by a random allele with probability mutation_rate
+        mask = self.rng.random(children.shape) < self.mutation_rate
+        children[mask] = self.rng.integers(self.n_alleles, size=np.count_nonzero(mask), dtype=np.int8)
+        return children, mask
+
+    def step(self):
+        # Advance one generation. Returns the record of how it was made: the
+        # parents (P, 2), crossover points (P,) and mutation mask (P, L) of
+        # every child. The best `elitism` individuals are copied over unchanged.
+        fitness = self.fitness()
+        n_children = len(self.population) - self.elitism
+        parents = self.select(fitness, 2 * n_children).reshape(n_children, 2)
+        children, points = self.crossover(parents[:, 0], parents[:, 1])
+        children, mutations = self.mutate(children)
+
+        elite = np.argsort(fitness, kind="stable")[::-1][:self.elitism]
+        self.population = np.concatenate([self.population[elite], children])
+        # Elites are recorded as their own parents, cloned without crossover or mutation
+        length = self.population.shape[1]
+        parents = np.concatenate([np.repeat(elite[:, np.newaxis], 2, axis=1), parents])
+        points = np.concatenate([np.full(self.elitism, length), points])
+        mutations = np.concatenate([np.zeros((self.elitism, length), dtype=bool), mutations])
+        return parents, points, mutations
+
+    def run(self, generations):
+        # Evolve for `generations` steps and return the full history as stacked arrays:
+        #   populations (G + 1, P, L), fitness (G + 1, P),
+        #   parents (G, P, 2), points (G, P) and mutations (G, P, L)
+        populations, records = [self.population.copy()], []
+        for _ in range(generations):
+            records.append(self.step())
+            populations.append(self.population.copy())
+        populations = np.stack(populations)
+        parents, points, mutations = (np.stack(arrays) for arrays in zip(*records))
+        return {
+            "populations": populations,
+            "fitness": np.count_nonzero(populations == self.target, axis=2),
+            "parents": parents,
+            "points": points,
+            "mutations": mutations,
+        }
@@ -1,9 +1,15 @@
 from manim import *
-import random
+
+from genetic import GeneticAlgorithm
+from glyph_cache import CachedDecimal, cached_text
+
+
+# Gene values are indices into this palette; the first five make up the target pattern
+PALETTE = [RED, GREEN, BLUE, YELLOW, PURPLE, ORANGE, GREY, PINK, WHITE, MAROON, TEAL, GOLD]
 
 
 # Define a helper function to create a "chromosome"
-# This is a VGroup of 5 colored squares (genes)
+# This is a VGroup of colored squares (genes)
 def create_chromosome(colors, gene_size=0.5):
     chromosome = VGroup()
     for color in colors:
@@ -14,152 +20,238 @@ def create_chromosome(colors, gene_size=0.5):
     return chromosome
 
 
+def recolor_chromosome(chromosome, colors):
+    # Show another individual on an existing chromosome, without creating mobjects
+    for gene, color in zip(chromosome, colors):
+        gene.set_color(color)
+    return chromosome
+
+
 class GeneticAlgorithmScene(Scene):
+    # Size of the evolving population, how long it evolves, and the seed of the run
+    population_size = 300
+    generations = 120
+    tournament_size = 2
+    seed = 0
+
     def construct(self):
         # 0. Title and Target
-        title = Text("Genetic Algorithm", font_size=36).to_edge(UP)
+        title = cached_text("Genetic Algorithm", font_size=36).to_edge(UP)
 
         # This is our "perfect" individual
-        target_colors = [RED, GREEN, BLUE, YELLOW, PURPLE]
-        target_chromosome = create_chromosome(target_colors)
-        target_label = Text("Target:", font_size=24).next_to(target_chromosome, LEFT)
+        target_colors = [RED, GREEN, BLUE, YELLOW, PURPLE] * 8
+        target_genes = [PALETTE.index(color) for color in target_colors]
+        n_genes = len(target_genes)
+        target_chromosome = create_chromosome(target_colors, gene_size=0.18)
+        target_label = cached_text("Target:", font_size=24).next_to(target_chromosome, LEFT)
 
-        target_group = VGroup(target_label, target_chromosome).to_edge(UP, buff=1.5)
+        target_group = VGroup(target_label, target_chromosome).next_to(title, DOWN, buff=0.4)
         self.play(Write(title), FadeIn(target_group))
 
-        gen_counter = Text("Generation: 1", font_size=28).to_edge(LEFT, buff=0.5).shift(UP * 1.0)
+        # The whole evolution is computed up front; the scene only replays its history
+        ga = GeneticAlgorithm(target_genes, len(PALETTE), population_size=self.population_size,
+                              tournament_size=self.tournament_size, seed=self.seed)
+        history = ga.run(self.generations)
+        populations, fitness = history["populations"], history["fitness"]
+
+        def colors(genes):
+            return [PALETTE[k] for k in genes]
+
+        palette_rgba = np.array([[*ManimColor(c).to_rgb(), 1.0] for c in PALETTE]) * 255
+
+        gen_counter = CachedDecimal(1, prefix=r"\text{Generation: }", num_decimal_places=0, font_size=28)
+        gen_counter.to_corner(UL, buff=0.5).shift(DOWN * 1.6)
         self.play(Write(gen_counter))
 
         # --------------------------------------------------
         # Phase 1: Initial Population (Gen 1)
-        # ----------------------------------z----------------
+        # --------------------------------------------------
 
-        # Create 4 random individuals for Generation 1
-        pop_1 = [
-            create_chromosome([RED, ORANGE, PURPLE, GREY, GREEN]),
-            create_chromosome([PINK, GREEN, BLUE, WHITE, BLACK]),
-            create_chromosome([MAROON, PURPLE, BLUE, YELLOW, WHITE]),
-            create_chromosome([RED, GREEN, GREY, ORANGE, PINK])
-        ]
+        # The whole population as one image: a row per individual, a column per gene,
+        # fittest individuals at the top. Each generation only rewrites its pixels.
+        def sorted_by_fitness(g):
+            return np.argsort(fitness[g], kind="stable")[::-1]
 
-        # VGroup them and arrange them vertically
-        population = VGroup(*pop_1).arrange(DOWN, buff=0.4).shift(DOWN * 0.5)
-        self.play(FadeIn(population))
+        population_image = ImageMobject(palette_rgba[populations[0][sorted_by_fitness(0)]].astype(np.uint8))
+        population_image.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        population_image.stretch_to_fit_width(5.0).stretch_to_fit_height(4.0)
+        population_image.next_to(gen_counter, DOWN, aligned_edge=LEFT, buff=0.3)
+        population_label = cached_text(f"Population of {self.population_size}, fittest first", font_size=18)
+        population_label.next_to(population_image, DOWN, buff=0.15)
+        self.play(FadeIn(population_image), Write(population_label))
 
         # --------------------------------------------------
         # Phase 2: Fitness & Selection
         # --------------------------------------------------
-        step_label = Text("1. Fitness & Selection", font_size=24).to_edge(RIGHT, buff=1.0).align_to(gen_counter, UP)
+        step_label = cached_text("1. Fitness & Selection", font_size=24).to_edge(RIGHT, buff=1.0).align_to(gen_counter, UP)
         self.play(Write(step_label))
 
-        # Show fitness scores (how many genes match the target)
-        scores = [
-            Text("Fit: 1/5", font_size=20).next_to(pop_1[0], RIGHT, buff=0.2),
-            Text("Fit: 2/5", font_size=20).next_to(pop_1[1], RIGHT, buff=0.2),
-            Text("Fit: 2/5", font_size=20).next_to(pop_1[2], RIGHT, buff=0.2),
-            Text("Fit: 3/5", font_size=20).next_to(pop_1[3], RIGHT, buff=0.2)
-        ]
-        self.play(Write(VGroup(*scores)))
-
-        # We select the "fittest" two as parents
-        # We fade out the "unfit" ones
-        self.play(
-            FadeOut(pop_1[0], shift=LEFT), FadeOut(scores[0]),
-            FadeOut(pop_1[2], shift=LEFT), FadeOut(scores[2]),
-            # Move the "parents" to the center
-            pop_1[1].animate.move_to(LEFT * 2 + DOWN * 0.5),
-            pop_1[3].animate.move_to(LEFT * 2 + DOWN * 1.5),
-            FadeOut(scores[1]), FadeOut(scores[3])
-        )
+        # Four chromosomes on the right are reused for everything shown in detail
+        rows = VGroup(*[create_chromosome(colors(populations[0][i]), gene_size=0.11)
+                        for i in sorted_by_fitness(0)[:4]])
+        rows.arrange(DOWN, buff=0.35).to_edge(RIGHT, buff=1.7).shift(UP * 0.3)
+
+        def fit_label(value, row):
+            return cached_text(f"Fit: {value}/{n_genes}", font_size=18).next_to(row, RIGHT, buff=0.2)
+
+        # Show fitness scores (how many genes match the target) of the fittest four
+        scores = VGroup(*[fit_label(fitness[0][i], row) for i, row in zip(sorted_by_fitness(0)[:4], rows)])
+        self.play(FadeIn(rows), Write(scores))
+        self.wait(1)
+
+        # Follow one real child of the next generation: the fittest crossed-over, mutated one,
+        # or the fittest child of all if no child was both
+        made = (history["points"][0] < n_genes) & history["mutations"][0].any(axis=1)
+        if not made.any():
+            made[:] = True
+        child = np.flatnonzero(made)[np.argmax(fitness[1][made])]
+        parent_a, parent_b = history["parents"][0][child]
+        point = history["points"][0][child]
+        mutated = np.flatnonzero(history["mutations"][0][child])
 
-        parent_A = pop_1[1]
-        parent_B = pop_1[3]
+        # Tournament selection: mark where the two winners sit in the population
+        rank = np.argsort(sorted_by_fitness(0))
+        row_height = population_image.height / self.population_size
 
+        def population_marker(i, color):
+            top = population_image.get_top()[1] - (rank[i] + 0.5) * row_height
+            return Rectangle(width=population_image.width + 0.1, height=max(row_height, 0.04),
+                             color=color, stroke_width=2).move_to([population_image.get_x(), top, 0])
+
+        markers = VGroup(population_marker(parent_a, YELLOW), population_marker(parent_b, TEAL))
+        self.play(Create(markers))
+
+        # We select parents by tournament: the fitter of two random individuals wins
+        # The other rows make room for the two parents and their child
+        recolor_chromosome(rows[0], colors(populations[0][parent_a]))
+        recolor_chromosome(rows[1], colors(populations[0][parent_b]))
         parent_labels = VGroup(
-            Text("Parent A", font_size=20).next_to(parent_A, UP),
-            Text("Parent B", font_size=20).next_to(parent_B, DOWN)
+            fit_label(fitness[0][parent_a], rows[0]),
+            fit_label(fitness[0][parent_b], rows[1]),
+        )
+        names = VGroup(
+            cached_text("Parent A", font_size=20).next_to(rows[0], LEFT, buff=0.2),
+            cached_text("Parent B", font_size=20).next_to(rows[1], LEFT, buff=0.2),
+        )
+        self.play(
+            FadeOut(rows[2:]), FadeOut(scores),
+            FadeIn(parent_labels), Write(names),
         )
-        self.play(Write(parent_labels))
         self.wait(1)
 
         # --------------------------------------------------
         # Phase 3: Crossover
         # --------------------------------------------------
-        new_step_label = Text("2. Crossover", font_size=24).move_to(step_label)
-        self.play(Transform(step_label, new_step_label), FadeOut(parent_labels))
-
-        # Define the children based on a "crossover" point (e.g., after gene 3)
-        # Child 1 = Parent A[0:3] + Parent B[3:5]
-        child_A_colors = [PINK, GREEN, BLUE] + [ORANGE, PURPLE]
-
-        # Child 2 = Parent B[0:3] + Parent A[3:5]
-        child_B_colors = [RED, GREEN, GREY] + [WHITE, BLACK]
+        new_step_label = cached_text("2. Crossover", font_size=24).move_to(step_label)
+        self.play(Transform(step_label, new_step_label))
 
-        child_A = create_chromosome(child_A_colors).move_to(RIGHT * 2 + DOWN * 0.5)
-        child_B = create_chromosome(child_B_colors).move_to(RIGHT * 2 + DOWN * 1.5)
+        # The crossover point drawn by the engine for this child
+        cut = DashedLine(
+            rows[0][point - 1].get_corner(UR) + UP * 0.15, rows[1][point - 1].get_corner(DR) + DOWN * 0.15,
+            color=WHITE, stroke_width=2,
+        )
+        self.play(Create(cut))
 
-        children_label = Text("Children", font_size=24).next_to(VGroup(child_A, child_B), UP, buff=0.5)
+        # Child = Parent A[:point] + Parent B[point:]
+        crossed = np.where(np.arange(n_genes) < point, populations[0][parent_a], populations[0][parent_b])
+        recolor_chromosome(rows[2], colors(crossed))
+        child_name = cached_text("Child", font_size=20).next_to(rows[2], LEFT, buff=0.2)
 
         # Show the crossover with highlights
-        # Highlight Parent A's contribution to Child A
-        self.play(Indicate(VGroup(parent_A[0], parent_A[1], parent_A[2]), color=YELLOW, scale_factor=1.2))
-        # Highlight Parent B's contribution to Child A
-        self.play(Indicate(VGroup(parent_B[3], parent_B[4]), color=YELLOW, scale_factor=1.2))
-
-        # Fade in the first child
-        self.play(FadeIn(child_A))
-        self.wait(0.5)
-
-        # Do the same for the second child
-        self.play(Indicate(VGroup(parent_B[0], parent_B[1], parent_B[2]), color=TEAL, scale_factor=1.2))
-        self.play(Indicate(VGroup(parent_A[3], parent_A[4]), color=TEAL, scale_factor=1.2))
-        self.play(FadeIn(child_B))
-        self.play(Write(children_label))
+        # Highlight Parent A's contribution, then Parent B's
+        self.play(Indicate(rows[0][:point], color=YELLOW, scale_factor=1.2))
+        if point < n_genes:  # Otherwise the child is a copy of parent A
+            self.play(Indicate(rows[1][point:], color=TEAL, scale_factor=1.2))
+        self.play(FadeIn(rows[2]), Write(child_name))
         self.wait(1)
 
         # --------------------------------------------------
         # Phase 4: Mutation
         # --------------------------------------------------
-        new_step_label = Text("3. Mutation", font_size=24).move_to(step_label)
+        new_step_label = cached_text("3. Mutation", font_size=24).move_to(step_label)
         self.play(Transform(step_label, new_step_label))
 
-        # We'll mutate the 3rd gene of Child B (GREY -> BLUE)
-        # This makes it a "good" mutation, as it now matches the target
-        self.play(
-            Flash(child_B[2], color=RED, line_length=0.2),
-            child_B[2].animate.set_color(BLUE)
-        )
+        # The genes the engine mutated in this child
+        child_genes = populations[1][child]
+        if len(mutated):
+            self.play(
+                *[Flash(rows[2][k], color=RED, line_length=0.15) for k in mutated],
+                *[rows[2][k].animate.set_color(PALETTE[child_genes[k]]) for k in mutated],
+            )
+        child_score = fit_label(fitness[1][child], rows[2])
+        self.play(Write(child_score))
         self.wait(1)
 
         # --------------------------------------------------
-        # Phase 5: New Generation
+        # Phase 5: New Generations
         # --------------------------------------------------
-        new_step_label = Text("New Generation!", font_size=24).move_to(step_label)
-        new_gen_counter = Text("Generation: 2", font_size=28).move_to(gen_counter)
-
+        new_step_label = cached_text("...and the process repeats.", font_size=24).move_to(step_label)
         self.play(
             Transform(step_label, new_step_label),
-            Transform(gen_counter, new_gen_counter),
-            FadeOut(parent_A),
-            FadeOut(parent_B),
-            FadeOut(children_label),
-            # Move children to the center
-            child_A.animate.move_to(LEFT * 2 + DOWN * 0.5),
-            child_B.animate.move_to(LEFT * 2 + DOWN * 1.5),
+            FadeOut(markers), FadeOut(cut), FadeOut(names), FadeOut(child_name),
+            FadeOut(parent_labels), FadeOut(child_score),
         )
 
-        # Show the new, *better* fitness scores
-        # Child A: [PINK, GREEN, BLUE, ORANGE, MAGENTA] -> Fit: 3/5
-        # Child B: [RED, GREEN, BLUE, WHITE, BLACK] -> Fit: 3/5
+        # The four rows go back to showing the fittest individuals of the current generation
+        for row, i in zip(rows, sorted_by_fitness(0)[:4]):
+            recolor_chromosome(row, colors(populations[0][i]))
+        scores = VGroup(*[fit_label(fitness[0][i], row) for i, row in zip(sorted_by_fitness(0)[:4], rows)])
+        self.play(FadeIn(rows[3]), FadeIn(scores))
+
+        # Best and mean fitness per generation
+        axes = Axes(
+            x_range=[0, self.generations, 20],
+            y_range=[0, n_genes, 10],
+            x_length=5,
+            y_length=1.8,
+            axis_config={"color": GREY, "include_tip": False},
+        ).next_to(rows, DOWN, buff=0.6)
+        axes_labels = VGroup(
+            cached_text("generation", font_size=16).next_to(axes.x_axis, DOWN, buff=0.1),
+            cached_text("fitness", font_size=16).next_to(axes.y_axis, LEFT, buff=0.1),
+        )
+        best_curve = VMobject().set_stroke(GREEN, width=3)
+        mean_curve = VMobject().set_stroke(YELLOW, width=2)
+        best_fitness, mean_fitness = fitness.max(axis=1), fitness.mean(axis=1)
+        legend = VGroup(
+            cached_text("best", font_size=16, color=GREEN),
+            cached_text("mean", font_size=16, color=YELLOW),
+        ).arrange(RIGHT, buff=0.3).next_to(axes, UP, buff=0.1).align_to(axes, RIGHT)
+        self.play(Create(axes), FadeIn(axes_labels), FadeIn(legend))
+        self.add(best_curve, mean_curve)
+
+        # One updater shows generation g everywhere: population pixels, the four
+        # fittest rows (recolored in place), their scores, the counter and the curves
+        generation = ValueTracker(0)
+        shown = [None]
+
+        def update_generation(mob):
+            g = min(int(generation.get_value()), self.generations)
+            if g == shown[0]:
+                return
+            shown[0] = g
+            order = sorted_by_fitness(g)
+            population_image.pixel_array[:] = palette_rgba[populations[g][order]]
+            for row, score, i in zip(rows, scores, order[:4]):
+                recolor_chromosome(row, colors(populations[g][i]))
+                score.become(fit_label(fitness[g][i], row))
+            gen_counter.set_value(g + 1)
+            if g > 0:
+                best_curve.set_points_as_corners([axes.c2p(k, v) for k, v in enumerate(best_fitness[:g + 1])])
+                mean_curve.set_points_as_corners([axes.c2p(k, v) for k, v in enumerate(mean_fitness[:g + 1])])
 
-        new_scores = [
-            Text("Fit: 3/5", font_size=20).next_to(child_A, RIGHT, buff=0.2),
-            Text("Fit: 3/5", font_size=20).next_to(child_B, RIGHT, buff=0.2),
-        ]
+        generation_driver = Dot().set_opacity(0)  # Invisible dot
+        generation_driver.add_updater(update_generation)
+        self.add(generation_driver)
 
-        self.play(Write(VGroup(*new_scores)))
+        self.play(generation.animate.set_value(self.generations), run_time=12, rate_func=linear)
 
         # Conclude
-        conclusion = Text("...and the process repeats.", font_size=24).next_to(VGroup(child_A, child_B), DOWN, buff=1.0)
+        solved = np.flatnonzero(best_fitness == n_genes)
+        if len(solved):
+            conclusion = cached_text(f"Target found in generation {solved[0] + 1}", font_size=24)
+        else:
+            conclusion = cached_text(f"Best: {best_fitness[-1]}/{n_genes} genes", font_size=24)
+        conclusion.next_to(axes, DOWN, buff=0.5)
         self.play(Write(conclusion))
-        self.wait(3)
\ No newline at end of file
+        self.wait(3)
@@ -0,0 +1,205 @@
+from manim import *
+from pathlib import Path
+import functools
+import hashlib
+import os
+
+import manim
+
+
+class GlyphStore:
+    # A persistent on-disk cache of vectorized Text/MathTex outlines, shared by
+    # every scene and every render run. Each entry is one .npz file named after
+    # the hash of everything that affects the outlines (kind, strings, font,
+    # size, color, ...). Hits refresh the file's modification time, and once
+    # the cache grows past `max_bytes` the least recently used entries go first.
+    def __init__(self, cache_dir=None, max_bytes=64 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir or Path(config.media_dir) / "glyph_cache")
+        self.max_bytes = max_bytes
+        self.memory = {}  # Entries already loaded in this process
+
+    def get(self, kind, build, *strings, **kwargs):
+        # Defaults set with Text.set_default(font=...) etc. and the LaTeX template also shape the outlines
+        settings = {name: value for name, value in kwargs.items() if name != "tex_template"}
+        setup = sorted(class_defaults(build).items())
+        if kind == "tex":
+            setup.append(("tex_template", (kwargs.get("tex_template") or config.tex_template).body))
+        key = hashlib.sha1(
+            repr((kind, strings, sorted(settings.items()), setup, manim.__version__)).encode()
+        ).hexdigest()
+        if key not in self.memory:
+            path = self.cache_dir / f"{key}.npz"
+            if path.exists():
+                os.utime(path)  # Mark as recently used
+                with np.load(path) as data:
+                    self.memory[key] = dict(data)
+            else:
+                self.memory[key] = outlines_to_arrays(build(*strings, **kwargs))
+                self.save(path, self.memory[key])
+        return arrays_to_outlines(self.memory[key], kind, strings)
+
+    def save(self, path, arrays):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent renders never read a partial entry
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, **arrays)
+        tmp_path.replace(path)
+        self.evict()
+
+    def evict(self):
+        entries = [p for p in self.cache_dir.glob("*.npz") if not p.name.endswith(".tmp.npz")]
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+
+def class_defaults(cls):
+    # Keyword defaults given with cls.set_default(...), which wraps __init__ in a partialmethod
+    # once per call, the latest outermost. An earlier wrapper reads back through the class as a
+    # function that keeps its partialmethod as __partialmethod__ (_partialmethod before Python 3.13).
+    defaults, init = {}, vars(cls).get("__init__")
+    while isinstance(init, functools.partialmethod):
+        defaults = {**init.keywords, **defaults}
+        init = init.func
+        init = getattr(init, "__partialmethod__", getattr(init, "_partialmethod", init))
+    return defaults
+
+
+def outlines_to_arrays(mob):
+    # Flatten a Text/MathTex into plain arrays: every leaf outline's points and style,
+    # plus how many leaves each top-level part (a character or a tex string) holds
+    parts = mob.submobjects or [mob]
+    leaves, part_sizes, part_is_leaf = [], [], []
+    for part in parts:
+        part_leaves = part.family_members_with_points()
+        leaves += part_leaves
+        part_sizes.append(len(part_leaves))
+        part_is_leaf.append(not part.submobjects)
+
+    return {
+        "points": np.concatenate([leaf.points for leaf in leaves]) if leaves else np.zeros((0, 3)),
+        "leaf_sizes": np.array([len(leaf.points) for leaf in leaves], dtype=int),
+        "part_sizes": np.array(part_sizes, dtype=int),
+        "part_is_leaf": np.array(part_is_leaf, dtype=bool),
+        "fill_colors": np.array([leaf.get_fill_color().to_hex() for leaf in leaves], dtype=str),
+        "fill_opacities": np.array([leaf.get_fill_opacity() for leaf in leaves], dtype=float),
+        "stroke_colors": np.array([leaf.get_stroke_color().to_hex() for leaf in leaves], dtype=str),
+        "stroke_opacities": np.array([leaf.get_stroke_opacity() for leaf in leaves], dtype=float),
+        "stroke_widths": np.array([leaf.get_stroke_width() for leaf in leaves], dtype=float),
+    }
+
+
+class CachedGlyphs(VGroup):
+    # Rebuilt outlines of a Text or MathTex, as a plain VGroup. Keeps the same part
+    # structure (one submobject per character / tex string), so indexing, Write and
+    # Transform work as they do on the original, but the Text/MathTex methods do not:
+    # there is no get_part_by_tex or set_color_by_tex, so index the parts instead
+    # (e.g. label[1].set_color(RED) for the second tex string).
+    def __init__(self, parts, kind, strings, **kwargs):
+        super().__init__(*parts, **kwargs)
+        if kind == "text":
+            self.text = strings[0]
+        else:
+            self.tex_strings = list(strings)
+            self.tex_string = " ".join(strings)
+
+
+def arrays_to_outlines(arrays, kind, strings):
+    leaves = []
+    offsets = np.cumsum(np.concatenate([[0], arrays["leaf_sizes"]]))
+    for i in range(len(arrays["leaf_sizes"])):
+        leaf = VMobject()
+        leaf.set_points(arrays["points"][offsets[i]:offsets[i + 1]])
+        leaf.set_fill(str(arrays["fill_colors"][i]), opacity=float(arrays["fill_opacities"][i]))
+        leaf.set_stroke(str(arrays["stroke_colors"][i]), width=float(arrays["stroke_widths"][i]),
+                        opacity=float(arrays["stroke_opacities"][i]))
+        leaves.append(leaf)
+
+    parts, start = [], 0
+    for size, is_leaf in zip(arrays["part_sizes"], arrays["part_is_leaf"]):
+        part_leaves = leaves[start:start + size]
+        parts.append(part_leaves[0] if is_leaf and size == 1 else VGroup(*part_leaves))
+        start += size
+    return CachedGlyphs(parts, kind, strings)
+
+
+# One store shared by every scene in the process
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = GlyphStore()
+    return _store
+
+
+def cached_text(text, **kwargs):
+    # The outlines of Text(text, **kwargs), only running font shaping on a cache miss.
+    # Returns CachedGlyphs, not a Text: see there for what is kept
+    return get_store().get("text", Text, text, **kwargs)
+
+
+def cached_tex(*tex_strings, **kwargs):
+    # The outlines of MathTex(*tex_strings, **kwargs), only running LaTeX on a cache miss.
+    # Returns CachedGlyphs, not a MathTex: see there for what is kept
+    return get_store().get("tex", MathTex, *tex_strings, **kwargs)
+
+
+class DigitCache:
+    # Renders each character of a number ("0"-"9", ".", "-") once, through the
+    # glyph store. Numbers are then assembled from copies of these glyphs, so
+    # changing a value never goes through LaTeX or SVG parsing again.
+    def __init__(self, font_size=24, color=WHITE, chars="0123456789.-"):
+        self.glyphs = {
+            char: cached_tex(char, font_size=font_size, color=color)
+            for char in chars
+        }
+
+    def __getitem__(self, char):
+        return self.glyphs[char]
+
+
+class CachedDecimal(VGroup):
+    # A label such as "x = 4.2" whose static prefix is rendered once and whose
+    # digits are swapped in place from a DigitCache when the value changes.
+    def __init__(self, value, prefix="", num_decimal_places=1, font_size=24, color=WHITE, cache=None, **kwargs):
+        super().__init__(**kwargs)
+        self.num_decimal_places = num_decimal_places
+        self.digit_buff = 0.001 * font_size  # Same spacing as manim's DecimalNumber
+        self.cache = cache or DigitCache(font_size=font_size, color=color)
+
+        self.prefix = cached_tex(prefix, font_size=font_size, color=color) if prefix else VGroup()
+        self.digits = VGroup()
+        self.add(self.prefix, self.digits)
+
+        self.num_string = None
+        self.set_value(value)
+
+    def set_value(self, value):
+        num_string = f"{value:.{self.num_decimal_places}f}"
+        if num_string == self.num_string:
+            return self  # Nothing to redraw
+
+        # Keep one glyph slot per character and refill the slots in place from the cache
+        center = self.get_center()
+        while len(self.digits) < len(num_string):
+            self.digits.add(VMobject())
+        while len(self.digits) > len(num_string):
+            self.digits.remove(self.digits[-1])
+
+        for slot, char in zip(self.digits, num_string):
+            slot.become(self.cache[char])
+        self.digits.arrange(RIGHT, buff=self.digit_buff, aligned_edge=DOWN)
+        if len(self.prefix):
+            self.digits.next_to(self.prefix, RIGHT, buff=2 * self.digit_buff, aligned_edge=DOWN)
+
+        # Keep the label where it was, unless this is the first draw
+        if self.num_string is not None:
+            self.move_to(center)
+        self.num_string = num_string
+        return self
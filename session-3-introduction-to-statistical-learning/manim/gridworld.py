@@ -0,0 +1,163 @@
+import numpy as np
+
+
+# Tabular reinforcement learning engine for the reinforcement learning scenes.
+# A gridworld is a next-state table and a reward table over (state, action), so
+# stepping any number of agents at once is two array lookups. Value iteration
+# updates every state together; Q-learning runs a batch of epsilon-greedy
+# episodes in parallel against one shared Q table.
+
+
+class GridWorld:
+    # A grid of n_rows x n_cols cells, indexed grid[row][col] with row 0 at the top.
+    # State s is the cell (s // n_cols, s % n_cols). Episodes end on the goal or on a
+    # hazard; every other move costs step_reward, and moves off the grid stay put.
+    # The default rewards (free moves, +1 goal, -1 hazard) with a discount below 1 make the
+    # goal worth more than any hazard however far away it is, so they hold on any grid size.
+    ACTIONS = np.array([[-1, 0], [1, 0], [0, -1], [0, 1]])  # (d_row, d_col): up, down, left, right
+    ACTION_NAMES = ["up", "down", "left", "right"]
+
+    def __init__(self, n_rows, n_cols, start, goal, hazards=(), actions=None,
+                 step_reward=0.0, hazard_reward=-1.0, goal_reward=1.0):
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.n_states = n_rows * n_cols
+        self.actions = self.ACTIONS if actions is None else np.asarray(actions)
+        self.n_actions = len(self.actions)
+        self.step_reward = step_reward
+        self.hazard_reward = hazard_reward
+        self.goal_reward = goal_reward
+        self.start = self.state(*start)
+        self.goal = self.state(*goal)
+        self.hazards = np.array([self.state(*cell) for cell in hazards], dtype=int)
+
+        self.terminal = np.zeros(self.n_states, dtype=bool)
+        self.terminal[self.goal] = True
+        self.terminal[self.hazards] = True
+
+        # Transition and reward tables, (n_states, n_actions)
+        rows, cols = np.divmod(np.arange(self.n_states), n_cols)
+        to_rows = rows[:, np.newaxis] + self.actions[:, 0]
+        to_cols = cols[:, np.newaxis] + self.actions[:, 1]
+        on_grid = (to_rows >= 0) & (to_rows < n_rows) & (to_cols >= 0) & (to_cols < n_cols)
+        self.next_state = np.where(on_grid, to_rows * n_cols + to_cols, np.arange(self.n_states)[:, np.newaxis])
+        self.rewards = np.full(self.next_state.shape, step_reward)
+        self.rewards[np.isin(self.next_state, self.hazards)] = hazard_reward
+        self.rewards[self.next_state == self.goal] = goal_reward
+        # Terminal states are absorbing and pay nothing
+        self.next_state[self.terminal] = np.flatnonzero(self.terminal)[:, np.newaxis]
+        self.rewards[self.terminal] = 0.0
+
+    def state(self, row, col):
+        return row * self.n_cols + col
+
+    def cell(self, state):
+        return divmod(state, self.n_cols)
+
+    def step(self, states, actions):
+        # Move every agent at once: returns (next states, rewards, done)
+        next_states = self.next_state[states, actions]
+        return next_states, self.rewards[states, actions], self.terminal[next_states]
+
+
+def value_iteration(env, gamma=0.99, tol=1e-6, max_iterations=1000):
+    # Optimal state values by synchronous Bellman backups over every state at once.
+    # Returns (V (n_states,), Q (n_states, n_actions), iterations used).
+    V = np.zeros(env.n_states)
+    for iteration in range(1, max_iterations + 1):
+        Q = env.rewards + gamma * np.where(env.terminal[env.next_state], 0.0, V[env.next_state])
+        new_V = np.where(env.terminal, 0.0, Q.max(axis=1))
+        converged = np.max(np.abs(new_V - V)) < tol
+        V = new_V
+        if converged:
+            break
+    return V, Q, iteration
+
+
+def greedy_action(Q, states, rng=None):
+    # argmax over actions, with ties broken at random when an rng is given
+    q = Q[states]
+    if rng is not None:
+        q = q + rng.random(q.shape) * 1e-9
+    return np.argmax(q, axis=-1)
+
+
+def optimistic_q(env, gamma=0.99):
+    # Q as if every move led straight on to the goal: the discounted return of a clear run
+    # of the fewest moves the next cell could possibly be from it. No path through the real
+    # grid does better, so greedy agents head for the goal and only learn their way around
+    # what blocks them, which is what lets Q-learning find a distant goal on large grids.
+    rows, cols = np.divmod(env.next_state, env.n_cols)
+    goal_row, goal_col = env.cell(env.goal)
+    reach = np.abs(env.actions).sum(axis=1).max()  # Furthest an action moves, in grid steps
+    moves = np.ceil((np.abs(rows - goal_row) + np.abs(cols - goal_col)) / reach)
+    # step_reward on every move before the goal, then goal_reward, discounted
+    steps = moves if gamma == 1 else (1 - gamma ** moves) / (1 - gamma)
+    # A hair below, so among equally good routes the ones actually tried win
+    return env.step_reward * steps + env.goal_reward * gamma ** moves - 1e-6
+
+
+def q_learning(env, n_episodes, batch_size=100, alpha=0.5, gamma=0.99, epsilon=(1.0, 0.05),
+               max_steps=None, initial_q=None, seed=0):
+    # Epsilon-greedy Q-learning, `batch_size` episodes at a time against one shared Q table.
+    # Epsilon decays linearly from epsilon[0] to epsilon[1] over the batches. When several
+    # agents update the same (state, action) in one step, their TD errors are averaged.
+    # Q starts from optimistic_q unless initial_q gives a constant instead.
+    # Returns a dict of
+    #   q        (n_batches + 1, n_states, n_actions)  Q after each batch, starting from the initial Q
+    #   returns  (n_episodes,)                         total reward of every episode
+    #   paths    list of state sequences, the first episode of each batch
+    rng = np.random.default_rng(seed)
+    max_steps = max_steps or 4 * env.n_states
+    n_batches = -(-n_episodes // batch_size)
+    Q = optimistic_q(env, gamma) if initial_q is None else np.full((env.n_states, env.n_actions), float(initial_q))
+    snapshots, returns, paths = [Q.copy()], [], []
+
+    for batch in range(n_batches):
+        eps = epsilon[0] + (epsilon[1] - epsilon[0]) * batch / max(1, n_batches - 1)
+        size = min(batch_size, n_episodes - batch * batch_size)
+        states = np.full(size, env.start)
+        active = np.ones(size, dtype=bool)
+        episode_return = np.zeros(size)
+        path = [env.start]
+
+        for _ in range(max_steps):
+            idx = np.flatnonzero(active)
+            if not len(idx):
+                break
+            s = states[idx]
+            explore = rng.random(len(idx)) < eps
+            a = np.where(explore, rng.integers(env.n_actions, size=len(idx)), greedy_action(Q, s, rng))
+            s_next, r, done = env.step(s, a)
+
+            td = r + gamma * np.where(done, 0.0, Q[s_next].max(axis=1)) - Q[s, a]
+            flat = s * env.n_actions + a
+            total = np.bincount(flat, weights=td, minlength=Q.size)
+            count = np.bincount(flat, minlength=Q.size)
+            Q += (alpha * total / np.maximum(count, 1)).reshape(Q.shape)
+
+            episode_return[idx] += r
+            states[idx] = s_next
+            active[idx[done]] = False
+            if idx[0] == 0:
+                path.append(s_next[0])
+
+        snapshots.append(Q.copy())
+        returns.append(episode_return)
+        paths.append(np.array(path))
+
+    return {"q": np.array(snapshots), "returns": np.concatenate(returns), "paths": paths}
+
+
+def greedy_path(env, Q, max_steps=None):
+    # States visited by always taking the best action from the start, until the
+    # episode ends, a state repeats, or max_steps (default: every state once) runs out
+    path = [env.start]
+    for _ in range(max_steps or env.n_states):
+        if env.terminal[path[-1]]:
+            break
+        state = env.next_state[path[-1], greedy_action(Q, path[-1])]
+        if state in path:
+            break
+        path.append(state)
+    return np.array(path)
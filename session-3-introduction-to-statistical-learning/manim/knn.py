@@ -1,101 +1,147 @@
 from manim import *
 import numpy as np  # Make sure numpy is imported
 
+from glyph_cache import cached_text
+from neighbors import KDTree, classify_grid, majority_vote
+from point_cloud import PointCloud
+
 
 class KNNScene(Scene):
+    # Training points per class, the K of K-NN, and how many extra query points stream in
+    points_per_class = 15
+    k = 5
+    num_stream_queries = 6
+    seed = 0
+
     def construct(self):
         # 0. Title
-        title = Text("K-Nearest Neighbors (KNN)", font_size=36).to_edge(UP)
+        title = cached_text("K-Nearest Neighbors (KNN)", font_size=36).to_edge(UP)
         self.play(Write(title))
 
         # 1. Setup - Create two clusters of classified data
-
-        # --- ADJUSTED PARAMETERS for TIGHTER CLUSTERS ---
-        cluster_A = VGroup(*[Dot(color=BLUE_D) for _ in range(15)])
-        cluster_A.arrange_in_grid(rows=4, cols=4, buff=0.15).scale(0.6)  # Tighter buff and scale
-        cluster_A.shift(LEFT * 2 + DOWN * 0.5)  # Moved further left
-
-        # Add less randomness
-        for dot in cluster_A:
-            dot.shift(np.random.rand(3) * 0.3)
-
-        cluster_B = VGroup(*[Dot(color=RED_D) for _ in range(15)])
-        cluster_B.arrange_in_grid(rows=4, cols=4, buff=0.15).scale(0.6)  # Tighter buff and scale
-        cluster_B.shift(RIGHT * 2 + UP * 0.5)  # Moved further right
-
-        # Add less randomness
-        for dot in cluster_B:
-            dot.shift(np.random.rand(3) * 0.3)
-        # --- END OF ADJUSTMENTS ---
-
-        class_A_label = Text("Class A", color=BLUE_D, font_size=24).next_to(cluster_A, DOWN, buff=0.5)
-        class_B_label = Text("Class B", color=RED_D, font_size=24).next_to(cluster_B, UP, buff=0.5)
-
-        self.play(FadeIn(cluster_A), FadeIn(cluster_B),
-                  Write(class_A_label), Write(class_B_label))
+        rng = np.random.default_rng(self.seed)
+        n = self.points_per_class
+        class_colors = [BLUE_D, RED_D]
+        centers = np.array([[-2.0, -0.5], [2.0, 0.5]])  # Class A on the left, class B on the right
+        spread = 0.45 * np.sqrt(max(1.0, n / 15))  # Larger clusters spread out a little more
+        points = np.concatenate([center + rng.normal(scale=spread, size=(n, 2)) for center in centers])
+        labels = np.repeat([0, 1], n)
+
+        # The tree is built once over all training points
+        tree = KDTree(points)
+
+        def to_scene(xy):
+            return np.column_stack([xy, np.zeros(len(xy))])
+
+        # Every training point in one point cloud, coloured by class (smaller points for big clusters)
+        cloud = PointCloud(points, colors=[class_colors[label] for label in labels], radius=0.08 if n <= 100 else 0.03)
+
+        class_A, class_B = points[labels == 0], points[labels == 1]
+        class_A_label = cached_text("Class A", color=BLUE_D, font_size=24).next_to(
+            [class_A[:, 0].mean(), class_A[:, 1].min(), 0], DOWN, buff=0.5)
+        class_B_label = cached_text("Class B", color=RED_D, font_size=24).next_to(
+            [class_B[:, 0].mean(), class_B[:, 1].max(), 0], UP, buff=0.5)
+
+        self.play(FadeIn(cloud), Write(class_A_label), Write(class_B_label))
         self.wait(1)
 
         # --------------------------------------------------
         # Phase 1: New Point Arrives
         # --------------------------------------------------
-        subtitle = Text("A new point appears...", font_size=28).next_to(title, DOWN, buff=0.5)
+        subtitle = cached_text("A new point appears...", font_size=28).next_to(title, DOWN, buff=0.5)
         self.play(Write(subtitle))
 
-        # This is our new, unclassified query point
-        # --- ADJUSTED: Star is much smaller ---
-        query_point = Star(color=WHITE).scale(0.4).move_to(RIGHT * 0.3 + DOWN * 0.5)
+        # This is our new, unclassified query point, followed by a stream of others
+        queries = np.concatenate([
+            [[0.3, -0.5]],
+            rng.uniform([-3.5, -2.5], [3.5, 2.0], size=(self.num_stream_queries, 2)),
+        ])
+        # Every query is answered in one batched call
+        distances, neighbor_indices = tree.query(queries, self.k)
+        predicted, votes = majority_vote(labels, neighbor_indices, n_classes=2)
+
+        query_point = Star(color=WHITE).scale(0.4).move_to(to_scene(queries[:1])[0]).set_z_index(3)
 
         self.play(FadeIn(query_point, scale=1.5))
         self.wait(1)
 
         # --------------------------------------------------
-        # Phase 2: Find K-Nearest Neighbors (K=5)
+        # Phase 2: Find K-Nearest Neighbors
         # --------------------------------------------------
-        new_subtitle = Text("Find K=5 Nearest Neighbors", font_size=28).move_to(subtitle)
+        new_subtitle = cached_text(f"Find K={self.k} Nearest Neighbors", font_size=28).move_to(subtitle)
         self.play(Transform(subtitle, new_subtitle))
 
-        # --- ADJUSTED: Smaller circle radius ---
-        k_circle = Circle(radius=1.8, color=YELLOW).move_to(query_point.get_center())
-        self.play(Create(k_circle))
+        # The circle reaches exactly the K-th nearest neighbour
+        def neighborhood(q):
+            return Circle(radius=distances[q, -1], color=YELLOW).move_to(to_scene(queries[q:q + 1])[0])
+
+        # The neighbours themselves are highlighted in the point cloud: bigger, in their class color
+        def highlight_neighbors(q):
+            cloud.unhighlight().highlight(neighbor_indices[q], color=None, scale=1.8)
 
-        # --- ADJUSTED: Picked neighbors that are now on the inner edges ---
-        # (Points 3, 7, 11 are on the right edge of the 4x4 grid)
-        neighbors_A = VGroup(cluster_A[3], cluster_A[7], cluster_A[11])
-        # (Points 0, 4 are on the left edge of the 4x4 grid)
-        neighbors_B = VGroup(cluster_B[0], cluster_B[4])
-        all_neighbors = VGroup(neighbors_A, neighbors_B)
-
-        self.play(
-            neighbors_A.animate.set_color(BLUE_A),
-            neighbors_B.animate.set_color(RED_A),
-            LaggedStart(*[Indicate(d, color=YELLOW) for d in all_neighbors], lag_ratio=0.1)
-        )
+        k_circle = neighborhood(0)
+        self.play(Create(k_circle))
+        highlight_neighbors(0)
+        self.play(LaggedStart(*[
+            Flash(to_scene(points[i:i + 1])[0], color=YELLOW, line_length=0.12, flash_radius=0.15)
+            for i in neighbor_indices[0]
+        ], lag_ratio=0.1))
         self.wait(1)
 
         # --------------------------------------------------
         # Phase 3: Neighbors "Vote"
         # --------------------------------------------------
-        # --- ADJUSTED: Text reflects new 3/2 split ---
-        new_subtitle = Text("Neighbors 'Vote' (3 Blue, 2 Red)", font_size=28).move_to(subtitle)
+        new_subtitle = cached_text(f"Neighbors 'Vote' ({votes[0, 0]} Blue, {votes[0, 1]} Red)", font_size=28).move_to(subtitle)
         self.play(Transform(subtitle, new_subtitle))
 
-        # Show the votes "firing" at the query point
-        self.play(Indicate(query_point, color=BLUE_A), run_time=0.3)
-        self.play(Indicate(query_point, color=RED_A), run_time=0.3)
-        self.play(Indicate(query_point, color=BLUE_A), run_time=0.3)
-        self.play(Indicate(query_point, color=RED_A), run_time=0.3)
-        self.play(Indicate(query_point, color=BLUE_A), run_time=0.3)
+        # Show the votes "firing" at the query point, nearest neighbour first
+        vote_colors = [BLUE_A, RED_A]
+        for i in neighbor_indices[0]:
+            self.play(Indicate(query_point, color=vote_colors[labels[i]]), run_time=0.3)
         self.wait(1)
 
         # --------------------------------------------------
         # Phase 4: Final Classification
         # --------------------------------------------------
-        new_subtitle = Text("Final Class: BLUE (Majority Wins!)", font_size=28).move_to(subtitle)
+        class_names = ["BLUE", "RED"]
+        new_subtitle = cached_text(f"Final Class: {class_names[predicted[0]]} (Majority Wins!)", font_size=28).move_to(subtitle)
         self.play(Transform(subtitle, new_subtitle))
 
         # The query point takes on the color of the majority class
-        self.play(
-            query_point.animate.set_color(BLUE_D),
-            FadeOut(k_circle)
-        )
-        self.wait(3)
\ No newline at end of file
+        self.play(query_point.animate.set_color(class_colors[predicted[0]]))
+        self.wait(1)
+
+        # --------------------------------------------------
+        # Phase 5: A Stream of Queries
+        # --------------------------------------------------
+        new_subtitle = cached_text("Every new point is classified the same way", font_size=28).move_to(subtitle)
+        self.play(Transform(subtitle, new_subtitle))
+
+        # The first query stays, with its class; the circle and the highlight move on to each new point
+        classified = VGroup(query_point)
+        for q in range(1, len(queries)):
+            star = Star(color=WHITE).scale(0.4).move_to(to_scene(queries[q:q + 1])[0]).set_z_index(3)
+            highlight_neighbors(q)
+            self.play(FadeIn(star, scale=1.5), Transform(k_circle, neighborhood(q)), run_time=0.6)
+            self.play(star.animate.set_color(class_colors[predicted[q]]), run_time=0.3)
+            classified.add(star)
+        cloud.unhighlight()
+        self.play(FadeOut(k_circle))
+
+        # --------------------------------------------------
+        # Phase 6: Decision Regions
+        # --------------------------------------------------
+        new_subtitle = cached_text("Decision regions: every point of the plane at once", font_size=28).move_to(subtitle)
+        self.play(Transform(subtitle, new_subtitle))
+
+        # A dense grid classified in one batched query, shown as a single image
+        x_range = (-config.frame_width / 2, config.frame_width / 2)
+        y_range = (-config.frame_height / 2, config.frame_height / 2)
+        regions = classify_grid(tree, labels, x_range, y_range, resolution=(284, 160), k=self.k)
+        region_rgba = np.array([[*ManimColor(color).to_rgb(), 0.35] for color in class_colors]) * 255
+        region_image = ImageMobject(region_rgba[regions[::-1]].astype(np.uint8))  # Image rows run from the top down
+        region_image.stretch_to_fit_width(config.frame_width).stretch_to_fit_height(config.frame_height)
+        region_image.set_z_index(-1)
+
+        self.play(FadeIn(region_image))
+        self.wait(3)
@@ -1,12 +1,38 @@
 from manim import *
+import numpy as np
+
+from contours import band_image
+from glyph_cache import CachedDecimal, cached_text
+from point_cloud import PointCloud, axes_to_screen
+from regression import gradient_descent, least_squares, loss_surface, make_data
 
 
 class LinearRegressionScene(Scene):
+    # The data set and the mini-batch gradient descent run on it (full-batch while the data
+    # set is no bigger than a batch). Data sets larger than max_drawn_points are drawn as a
+    # random sample of that many points.
+    n_points = 8
+    steps = 1000
+    learning_rate = 0.025
+    batch_size = 32
+    decay = 0.001  # Learning rate decay, so the descent settles on the optimum
+    start = (-0.2, 4.0)  # (slope, intercept) of the first guess
+    max_drawn_points = 100000
+    seed = 0
+
     def construct(self):
         # 0. Title
         #title = Text("Linear Regression", font_size=36).to_edge(UP)
         #self.play(Write(title))
 
+        # The data, the exact fit and the descent are all computed up front
+        x, y = make_data(self.n_points, seed=self.seed)
+        best_slope, best_intercept = least_squares(x, y)
+        descent = gradient_descent(
+            x, y, self.steps, self.learning_rate, self.batch_size, self.start, decay=self.decay, seed=self.seed
+        )
+        params = descent["params"]
+
         # 1. Setup - Create Axes and Data
         # We create a number plane
         axes = NumberPlane(
@@ -18,15 +44,12 @@ class LinearRegressionScene(Scene):
         ).add_coordinates()
         axes.to_edge(LEFT, buff=1.5)
 
-        # Our hard-coded data points
-        data_points = [
-            (1, 2), (2, 3), (3, 3.5), (4, 5.5),
-            (5, 5), (6, 7), (7, 6.5), (8, 8)
-        ]
-
-        # Create Dot mobjects for each point
-        dots = VGroup(*[Dot(axes.c2p(x, y), color=BLUE) for x, y in data_points])
-        data_label = Text("Original Data", font_size=24).next_to(dots, UP, buff=0.5)
+        # All the points in one point cloud
+        shown = slice(None)
+        if self.n_points > self.max_drawn_points:
+            shown = np.random.default_rng(self.seed).permutation(self.n_points)[:self.max_drawn_points]
+        dots = PointCloud.from_axes(axes, x[shown], y[shown], colors=BLUE, radius=0.08 if self.n_points <= 200 else 0.02)
+        data_label = cached_text("Original Data", font_size=24).next_to(dots, UP, buff=0.5)
 
         self.play(Create(axes), FadeIn(dots), Write(data_label))
         self.wait(1)
@@ -34,39 +57,86 @@ class LinearRegressionScene(Scene):
         # --------------------------------------------------
         # Phase 1: Training ("Finding the Line")
         # --------------------------------------------------
-        train_title = Text("Find the 'Best-Fit' Line", font_size=28).to_edge(RIGHT, buff=1.5).align_to(UP)
+        train_title = cached_text("Find the 'Best-Fit' Line", font_size=28).to_edge(RIGHT, buff=1.0).to_edge(UP)
         #train_subtitle = Text("Find the 'Best-Fit' Line", font_size=20).next_to(train_title, DOWN, buff=0.2)
         self.play(Write(train_title))
 
-        # Show a "bad" line first
-        # --- CORRECTED LINE ---
-        bad_line = axes.plot(lambda x: 0.5 * x + 1, x_range=[0, 9], color=RED_E)
-        self.play(Create(bad_line))
+        # The loss of every possible line, over (slope, intercept), on axes that hold the
+        # whole descent path and the optimum, rounded out to whole ticks
+        visited = np.vstack([params, [best_slope, best_intercept]])
+        ticks = np.array([0.5, 1])
+        low = np.floor((visited.min(axis=0) - 0.2) / ticks) * ticks
+        high = np.ceil((visited.max(axis=0) + 0.2) / ticks) * ticks
+        slope_range, intercept_range = (low[0], high[0]), (low[1], high[1])
+        loss_axes = Axes(
+            x_range=(*slope_range, ticks[0]),
+            y_range=(*intercept_range, ticks[1]),
+            x_length=4,
+            y_length=3.6,
+            axis_config={"include_tip": False, "color": GRAY, "font_size": 18},
+        ).add_coordinates()
+        loss_axes.next_to(train_title, DOWN, buff=0.6)
+        _, _, loss = loss_surface(x, y, slope_range, intercept_range, resolution=(200, 180))
+        surface = band_image(loss_axes, loss, slope_range, intercept_range).set_z_index(-1)
+        loss_labels = VGroup(
+            cached_text("slope", font_size=18).next_to(loss_axes.x_axis, DOWN, buff=0.4),
+            cached_text("intercept", font_size=18).rotate(PI / 2).next_to(loss_axes.y_axis, LEFT, buff=0.4),
+        )
+        # The exact least-squares answer: the bottom of the bowl
+        optimum = Star(color=WHITE, fill_opacity=1).scale(0.1).move_to(loss_axes.c2p(best_slope, best_intercept))
+
+        # Show the first guess, a "bad" line, and where it sits on the loss surface
+        slope, intercept = params[0]
+        current_line = Line(axes.c2p(0, intercept), axes.c2p(9, 9 * slope + intercept), color=RED_E)
+        path_points = axes_to_screen(loss_axes, params[:, 0], params[:, 1])
+        current_params = Dot(path_points[0], color=RED_E, radius=0.06)
+        self.play(FadeIn(surface), Create(loss_axes), Write(loss_labels), FadeIn(optimum))
+        self.play(Create(current_line), FadeIn(current_params))
         self.wait(1)
 
-        # This is our "correct" best-fit line
-        # --- CORRECTED LINE ---
-        best_fit_line = axes.plot(lambda x: 0.85 * x + 1, x_range=[0, 9], color=GREEN)
-
-        # "Train" by transforming the bad line into the good one
-        self.play(Transform(bad_line, best_fit_line))
+        step_counter = CachedDecimal(0, prefix=r"\text{Step: }", num_decimal_places=0, font_size=22)
+        loss_value = CachedDecimal(descent["loss"][0], prefix=r"\text{MSE} =", num_decimal_places=3, font_size=22)
+        readouts = VGroup(step_counter, loss_value).arrange(DOWN, aligned_edge=LEFT).next_to(loss_axes, DOWN, buff=0.6)
+        self.play(FadeIn(readouts))
+
+        # "Train": every frame shows one real step of the descent, on the data and on the loss surface
+        descent_path = VMobject(stroke_color=YELLOW, stroke_width=2).set_points_as_corners(path_points[:2])
+        self.add(descent_path)
+        step = ValueTracker(0)
+
+        def update_descent(mob):
+            k = int(step.get_value())
+            slope, intercept = params[k]
+            current_line.put_start_and_end_on(axes.c2p(0, intercept), axes.c2p(9, 9 * slope + intercept))
+            current_params.move_to(path_points[k])
+            descent_path.set_points_as_corners(path_points[:max(k, 1) + 1])
+            step_counter.set_value(k)
+            loss_value.set_value(descent["loss"][k])
+
+        descent_driver = Dot().set_opacity(0)  # Invisible dot
+        descent_driver.add_updater(update_descent)
+        self.add(descent_driver)
+        self.play(step.animate.set_value(self.steps), run_time=6, rate_func=linear)
+        descent_driver.remove_updater(update_descent)
+        self.play(current_line.animate.set_color(GREEN), current_params.animate.set_color(GREEN))
         self.wait(1)
 
         # --------------------------------------------------
         # Phase 2: Inference ("Making a Prediction")
         # --------------------------------------------------
-        infer_title = Text("Predict Y for a new X", font_size=28).move_to(train_title)
+        infer_title = cached_text("Predict Y for a new X", font_size=28).move_to(train_title)
         #infer_subtitle = Text("Predict Y for a new X", font_size=20).next_to(infer_title, DOWN, buff=0.2)
         self.play(Transform(train_title, infer_title))
 
         # Create a new X query
         new_x = 4.5
         new_x_dot = Dot(axes.c2p(new_x, 0), color=YELLOW)
-        new_x_label = Text("New X", font_size=20).next_to(new_x_dot, DOWN)
+        new_x_label = cached_text("New X", font_size=20).next_to(new_x_dot, DOWN)
         self.play(FadeIn(new_x_dot), Write(new_x_label))
 
-        # Project from X up to the line
-        predicted_y = 0.85 * new_x + 1
+        # Project from X up to the trained line
+        slope, intercept = params[-1]
+        predicted_y = slope * new_x + intercept
         vert_line = DashedLine(
             axes.c2p(new_x, 0),
             axes.c2p(new_x, predicted_y),
@@ -84,7 +154,7 @@ class LinearRegressionScene(Scene):
 
         # Show the final predicted dot and value
         pred_dot = Dot(axes.c2p(0, predicted_y), color=RED)
-        pred_label = Text(f"Pred Y: {predicted_y:.1f}", font_size=20).next_to(pred_dot, LEFT)
+        pred_label = cached_text(f"Pred Y: {predicted_y:.1f}", font_size=20).next_to(pred_dot, LEFT)
 
         self.play(FadeIn(pred_dot), Write(pred_label))
-        self.wait(3)
\ No newline at end of file
+        self.wait(3)
@@ -1,136 +1,183 @@
 from manim import *
+from pathlib import Path
+import hashlib
+import inspect
 import numpy as np
 
+from billboards import BillboardParticles
+from chunking import ChunkedScene
+from polyline import StreamingTrails
+
+
+def lorenz(state, s=10, r=28, b=2.667):
+    # Lorenz derivatives for a whole (N, 3) array of states at once
+    x, y, z = state[:, 0], state[:, 1], state[:, 2]
+    return np.stack([
+        s * (y - x),
+        r * x - y - x * z,
+        x * y - b * z
+    ], axis=1)
+
+
+def rk4_step(f, state, h):
+    # Classic 4th-order Runge-Kutta step for a batched state array
+    k1 = f(state)
+    k2 = f(state + h / 2 * k1)
+    k3 = f(state + h / 2 * k2)
+    k4 = f(state + h * k3)
+    return state + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+class LorenzEnsemble:
+    # Advances N particles of the Lorenz system together in one batched step.
+    # Scene coordinates are scaled up by `space_scale` to get Lorenz coordinates,
+    # and time runs `time_scale` times slower than the scene clock.
+    def __init__(self, initial_points, space_scale=10.0, time_scale=0.1):
+        self.space_scale = space_scale
+        self.time_scale = time_scale
+        self.state = np.array(initial_points, dtype=float) * space_scale
+
+    @property
+    def positions(self):
+        # (N, 3) positions in scene coordinates
+        return self.state / self.space_scale
+
+    def step(self, dt):
+        # One RK4 step of `dt` seconds of scene time
+        self.state = rk4_step(lorenz, self.state, dt * self.time_scale)
+
+    def integrate(self, duration, samples_per_second=60, substeps=10):
+        # Integrate `duration` seconds at a fixed physics timestep and return
+        # the sampled positions as a (samples, N, 3) float32 array.
+        # The physics timestep is independent of the render frame rate.
+        n_samples = int(np.ceil(duration * samples_per_second)) + 1
+        h = 1.0 / (samples_per_second * substeps)
+        samples = np.empty((n_samples,) + self.state.shape, dtype=np.float32)
+        samples[0] = self.positions
+        for k in range(1, n_samples):
+            for _ in range(substeps):
+                self.step(h)
+            samples[k] = self.positions
+        return samples
+
+
+def load_trajectory(initial_points, duration, samples_per_second=60, substeps=10, cache_dir=None):
+    # Integrate the trajectory once and keep it as a .npy file keyed on its inputs.
+    # Later renders (any quality, any frame rate) memory-map the same file.
+    # The key also covers the source of the physics (the Lorenz parameters, the scales and
+    # the integrator), so editing any of it integrates a fresh trajectory.
+    initial_points = np.ascontiguousarray(initial_points, dtype=float)
+    physics = "".join(inspect.getsource(f) for f in (lorenz, rk4_step, LorenzEnsemble))
+    key = hashlib.sha1(
+        initial_points.tobytes() + repr((duration, samples_per_second, substeps)).encode() + physics.encode()
+    ).hexdigest()[:16]
+    cache_dir = Path(cache_dir or Path(config.media_dir) / "trajectories")
+    path = cache_dir / f"lorenz_{key}.npy"
+
+    if not path.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        samples = LorenzEnsemble(initial_points).integrate(duration, samples_per_second, substeps)
+        # Write to a temporary file first so an interrupted run never leaves a partial cache
+        tmp_path = path.with_suffix(".tmp.npy")
+        np.save(tmp_path, samples)
+        tmp_path.replace(path)
+
+    return np.load(path, mmap_mode="r")
+
+
+class TrajectoryPlayback:
+    # Indexed playback of a precomputed (samples, N, 3) trajectory
+    def __init__(self, samples, samples_per_second=60):
+        self.samples = samples
+        self.samples_per_second = samples_per_second
+        self.time = 0.0
+
+    @property
+    def index(self):
+        # Index of the last sample at or before the current time
+        return min(int(self.time * self.samples_per_second), len(self.samples) - 1)
+
+    def advance(self, dt):
+        self.time += dt
+
+    def positions(self):
+        # Linear interpolation between the two samples around the current time
+        k = self.time * self.samples_per_second
+        i = min(int(k), len(self.samples) - 2)
+        alpha = min(k - i, 1.0)
+        return (1 - alpha) * self.samples[i] + alpha * self.samples[i + 1]
+
+
+class LorenzAttractor(ChunkedScene, ThreeDScene):
+    # Number of particles in the sensitive-dependence demo
+    num_particles = 5
+    # Length of the run, and the fixed rate at which the trajectory is sampled
+    duration = 520
+    samples_per_second = 60
+    camera_rotation_rate = 0.05
+    # Trails are simplified to within this many pixels of the exact trajectory, and keep
+    # at most this many vertices each (about 5 per second of trajectory are needed)
+    trail_tolerance = 0.5
+    trail_max_vertices = 5000
 
-class LorenzAttractor(ThreeDScene):
     def construct(self):
         axes = ThreeDAxes()
         # axes = ThreeDAxes(x_min=-3.5,x_max=3.5,y_min=-3.5,y_max=3.5,z_min=0,z_max=6,axis_config={"include_tip": True,"include_ticks":True,"stroke_width":1})
-        dot = Sphere(radius=0.05, fill_color=BLUE).move_to(0 * RIGHT + 0.2 * UP + 0.105 * OUT)
-        dot.set_color(BLUE)
-        dot2 = Sphere(radius=0.05, fill_color=YELLOW).move_to(0 * RIGHT + 0.1 * UP + 0.105 * OUT)
-        dot2.set_color(YELLOW)
-        dot3 = Sphere(radius=0.05, fill_color=RED).move_to(0 * RIGHT + 0.05 * UP + 0.105 * OUT)
-        dot3.set_color(RED)
-        dot4 = Sphere(radius=0.05, fill_color=ORANGE).move_to(0 * RIGHT + 0.15 * UP + 0.105 * OUT)
-        dot4.set_color(ORANGE)
-        dot5 = Sphere(radius=0.05, fill_color=PURPLE).move_to(0 * RIGHT + 0.25 * UP + 0.105 * OUT)
-        dot5.set_color(PURPLE)
+
+        # Initial conditions differ only slightly in y
+        n = self.num_particles
+        initial_points = np.zeros((n, 3))
+        initial_points[:, 1] = np.linspace(0.05, 0.25, n)
+        initial_points[:, 2] = 0.105
+        colors = color_gradient([RED, YELLOW, ORANGE, BLUE, PURPLE], n)
+
+        # The physics is integrated once, up front, and then played back
+        samples = load_trajectory(initial_points, self.duration, self.samples_per_second)
+        playback = TrajectoryPlayback(samples, self.samples_per_second)
 
         self.set_camera_orientation(phi=65 * DEGREES, theta=30 * DEGREES, gamma=0 * DEGREES)
-        self.begin_ambient_camera_rotation(rate=0.05)  # Start move camera
-
-        dtime = 0.01
-        numsteps = 30
-
-        self.add(axes, dot, dot2, dot3, dot4, dot5)
-
-        def lorenz(x, y, z, s=10, r=28, b=2.667):
-            x_dot = s * (y - x)
-            y_dot = r * x - y - x * z
-            z_dot = x * y - b * z
-            return x_dot, y_dot, z_dot
-
-        def update_trajectory(self, dt):
-            new_point = dot.get_center()
-            if np.linalg.norm(new_point - self.points[-1]) > 0.01:
-                self.add_smooth_curve_to(new_point)
-
-        def update_trajectory2(self, dt):
-            new_point = dot2.get_center()
-            if np.linalg.norm(new_point - self.points[-1]) > 0.01:
-                self.add_smooth_curve_to(new_point)
-
-        def update_trajectory3(self, dt):
-            new_point = dot3.get_center()
-            if np.linalg.norm(new_point - self.points[-1]) > 0.01:
-                self.add_smooth_curve_to(new_point)
-
-        def update_trajectory4(self, dt):
-            new_point = dot4.get_center()
-            if np.linalg.norm(new_point - self.points[-1]) > 0.01:
-                self.add_smooth_curve_to(new_point)
-
-        def update_trajectory5(self, dt):
-            new_point = dot5.get_center()
-            if np.linalg.norm(new_point - self.points[-1]) > 0.01:
-                self.add_smooth_curve_to(new_point)
-
-        traj = VMobject()
-        traj.start_new_path(dot.get_center())
-        traj.set_stroke(BLUE, 1.5, opacity=0.6)
-        traj.add_updater(update_trajectory)
-        self.add(traj)
-
-        traj2 = VMobject()
-        traj2.start_new_path(dot2.get_center())
-        traj2.set_stroke(YELLOW, 1.5, opacity=0.6)
-        traj2.add_updater(update_trajectory2)
-        self.add(traj2)
-
-        traj3 = VMobject()
-        traj3.start_new_path(dot3.get_center())
-        traj3.set_stroke(RED, 1.5, opacity=0.6)
-        traj3.add_updater(update_trajectory3)
-        self.add(traj3)
-
-        traj4 = VMobject()
-        traj4.start_new_path(dot4.get_center())
-        traj4.set_stroke(ORANGE, 1.5, opacity=0.6)
-        traj4.add_updater(update_trajectory4)
-        self.add(traj4)
-
-        traj5 = VMobject()
-        traj5.start_new_path(dot5.get_center())
-        traj5.set_stroke(PURPLE, 1.5, opacity=0.6)
-        traj5.add_updater(update_trajectory5)
-        self.add(traj5)
-
-        def update_position(self, dt):
-            x_dot, y_dot, z_dot = lorenz(dot.get_center()[0] * 10, dot.get_center()[1] * 10, dot.get_center()[2] * 10)
-            x = x_dot * dt / 10
-            y = y_dot * dt / 10
-            z = z_dot * dt / 10
-            self.shift(x / 10 * RIGHT + y / 10 * UP + z / 10 * OUT)
-
-        def update_position2(self, dt):
-            x_dot, y_dot, z_dot = lorenz(dot2.get_center()[0] * 10, dot2.get_center()[1] * 10,
-                                         dot2.get_center()[2] * 10)
-            x2 = x_dot * dt / 10
-            y2 = y_dot * dt / 10
-            z2 = z_dot * dt / 10
-            self.shift(x2 / 10 * RIGHT + y2 / 10 * UP + z2 / 10 * OUT)
-
-        def update_position3(self, dt):
-            x_dot, y_dot, z_dot = lorenz(dot3.get_center()[0] * 10, dot3.get_center()[1] * 10,
-                                         dot3.get_center()[2] * 10)
-            x3 = x_dot * dt / 10
-            y3 = y_dot * dt / 10
-            z3 = z_dot * dt / 10
-            self.shift(x3 / 10 * RIGHT + y3 / 10 * UP + z3 / 10 * OUT)
-
-        def update_position4(self, dt):
-            x_dot, y_dot, z_dot = lorenz(dot4.get_center()[0] * 10, dot4.get_center()[1] * 10,
-                                         dot4.get_center()[2] * 10)
-            x4 = x_dot * dt / 10
-            y4 = y_dot * dt / 10
-            z4 = z_dot * dt / 10
-            self.shift(x4 / 10 * RIGHT + y4 / 10 * UP + z4 / 10 * OUT)
-
-        def update_position5(self, dt):
-            x_dot, y_dot, z_dot = lorenz(dot5.get_center()[0] * 10, dot5.get_center()[1] * 10,
-                                         dot5.get_center()[2] * 10)
-            x5 = x_dot * dt / 10
-            y5 = y_dot * dt / 10
-            z5 = z_dot * dt / 10
-            self.shift(x5 / 10 * RIGHT + y5 / 10 * UP + z5 / 10 * OUT)
-
-        dot.add_updater(update_position)
-        dot2.add_updater(update_position2)
-        dot3.add_updater(update_position3)
-        dot4.add_updater(update_position4)
-        dot5.add_updater(update_position5)
-        self.wait(520)
+        self.begin_ambient_camera_rotation(rate=self.camera_rotation_rate)  # Start move camera
+
+        self.add(axes)
+
+        # Particles and their trails are projected together, one matrix multiply per frame,
+        # and drawn as depth-sorted discs that face the camera
+        particles = BillboardParticles(self.camera, initial_points, colors, radius=0.05)
+        self.add_fixed_in_frame_mobjects(particles)
+
+        # The trails take every sample passed, simplified on the fly. The pixel tolerance is
+        # turned into scene units for the nearest the trajectory ever gets to the camera.
+        reach = np.linalg.norm(samples[::self.samples_per_second], axis=2).max()
+        focal_distance = self.camera.get_focal_distance()
+        max_scale = self.camera.get_zoom() * focal_distance / max(focal_distance - reach, 1e-6)
+        tolerance = self.trail_tolerance * config.frame_width / config.pixel_width / max_scale
+        trails = StreamingTrails(samples[0], tolerance, max_vertices=self.trail_max_vertices)
+
+        # Index of the last sample added to the trails. Must be a list to be mutable inside the updater.
+        last_trail_index = [0]
+
+        def update_view():
+            # Feed the trails every sample passed since the last frame, so their shape does
+            # not depend on the frame rate; each trail ends at its particle
+            trails.extend(samples[last_trail_index[0] + 1:playback.index + 1])
+            last_trail_index[0] = playback.index
+            positions = playback.positions()
+            particles.set_view(positions, trails.polylines(positions))
+
+        # A single updater advances the playback clock and redraws every particle and trail
+        def update_particles(mob, dt):
+            playback.advance(dt)
+            update_view()
+
+        particles.add_updater(update_particles)
+
+        # When rendered in chunks, a chunk starts straight from the precomputed samples
+        def seek(seconds):
+            playback.advance(seconds)
+            self.set_camera_orientation(theta=30 * DEGREES + self.camera_rotation_rate * seconds)
+            update_view()
+
+        self.chunked_wait(self.duration, seek=seek)
 
         # 50,4
-        # 40,3
\ No newline at end of file
+        # 40,3
@@ -0,0 +1,177 @@
+import numpy as np
+
+
+# Shared N-body engine for the orbital mechanics and chaos scenes.
+# All state lives in contiguous (N, 3) arrays so that one frame of physics is
+# a handful of NumPy operations, no matter how many bodies there are.
+
+
+def direct_accelerations(targets, sources, source_masses, G=1.0, softening=0.1):
+    # Accelerations on `targets` from every body in `sources`, in one broadcast operation.
+    # Plummer softening (r^2 + eps^2) keeps close encounters from exploding.
+    r_vec = sources[np.newaxis, :, :] - targets[:, np.newaxis, :]  # r_vec[i, j] = s_j - t_i
+    r_sq = np.einsum("ijk,ijk->ij", r_vec, r_vec) + softening ** 2
+    with np.errstate(divide="ignore"):
+        inv_r3 = np.where(r_sq > 0, r_sq ** -1.5, 0.0)  # A body exerts no force on itself
+    return G * np.einsum("ij,ijk->ik", inv_r3 * source_masses[np.newaxis, :], r_vec)
+
+
+def pairwise_accelerations(positions, masses, G=1.0, softening=0.1, chunk_size=None):
+    # Exact all-pairs accelerations. The broadcast buffers grow as N^2, so for
+    # large N pass a `chunk_size` to process that many target rows at a time.
+    if chunk_size is None or chunk_size >= len(positions):
+        return direct_accelerations(positions, positions, masses, G, softening)
+    return np.concatenate([
+        direct_accelerations(positions[start:start + chunk_size], positions, masses, G, softening)
+        for start in range(0, len(positions), chunk_size)
+    ])
+
+
+class Octree:
+    # A Barnes-Hut octree stored as flat per-node lists.
+    # Flat (z = 0) systems only ever fill four octants, so it doubles as a quadtree.
+    def __init__(self, positions, masses, leaf_size=8):
+        self.positions = positions
+        self.masses = masses
+        self.leaf_size = leaf_size
+
+        self.mass = []  # Total mass of each node
+        self.com = []  # Centre of mass of each node
+        self.size = []  # Side length of each node's cube
+        self.children = []  # Child node indices (empty for leaves)
+        self.bodies = []  # Body indices held by leaves (None for internal nodes)
+
+        lo, hi = positions.min(axis=0), positions.max(axis=0)
+        half = max(np.max(hi - lo) / 2, 1e-9) * (1 + 1e-9)
+        self._build(np.arange(len(positions)), (lo + hi) / 2, half)
+
+        self.mass = np.array(self.mass)
+        self.com = np.array(self.com)
+        self.size = np.array(self.size)
+
+    def _build(self, idx, center, half):
+        node = len(self.mass)
+        m = self.masses[idx]
+        total = m.sum()
+        self.mass.append(total)
+        self.com.append(m @ self.positions[idx] / total if total > 0 else center)
+        self.size.append(2 * half)
+        self.children.append([])
+        self.bodies.append(None)
+
+        # Stop splitting at small leaves (or when bodies sit on top of each other)
+        if len(idx) <= self.leaf_size or half < 1e-9:
+            self.bodies[node] = idx
+            return node
+
+        octant = (self.positions[idx] > center) @ np.array([1, 2, 4])
+        for o in range(8):
+            sub = idx[octant == o]
+            if len(sub):
+                offset = np.array([o & 1, (o >> 1) & 1, (o >> 2) & 1]) * 2 - 1
+                child = self._build(sub, center + offset * half / 2, half / 2)
+                self.children[node].append(child)
+        return node
+
+
+def barnes_hut_accelerations(positions, masses, G=1.0, softening=0.1, theta=0.5, leaf_size=8):
+    # Approximate accelerations in O(N log N) with a Barnes-Hut octree.
+    # A node is treated as a single point mass when size / distance < theta;
+    # smaller theta is more accurate and slower (theta = 0 is the exact sum).
+    # The tree is walked once for all bodies at the same time: each node keeps
+    # the batch of bodies that still need to open it.
+    tree = Octree(positions, masses, leaf_size)
+    accelerations = np.zeros_like(positions)
+    stack = [(0, np.arange(len(positions)))]
+
+    while stack:
+        node, idx = stack.pop()
+        leaf_bodies = tree.bodies[node]
+        if leaf_bodies is not None:
+            accelerations[idx] += direct_accelerations(
+                positions[idx], positions[leaf_bodies], masses[leaf_bodies], G, softening)
+            continue
+
+        d = tree.com[node] - positions[idx]
+        dist_sq = np.einsum("ij,ij->i", d, d)
+        far = tree.size[node] ** 2 < theta ** 2 * dist_sq
+        if far.any():
+            r_sq = dist_sq[far] + softening ** 2
+            accelerations[idx[far]] += G * tree.mass[node] * d[far] * (r_sq ** -1.5)[:, np.newaxis]
+
+        near = idx[~far]
+        if len(near):
+            for child in tree.children[node]:
+                stack.append((child, near))
+
+    return accelerations
+
+
+class NBodySystem:
+    # Forces are computed with one of these methods:
+    #   "direct"     - exact all-pairs sum, O(N^2)
+    #   "barnes_hut" - octree approximation with opening angle `theta`, O(N log N)
+    #   "auto"       - exact below `direct_max_bodies`, Barnes-Hut above it
+    def __init__(self, positions, velocities, masses, G=1.0, softening=0.1,
+                 method="auto", theta=0.5, direct_max_bodies=1000):
+        self.positions = np.array(positions, dtype=float)
+        self.velocities = np.array(velocities, dtype=float)
+        self.masses = np.array(masses, dtype=float)
+        self.G = G
+        self.softening = softening
+        if method not in ("auto", "direct", "barnes_hut"):
+            raise ValueError(f"Unknown force method: {method!r}")
+        self.method = method
+        self.theta = theta
+        self.direct_max_bodies = direct_max_bodies
+        self.accelerations = self.compute_accelerations()
+
+    def __len__(self):
+        return len(self.masses)
+
+    def compute_accelerations(self):
+        if self.method == "direct" or (self.method == "auto" and len(self) <= self.direct_max_bodies):
+            return pairwise_accelerations(self.positions, self.masses, self.G, self.softening,
+                                          chunk_size=self.direct_max_bodies)
+        return barnes_hut_accelerations(self.positions, self.masses, self.G, self.softening, self.theta)
+
+    def step(self, dt, substeps=1):
+        # Symplectic leapfrog (kick-drift-kick velocity Verlet).
+        # Unlike forward Euler it does not slowly pump energy into the orbits.
+        h = dt / substeps
+        for _ in range(substeps):
+            self.velocities += 0.5 * h * self.accelerations
+            self.positions += h * self.velocities
+            self.accelerations = self.compute_accelerations()
+            self.velocities += 0.5 * h * self.accelerations
+
+    def energy(self):
+        # Total (softened) energy, handy for checking the integrator
+        kinetic = 0.5 * np.sum(self.masses * np.einsum("ij,ij->i", self.velocities, self.velocities))
+        r_vec = self.positions[np.newaxis, :, :] - self.positions[:, np.newaxis, :]
+        r = np.sqrt(np.einsum("ijk,ijk->ij", r_vec, r_vec) + self.softening ** 2)
+        i, j = np.triu_indices(len(self), k=1)
+        potential = -self.G * np.sum(self.masses[i] * self.masses[j] / r[i, j])
+        return kinetic + potential
+
+
+def random_cluster(n, center=(0.0, 0.0, 0.0), radius=2.0, total_mass=1.0, G=1.0, seed=0):
+    # A flat, roughly rotating disc of `n` bodies, useful for large-N demos.
+    # Returns (positions, velocities, masses).
+    rng = np.random.default_rng(seed)
+    r = radius * np.sqrt(rng.uniform(0.05, 1.0, n))
+    theta = rng.uniform(0, 2 * np.pi, n)
+
+    positions = np.zeros((n, 3))
+    positions[:, 0] = r * np.cos(theta)
+    positions[:, 1] = r * np.sin(theta)
+
+    # Circular speed for the mass enclosed within each radius (uniform disc)
+    enclosed = total_mass * (r / radius) ** 2
+    speed = np.sqrt(G * enclosed / r)
+    velocities = np.zeros((n, 3))
+    velocities[:, 0] = -speed * np.sin(theta)
+    velocities[:, 1] = speed * np.cos(theta)
+
+    masses = np.full(n, total_mass / n)
+    return positions + np.asarray(center, dtype=float), velocities, masses
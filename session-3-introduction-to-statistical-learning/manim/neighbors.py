@@ -0,0 +1,123 @@
+import numpy as np
+
+
+# k-nearest-neighbour engine for KNNScene.
+# A KD-tree is built once over the training points; queries are answered in
+# batches by walking the tree once for all of them, like the Barnes-Hut walk in
+# nbody.py. Votes and decision regions are vectorized over every query.
+
+
+class KDTree:
+    # A KD-tree stored as flat per-node lists. Each node covers a contiguous
+    # range of `order` (the point indices sorted into tree order) and keeps its
+    # bounding box; internal nodes split their box at the median of its widest side.
+    def __init__(self, points, leaf_size=16):
+        self.points = np.asarray(points, dtype=float)
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(self.points))
+
+        self.lo = []  # Bounding box corners of each node
+        self.hi = []
+        self.start = []  # Range of `order` held by each node
+        self.end = []
+        self.children = []  # (left, right) node indices, or None for leaves
+        self._build(0, len(self.points))
+
+        self.lo = np.array(self.lo)
+        self.hi = np.array(self.hi)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self, start, end):
+        node = len(self.start)
+        pts = self.points[self.order[start:end]]
+        self.lo.append(pts.min(axis=0))
+        self.hi.append(pts.max(axis=0))
+        self.start.append(start)
+        self.end.append(end)
+        self.children.append(None)
+
+        if end - start <= self.leaf_size:
+            return node
+
+        dim = np.argmax(self.hi[node] - self.lo[node])
+        mid = (start + end) // 2
+        # Partial sort: everything left of `mid` is <= the median along `dim`
+        part = np.argpartition(pts[:, dim], mid - start)
+        self.order[start:end] = self.order[start:end][part]
+        left = self._build(start, mid)
+        right = self._build(mid, end)
+        self.children[node] = (left, right)
+        return node
+
+    def _box_distance_sq(self, node, queries):
+        # Squared distance from each query to the node's bounding box (0 inside it)
+        d = np.maximum(self.lo[node] - queries, 0) + np.maximum(queries - self.hi[node], 0)
+        return np.einsum("ij,ij->i", d, d)
+
+    def query(self, queries, k=5):
+        # The k nearest training points of every query, nearest first.
+        # Returns (distances, indices), both of shape (M, k).
+        queries = np.atleast_2d(np.asarray(queries, dtype=float))
+        k = min(k, len(self.points))
+        best_d = np.full((len(queries), k), np.inf)  # Squared distances
+        best_i = np.full((len(queries), k), -1)
+        stack = [(0, np.arange(len(queries)))]
+
+        while stack:
+            node, idx = stack.pop()
+            # Only queries whose k-th best could still improve need this node
+            idx = idx[self._box_distance_sq(node, queries[idx]) < best_d[idx, -1]]
+            if not len(idx):
+                continue
+
+            if self.children[node] is None:
+                members = self.order[self.start[node]:self.end[node]]
+                diff = queries[idx, np.newaxis, :] - self.points[members][np.newaxis, :, :]
+                cand_d = np.concatenate([best_d[idx], np.einsum("ijk,ijk->ij", diff, diff)], axis=1)
+                cand_i = np.concatenate([best_i[idx], np.broadcast_to(members, (len(idx), len(members)))], axis=1)
+                keep = np.argsort(cand_d, axis=1, kind="stable")[:, :k]
+                best_d[idx] = np.take_along_axis(cand_d, keep, axis=1)
+                best_i[idx] = np.take_along_axis(cand_i, keep, axis=1)
+                continue
+
+            # Visit the child on each query's own side of the split first, so the
+            # far side is usually pruned by the time it is popped
+            left, right = self.children[node]
+            split_dim = np.argmax(self.hi[node] - self.lo[node])
+            split = self.hi[left][split_dim]
+            goes_left = queries[idx, split_dim] <= split
+            stack.append((right, idx[goes_left]))
+            stack.append((left, idx[~goes_left]))
+            stack.append((left, idx[goes_left]))
+            stack.append((right, idx[~goes_left]))
+
+        return np.sqrt(best_d), best_i
+
+
+def majority_vote(labels, neighbor_indices, n_classes=None):
+    # Vectorized majority vote over the neighbours of every query.
+    # Ties go to the class whose neighbours are nearer: each vote also carries a
+    # tiny weight that decreases with the neighbour's rank.
+    # Returns (predicted class (M,), votes per class (M, n_classes)).
+    labels = np.asarray(labels)
+    n_classes = labels.max() + 1 if n_classes is None else n_classes
+    m, k = neighbor_indices.shape
+    votes = np.zeros((m, n_classes))
+    rows = np.repeat(np.arange(m), k)
+    np.add.at(votes, (rows, labels[neighbor_indices].ravel()), 1.0)
+    tie_break = np.zeros((m, n_classes))
+    np.add.at(tie_break, (rows, labels[neighbor_indices].ravel()), np.tile(np.arange(k, 0, -1), m) * 1e-6)
+    return np.argmax(votes + tie_break, axis=1), votes.astype(int)
+
+
+def classify_grid(tree, labels, x_range, y_range, resolution=(200, 120), k=5):
+    # Decision regions: the predicted class of every cell of a regular grid, in one batched query.
+    # Returns a (ny, nx) array of classes with row 0 at y_range[0].
+    xs = np.linspace(*x_range, resolution[0])
+    ys = np.linspace(*y_range, resolution[1])
+    X, Y = np.meshgrid(xs, ys)
+    _, neighbor_indices = tree.query(np.stack([X.ravel(), Y.ravel()], axis=1), k)
+    predicted, _ = majority_vote(labels, neighbor_indices)
+    return predicted.reshape(X.shape)
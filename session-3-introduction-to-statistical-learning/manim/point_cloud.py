@@ -0,0 +1,150 @@
+from manim import *
+import numpy as np
+
+
+def axes_to_screen(axes, x, y):
+    # Map whole arrays of (x, y) data coordinates to scene points at once.
+    # Axes are linear, so three c2p calls give the origin and the two unit steps.
+    origin = axes.c2p(0, 0)
+    x_step = axes.c2p(1, 0) - origin
+    y_step = axes.c2p(0, 1) - origin
+    return origin + np.asarray(x)[..., np.newaxis] * x_step + np.asarray(y)[..., np.newaxis] * y_step
+
+
+def colors_to_rgbas(colors, n):
+    # One color for every point, a list of n colors, or an (n, 4) RGBA array -> (n, 4) RGBA array.
+    # Only the distinct colors of a list are converted.
+    if isinstance(colors, np.ndarray) and colors.ndim == 2:
+        return colors.astype(float)
+    if isinstance(colors, (list, tuple)) and len(colors) == n and n and not isinstance(colors[0], (int, float)):
+        names = [str(ManimColor(c)) for c in colors]
+        unique = {name: ManimColor(name).to_rgba() for name in set(names)}
+        return np.array([unique[name] for name in names])
+    return np.tile(ManimColor(colors).to_rgba(), (n, 1))
+
+
+class PointCloud(PMobject):
+    # A scatter plot held as contiguous arrays: positions (N, 3), point_rgbas (N, 4)
+    # and radii (N,), instead of one Dot mobject per sample.
+    # The Cairo camera draws a PMobject by writing its points straight into the frame,
+    # a square of stroke_width pixels per point, all in one NumPy pass. Each point is
+    # drawn as four overlapping squares, a rounded plus that reads as a dot (tiny points
+    # are a single square). A PMobject has one stroke width, so the points are drawn as one
+    # submobject per distinct radius, with highlighted points last, on top.
+    # The camera writes those pixels without blending, so point opacity (and with it FadeIn
+    # and FadeOut) is not shown. Clouds of at most max_dots points are drawn as ordinary
+    # Dots instead, which fade like any other mobject.
+    # The arrays are the source of truth for colors and radii: change them through the
+    # methods below. Positions are read back from the drawn points before every change, so
+    # moving, scaling or animating the cloud is kept.
+    max_dots = 500
+
+    def __init__(self, positions, colors=WHITE, radius=0.05, **kwargs):
+        super().__init__(**kwargs)
+        positions = np.asarray(positions, dtype=float)
+        if positions.shape[-1] == 2:
+            positions = np.column_stack([positions, np.zeros(len(positions))])
+        self.positions = positions
+        self.base_rgbas = colors_to_rgbas(colors, len(positions))
+        self.base_radii = np.broadcast_to(np.asarray(radius, dtype=float), len(positions)).copy()
+        self.point_rgbas = self.base_rgbas.copy()
+        self.radii = self.base_radii.copy()
+        self.highlighted = np.zeros(len(positions), dtype=bool)
+        self.rebuild()
+
+    @classmethod
+    def from_axes(cls, axes, x, y, **kwargs):
+        # A point cloud of data coordinates, mapped to the screen in one vectorized c2p
+        return cls(axes_to_screen(axes, x, y), **kwargs)
+
+    def read_positions(self):
+        # Update self.positions from the drawn points, which move with the mobject.
+        # Every point is drawn symmetrically about its position, so the mean of its copies is it.
+        for layer in self.submobjects:
+            if isinstance(layer, Dot):
+                self.positions[layer.index] = layer.get_center()
+            else:
+                self.positions[layer.indices] = layer.points.reshape(-1, len(layer.indices), 3).mean(axis=0)
+        return self
+
+    def rebuild(self):
+        # Regroup the points into one PMobject per (highlighted, radius), or one Dot per point
+        pixels_per_unit = config.pixel_width / config.frame_width
+        order = np.concatenate([np.flatnonzero(~self.highlighted), np.flatnonzero(self.highlighted)])
+        if len(self.positions) <= self.max_dots:
+            self.submobjects = [self._dot(i) for i in order]
+            return self
+        layers = []
+        for highlighted in (False, True):
+            chosen = self.highlighted == highlighted
+            for radius in np.unique(self.radii[chosen]):
+                layers.append(self._layer(np.flatnonzero(chosen & (self.radii == radius)), radius, pixels_per_unit))
+        self.submobjects = layers
+        return self
+
+    def _dot(self, i):
+        dot = Dot(self.positions[i], radius=self.radii[i], color=ManimColor(self.point_rgbas[i, :3]))
+        dot.set_opacity(self.point_rgbas[i, 3])
+        dot.index = i
+        return dot
+
+    def _layer(self, indices, radius, pixels_per_unit):
+        diameter = 2 * radius * pixels_per_unit
+        if diameter < 6:
+            offsets = np.zeros((1, 3))
+            layer = PMobject(stroke_width=max(1, round(diameter)))
+        else:
+            # Squares of 1.2 r, nudged 0.4 r along each axis, cover a disk of radius r but its corners
+            offsets = 0.4 * radius * np.array([[1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0]])
+            layer = PMobject(stroke_width=round(0.6 * diameter))
+        layer.points = (self.positions[indices][np.newaxis] + offsets[:, np.newaxis]).reshape(-1, 3)
+        layer.rgbas = np.tile(self.point_rgbas[indices], (len(offsets), 1))
+        layer.indices = indices
+        return layer
+
+    def set_positions(self, positions):
+        positions = np.asarray(positions, dtype=float)
+        self.read_positions()
+        self.positions[:, :positions.shape[-1]] = positions
+        return self.rebuild()
+
+    def set_point_colors(self, colors, indices=slice(None)):
+        # New base colors for some or all points
+        n = len(np.arange(len(self.positions))[indices])
+        self.base_rgbas[indices] = colors_to_rgbas(colors, n)
+        self.point_rgbas[indices] = self.base_rgbas[indices]
+        return self.read_positions().rebuild()
+
+    # The inherited PMobject color methods work on the cloud's own (empty) rgbas and on its
+    # children's; here they go through the arrays instead, so they work on Dots as well
+
+    def set_color(self, color=YELLOW, family=True):
+        return self.set_point_colors(color)
+
+    def get_color(self):
+        return ManimColor(self.point_rgbas[0, :3]) if len(self.point_rgbas) else ManimColor(WHITE)
+
+    def set_opacity(self, opacity, family=True):
+        self.base_rgbas[:, 3] = opacity
+        self.point_rgbas[:, 3] = opacity
+        return self.read_positions().rebuild()
+
+    def fade(self, darkness=0.5, family=True):
+        self.base_rgbas[:, 3] *= 1 - darkness
+        self.point_rgbas[:, 3] *= 1 - darkness
+        return self.read_positions().rebuild()
+
+    def highlight(self, indices, color=YELLOW, scale=1.6):
+        # Draw some points bigger, on top of the rest and (unless color is None) in another color
+        if color is not None:
+            self.point_rgbas[indices] = ManimColor(color).to_rgba()
+        self.radii[indices] = self.base_radii[indices] * scale
+        self.highlighted[indices] = True
+        return self.read_positions().rebuild()
+
+    def unhighlight(self):
+        # Back to every point's own color and radius
+        self.point_rgbas[:] = self.base_rgbas
+        self.radii[:] = self.base_radii
+        self.highlighted[:] = False
+        return self.read_positions().rebuild()
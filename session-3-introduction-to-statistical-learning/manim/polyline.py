@@ -0,0 +1,106 @@
+import numpy as np
+
+
+# Streaming simplification of long trails, e.g. the Lorenz trajectories.
+# New samples are collected in a short window; once the window is full it is
+# simplified with Ramer-Douglas-Peucker and only the vertices it keeps are
+# committed. Every committed segment stays within `tolerance` of the samples it
+# replaces, so the drawn shape is unchanged to within that distance, while the
+# number of stored vertices grows with the shape's detail, not with time.
+# Past `max_vertices` the oldest vertices are dropped, so memory and per-frame
+# cost stay flat over arbitrarily long runs.
+
+
+def segment_distances(points, start, end):
+    # Distance of every point in (M, D) to the segment start -> end
+    direction = end - start
+    length2 = np.dot(direction, direction)
+    t = np.clip((points - start) @ direction / length2, 0, 1) if length2 > 0 else np.zeros(len(points))
+    return np.linalg.norm(points - start - t[:, np.newaxis] * direction, axis=1)
+
+
+def rdp_keep(points, tolerance):
+    # Boolean mask of the points that Ramer-Douglas-Peucker keeps in an (M, D) polyline.
+    # The end points are always kept; iterative, so long windows cannot hit the recursion limit.
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        distances = segment_distances(points[i + 1:j], points[i], points[j])
+        k = i + 1 + np.argmax(distances)
+        if distances[k - i - 1] > tolerance:
+            keep[k] = True
+            stack.extend([(i, k), (k, j)])
+    return keep
+
+
+class StreamingTrails:
+    # N trails fed with samples for all of them at once, as (k, N, D) arrays.
+    # Samples wait in a shared (window, N, D) buffer; each full window is simplified per
+    # trail, from that trail's last committed vertex. Windows are counted in samples, so
+    # the result does not depend on how the samples were split between extend calls.
+    def __init__(self, first_points, tolerance, window=60, max_vertices=5000):
+        first_points = np.asarray(first_points, dtype=float)
+        n, dim = first_points.shape
+        self.tolerance = tolerance
+        self.max_vertices = max_vertices
+
+        # Committed vertices of trail i are vertices[i, start[i]:end[i]]. The buffers hold twice
+        # the cap (and always a whole window more), so dropping old vertices is an index move
+        # and compacting is rare.
+        self.vertices = np.empty((n, max(2 * max_vertices, max_vertices + window), dim))
+        self.vertices[:, 0] = first_points
+        self.start = np.zeros(n, dtype=int)
+        self.end = np.ones(n, dtype=int)
+
+        self.pending = np.empty((window, n, dim))
+        self.pending_count = 0
+
+    def extend(self, samples):
+        # Add (k, N, D) new samples, committing every window they fill
+        samples = np.asarray(samples, dtype=float)
+        window = len(self.pending)
+        while len(samples):
+            taken = min(window - self.pending_count, len(samples))
+            self.pending[self.pending_count:self.pending_count + taken] = samples[:taken]
+            self.pending_count += taken
+            samples = samples[taken:]
+            if self.pending_count == window:
+                self.commit()
+        return self
+
+    def commit(self):
+        # Simplify the full window of every trail and keep only what RDP keeps
+        for i in range(self.vertices.shape[0]):
+            anchor = self.vertices[i, self.end[i] - 1]
+            window = np.concatenate([anchor[np.newaxis], self.pending[:, i]])
+            self.append(i, window[1:][rdp_keep(window, self.tolerance)[1:]])
+        self.pending_count = 0
+
+    def append(self, i, points):
+        # Append vertices to trail i, dropping the oldest ones past max_vertices
+        if self.end[i] + len(points) > self.vertices.shape[1]:
+            kept = self.vertices[i, self.start[i]:self.end[i]].copy()
+            self.vertices[i, :len(kept)] = kept
+            self.start[i], self.end[i] = 0, len(kept)
+        self.vertices[i, self.end[i]:self.end[i] + len(points)] = points
+        self.end[i] += len(points)
+        self.start[i] = max(self.start[i], self.end[i] - self.max_vertices)
+
+    def polylines(self, current=None):
+        # Every trail as one (M_i, D) array: its committed vertices, the samples still waiting
+        # in the window and, if given, the current (N, D) positions
+        tails = [self.pending[:self.pending_count]]
+        if current is not None:
+            tails.append(np.asarray(current, dtype=float)[np.newaxis])
+        tail = np.concatenate(tails)
+        return [
+            np.concatenate([self.vertices[i, self.start[i]:self.end[i]], tail[:, i]])
+            for i in range(self.vertices.shape[0])
+        ]
+
+    def vertex_counts(self):
+        return self.end - self.start
@@ -0,0 +1,257 @@
+import argparse
+import functools
+import importlib
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+
+# Opt-in profiler for a single scene: where does each frame's time go?
+# Usage: python profile_scene.py orbital_mechanics.py ThreeBodyProblemLoop [-q l] [--top 15] [--allocations]
+#
+# The scene is rendered in this process with every updater and every play/wait
+# call wrapped in timers. The report lists the slowest updaters, the frame time
+# percentiles split into updating and rendering (rasterizing + encoding), and
+# the mobject counts of each play. A flame-graph-compatible dump (collapsed
+# stacks, one "frame;frame;frame microseconds" line per stack) is written next
+# to the JSON report in media/profiles/, e.g. for flamegraph.pl or speedscope.
+
+HERE = Path(__file__).resolve().parent
+
+
+def updater_name(func):
+    # Readable name for an updater: qualified name and where it was defined
+    inner = getattr(func, "__func__", func)  # Bound methods
+    code = getattr(inner, "__code__", None)
+    name = getattr(inner, "__qualname__", repr(inner))
+    if "<lambda>" in name and getattr(inner, "__closure__", None):
+        # Lambdas made by helpers such as always_redraw: name the function they wrap
+        wrapped = [cell.cell_contents for cell in inner.__closure__ if callable(cell.cell_contents)]
+        if wrapped:
+            name += f" -> {updater_name(wrapped[0])}"
+    if code is not None and " (" not in name:
+        name += f" ({Path(code.co_filename).name}:{code.co_firstlineno})"
+    return name
+
+
+class SceneProfiler:
+    # Patches manim while installed; all measurements are kept in plain dicts and lists
+    def __init__(self, allocations=False):
+        self.allocations = allocations
+        self.updater_seconds = defaultdict(float)
+        self.updater_calls = defaultdict(int)
+        self.updater_bytes = defaultdict(int)
+        self.frames = []  # One {"update", "render", "play", "updaters"} record per frame
+        self.plays = []  # One record per outermost play/wait call
+        self.stack = []  # Names of the play/wait calls currently running
+        self.folded = defaultdict(float)  # Collapsed stack -> microseconds
+        self.originals = {}
+        self.wrappers = {}  # Original updater -> wrapper, so remove_updater still works
+
+    def _stack_prefix(self):
+        return ";".join([self.scene_name] + self.stack[:1])
+
+    def wrap_updater(self, func):
+        if func in self.wrappers:
+            return self.wrappers[func]
+        name = updater_name(func)
+        profiler = self
+
+        @functools.wraps(func)  # Keeps the signature, which manim inspects for a `dt` argument
+        def wrapper(*args, **kwargs):
+            before = tracemalloc.get_traced_memory()[0] if profiler.allocations else 0
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                profiler.updater_seconds[name] += seconds
+                profiler.updater_calls[name] += 1
+                if profiler.allocations:
+                    profiler.updater_bytes[name] += max(0, tracemalloc.get_traced_memory()[0] - before)
+                if profiler.frames and profiler.stack:
+                    profiler.frames[-1]["updaters"][name] += seconds
+                profiler.folded[f"{profiler._stack_prefix()};update;{name}"] += seconds * 1e6
+
+        self.wrappers[func] = wrapper
+        return wrapper
+
+    def _patch(self, owner, attribute, make_replacement):
+        original = getattr(owner, attribute)
+        self.originals[(owner, attribute)] = original
+        setattr(owner, attribute, make_replacement(original))
+
+    def install(self, scene_name):
+        from manim import Mobject, Scene
+        from manim.renderer.cairo_renderer import CairoRenderer
+
+        self.scene_name = scene_name
+        profiler = self
+        if self.allocations:
+            tracemalloc.start()
+
+        def add_updater(original):
+            def patched(mob, update_function, *args, **kwargs):
+                return original(mob, profiler.wrap_updater(update_function), *args, **kwargs)
+            return patched
+
+        def remove_updater(original):
+            def patched(mob, update_function):
+                return original(mob, profiler.wrappers.get(update_function, update_function))
+            return patched
+
+        def timed_call(kind):
+            # play and wait; wait calls play internally, so only the outermost call is recorded
+            def make(original):
+                def patched(scene, *args, **kwargs):
+                    if profiler.stack:
+                        return original(scene, *args, **kwargs)
+                    label = f"{kind} {len(profiler.plays)}"
+                    if kind == "play":
+                        label += " (" + ", ".join(type(a).__name__ for a in args) + ")"
+                    profiler.stack.append(label)
+                    first_frame = len(profiler.frames)
+                    mobjects_before = sum(len(m.get_family()) for m in scene.mobjects)
+                    start = time.perf_counter()
+                    try:
+                        return original(scene, *args, **kwargs)
+                    finally:
+                        profiler.stack.pop()
+                        profiler.plays.append({
+                            "call": label,
+                            "seconds": time.perf_counter() - start,
+                            "frames": len(profiler.frames) - first_frame,
+                            "top_level_mobjects": len(scene.mobjects),
+                            "mobjects_before": mobjects_before,
+                            "mobjects_after": sum(len(m.get_family()) for m in scene.mobjects),
+                        })
+                return patched
+            return make
+
+        def update_to_time(original):
+            def patched(scene, t):
+                profiler.frames.append({
+                    "update": 0.0, "render": 0.0, "play": len(profiler.plays), "updaters": defaultdict(float),
+                })
+                start = time.perf_counter()
+                original(scene, t)
+                profiler.frames[-1]["update"] = time.perf_counter() - start
+            return patched
+
+        def render(original):
+            def patched(renderer, *args, **kwargs):
+                start = time.perf_counter()
+                original(renderer, *args, **kwargs)
+                seconds = time.perf_counter() - start
+                if profiler.frames:
+                    profiler.frames[-1]["render"] += seconds
+                profiler.folded[f"{profiler._stack_prefix()};render"] += seconds * 1e6
+            return patched
+
+        self._patch(Mobject, "add_updater", add_updater)
+        self._patch(Mobject, "remove_updater", remove_updater)
+        self._patch(Scene, "play", timed_call("play"))
+        self._patch(Scene, "wait", timed_call("wait"))
+        self._patch(Scene, "update_to_time", update_to_time)
+        self._patch(CairoRenderer, "render", render)
+
+    def uninstall(self):
+        for (owner, attribute), original in self.originals.items():
+            setattr(owner, attribute, original)
+        self.originals.clear()
+        if self.allocations:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def report(self, top=15):
+        frame_times = np.array([f["update"] + f["render"] for f in self.frames]) if self.frames else np.zeros(1)
+        update_times = np.array([f["update"] for f in self.frames]) if self.frames else np.zeros(1)
+        render_times = np.array([f["render"] for f in self.frames]) if self.frames else np.zeros(1)
+        ranked = sorted(self.updater_seconds, key=self.updater_seconds.get, reverse=True)
+        n_frames = max(len(self.frames), 1)
+        return {
+            "scene": self.scene_name,
+            "frames": len(self.frames),
+            "frame_ms": {
+                "total": {p: 1e3 * np.percentile(frame_times, q) for p, q in (("p50", 50), ("p99", 99))},
+                "update": {p: 1e3 * np.percentile(update_times, q) for p, q in (("p50", 50), ("p99", 99))},
+                "render": {p: 1e3 * np.percentile(render_times, q) for p, q in (("p50", 50), ("p99", 99))},
+            },
+            "updaters": [
+                {
+                    "name": name,
+                    "calls": self.updater_calls[name],
+                    "total_seconds": self.updater_seconds[name],
+                    "ms_per_frame": 1e3 * self.updater_seconds[name] / n_frames,
+                    "allocated_bytes": self.updater_bytes.get(name) if self.allocations else None,
+                }
+                for name in ranked[:top]
+            ],
+            "plays": self.plays,
+            "peak_traced_bytes": getattr(self, "peak_bytes", None),
+        }
+
+    def write_folded(self, path):
+        lines = [f"{stack} {int(round(us))}" for stack, us in sorted(self.folded.items()) if us >= 1]
+        Path(path).write_text("\n".join(lines) + "\n")
+
+
+def print_report(report):
+    ms = report["frame_ms"]
+    print(f"\n{report['scene']}: {report['frames']} frames")
+    for part in ("total", "update", "render"):
+        print(f"  {part:<7} frame time  p50 {ms[part]['p50']:8.2f} ms   p99 {ms[part]['p99']:8.2f} ms")
+    if report["peak_traced_bytes"] is not None:
+        print(f"  peak traced memory {report['peak_traced_bytes'] / 1e6:.1f} MB")
+
+    print(f"\n  {'updater':<70} {'calls':>7} {'total s':>8} {'ms/frame':>9} {'alloc MB':>9}")
+    for u in report["updaters"]:
+        alloc = f"{u['allocated_bytes'] / 1e6:9.2f}" if u["allocated_bytes"] is not None else f"{'-':>9}"
+        print(f"  {u['name'][:70]:<70} {u['calls']:>7} {u['total_seconds']:>8.3f} {u['ms_per_frame']:>9.3f} {alloc}")
+
+    print(f"\n  {'play / wait':<50} {'seconds':>8} {'frames':>7} {'mobjects':>17}")
+    for p in report["plays"]:
+        counts = f"{p['mobjects_before']} -> {p['mobjects_after']}"
+        print(f"  {p['call'][:50]:<50} {p['seconds']:>8.2f} {p['frames']:>7} {counts:>17}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the updaters and frames of one scene.")
+    parser.add_argument("module", help="Module file, e.g. orbital_mechanics.py")
+    parser.add_argument("scene", help="Scene class name")
+    parser.add_argument("-q", "--quality", default="l", choices=list("lmhpk"))
+    parser.add_argument("--top", type=int, default=15, help="Number of updaters in the report")
+    parser.add_argument("--allocations", action="store_true", help="Also trace allocations (slower)")
+    args = parser.parse_args()
+
+    from manim import config, tempconfig
+    from manim.constants import QUALITIES
+
+    quality = next(name for name, q in QUALITIES.items() if q["flag"] == args.quality)
+    profiler = SceneProfiler(allocations=args.allocations)
+    # Caching is disabled so that every play really runs its updaters
+    with tempconfig({"quality": quality, "disable_caching": True, "progress_bar": "none"}):
+        module = importlib.import_module(Path(args.module).stem)
+        scene_class = getattr(module, args.scene)
+        profiler.install(args.scene)
+        try:
+            scene_class().render()
+        finally:
+            profiler.uninstall()
+        out_dir = Path(config.media_dir) / "profiles"
+
+    report = profiler.report(args.top)
+    print_report(report)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / f"{args.scene}.json").write_text(json.dumps(report, indent=2))
+    profiler.write_folded(out_dir / f"{args.scene}.folded")
+    print(f"\nReport and collapsed stacks written to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import numpy as np
+
+
+# Vectorized particle swarm optimization engine for SwarmOptimizationScene.
+# Positions, velocities and personal bests are (N, D) arrays, and objectives
+# take an (N, D) array and return the N values at once, so one iteration of a
+# swarm of thousands is a handful of NumPy operations.
+
+
+def rastrigin(x):
+    # Highly multimodal: a global minimum of 0 at the origin in a grid of local minima
+    return 10 * x.shape[-1] + np.sum(x ** 2 - 10 * np.cos(2 * np.pi * x), axis=-1)
+
+
+def rosenbrock(x):
+    # A long curved valley: global minimum of 0 at (1, 1, ..., 1)
+    return np.sum(100 * (x[..., 1:] - x[..., :-1] ** 2) ** 2 + (1 - x[..., :-1]) ** 2, axis=-1)
+
+
+def sphere(x):
+    # The easy baseline: a single bowl with its minimum at the origin
+    return np.sum(x ** 2, axis=-1)
+
+
+# Benchmark functions and the location of their global minimum (the same in every dimension)
+BENCHMARKS = {
+    "rastrigin": (rastrigin, 0.0),
+    "rosenbrock": (rosenbrock, 1.0),
+    "sphere": (sphere, 0.0),
+}
+
+
+def shifted(objective, offset):
+    # The same objective, moved by `offset` (e.g. to put the optimum somewhere on screen)
+    offset = np.asarray(offset, dtype=float)
+    return lambda x: objective(x - offset)
+
+
+def evaluate_grid(objective, x_range, y_range, resolution=(200, 200)):
+    # Objective values of a 2D function on a regular grid, for contour plots.
+    # Returns (X, Y, Z), each of shape (ny, nx), with row 0 at y_range[0].
+    xs = np.linspace(*x_range, resolution[0])
+    ys = np.linspace(*y_range, resolution[1])
+    X, Y = np.meshgrid(xs, ys)
+    Z = objective(np.stack([X, Y], axis=-1).reshape(-1, 2)).reshape(X.shape)
+    return X, Y, Z
+
+
+class ParticleSwarm:
+    # Global-best PSO. Each iteration, every particle's velocity becomes
+    #   v = inertia * v + cognitive * r1 * (pbest - x) + social * r2 * (gbest - x)
+    # with fresh uniform random r1, r2 per particle and dimension.
+    def __init__(self, objective, n_particles, bounds, inertia=0.7, cognitive=1.5, social=1.5,
+                 max_speed=None, seed=0):
+        self.objective = objective
+        self.bounds = np.asarray(bounds, dtype=float)  # (D, 2) lower and upper bounds
+        self.inertia = inertia
+        self.cognitive = cognitive
+        self.social = social
+        span = self.bounds[:, 1] - self.bounds[:, 0]
+        # By default a particle never moves more than a fifth of the search space per step
+        self.max_speed = 0.2 * span if max_speed is None else np.broadcast_to(max_speed, span.shape)
+        self.rng = np.random.default_rng(seed)
+
+        n_dims = len(self.bounds)
+        self.positions = self.rng.uniform(self.bounds[:, 0], self.bounds[:, 1], size=(n_particles, n_dims))
+        self.velocities = self.rng.uniform(-0.1, 0.1, size=(n_particles, n_dims)) * span
+        self.values = self.objective(self.positions)
+        self.pbest = self.positions.copy()
+        self.pbest_values = self.values.copy()
+        best = np.argmin(self.pbest_values)
+        self.gbest = self.pbest[best].copy()
+        self.gbest_value = self.pbest_values[best]
+
+    def step(self):
+        r1, r2 = self.rng.random((2,) + self.positions.shape)
+        self.velocities = (
+            self.inertia * self.velocities
+            + self.cognitive * r1 * (self.pbest - self.positions)
+            + self.social * r2 * (self.gbest - self.positions)
+        )
+        np.clip(self.velocities, -self.max_speed, self.max_speed, out=self.velocities)
+        self.positions += self.velocities
+        np.clip(self.positions, self.bounds[:, 0], self.bounds[:, 1], out=self.positions)
+
+        # Evaluate the whole swarm at once and update the personal and global bests
+        self.values = self.objective(self.positions)
+        improved = self.values < self.pbest_values
+        self.pbest[improved] = self.positions[improved]
+        self.pbest_values[improved] = self.values[improved]
+        best = np.argmin(self.pbest_values)
+        if self.pbest_values[best] < self.gbest_value:
+            self.gbest = self.pbest[best].copy()
+            self.gbest_value = self.pbest_values[best]
+
+    def run(self, iterations):
+        # Iterate and return one snapshot per iteration (including the start) as stacked arrays:
+        #   positions, velocities, pbest (T + 1, N, D), gbest (T + 1, D), gbest_value (T + 1,)
+        snapshots = {"positions": [], "velocities": [], "pbest": [], "gbest": [], "gbest_value": []}
+
+        def record():
+            snapshots["positions"].append(self.positions.copy())
+            snapshots["velocities"].append(self.velocities.copy())
+            snapshots["pbest"].append(self.pbest.copy())
+            snapshots["gbest"].append(self.gbest.copy())
+            snapshots["gbest_value"].append(self.gbest_value)
+
+        record()
+        for _ in range(iterations):
+            self.step()
+            record()
+        return {key: np.array(value) for key, value in snapshots.items()}
@@ -1,67 +1,99 @@
 from manim import *
-import random
+import numpy as np
+
+from forest import RandomForest, tree_depth
+from glyph_cache import cached_text
+
+
+CLASS_NAMES = ["A", "B"]
+
+
+def tree_diagram(tree, color, class_colors, split_label=None, level_gap=0.7, leaf_gap=0.5):
+    # Node-link drawing of one flat-array tree from forest.py: split nodes are circles
+    # (labelled by split_label(feature, threshold) if given), leaves are squares in the
+    # colour of the class they predict. Returns the diagram and a {node: shape} dict.
+    feature, threshold, left, right = tree["feature"], tree["threshold"], tree["left"], tree["right"]
+    positions = {}
+    next_leaf = [0]
+
+    def place(node, depth):
+        # Leaves are spaced evenly in order; a split sits above the middle of its children
+        if feature[node] < 0:
+            x = next_leaf[0] * leaf_gap
+            next_leaf[0] += 1
+        else:
+            x = (place(left[node], depth + 1) + place(right[node], depth + 1)) / 2
+        positions[node] = np.array([x, -depth * level_gap, 0])
+        return x
+
+    place(0, 0)
+    shapes, labels, edges = {}, VGroup(), VGroup()
+    for node in sorted(positions):
+        if feature[node] < 0:
+            predicted = np.argmax(tree["value"][node])
+            shapes[node] = Square(side_length=0.22, color=class_colors[predicted], fill_opacity=0.8)
+        else:
+            shapes[node] = Circle(radius=0.15, color=color, fill_opacity=0.5)
+            if split_label is not None:
+                labels.add(cached_text(split_label(feature[node], threshold[node]), font_size=14)
+                           .next_to(positions[node], LEFT, buff=0.2))
+        shapes[node].move_to(positions[node])
+    for node in positions:
+        if feature[node] >= 0:
+            for child in (left[node], right[node]):
+                edges.add(Line(shapes[node].get_bottom(), shapes[child].get_top(), stroke_width=2))
+
+    diagram = VGroup(edges, VGroup(*shapes.values()), labels)
+    return diagram, shapes
 
 
 class RandomForestScene(Scene):
+    # A forest of a few trees, each grown on a small bootstrap sample of the table below,
+    # and the row it is asked to classify. Sized to fit three sample tables on screen.
+    n_trees = 3
+    sample_size = 4
+    seed = 0
+    query = (4, "b")
+
     def construct(self):
         # 0. Title
-        title = Text("Random Forest Algorithm: Simple Visual", font_size=36).to_edge(UP)
+        title = cached_text("Random Forest Algorithm: Simple Visual", font_size=36).to_edge(UP)
         self.play(Write(title))
 
-        # 1. Original Data
-        # CORRECTED TABLE:
-        data_table = Table(
-            [["1", "a", "A"],
-             ["2", "b", "B"],
-             ["3", "a", "A"],
-             ["4", "c", "A"],
-             ["5", "b", "B"],
-             ["6", "c", "A"]],
-            col_labels=[Text("X1"), Text("X2"), Text("Y")],
-            line_config={"stroke_width": 1, "color": GRAY}
-        ).scale(0.4)
-        data_label = Text("Original Data", font_size=24).next_to(data_table, DOWN)
-        data_group = VGroup(data_table, data_label).shift(LEFT * 4)
-
-        self.play(Create(data_table), Write(data_label))
+        # 1. Original Data (X2 is categorical; the trees see it by category code)
+        categories = ["a", "b", "c"]
+        x1 = np.array([1, 2, 3, 4, 5, 6])
+        x2 = np.array(["a", "b", "a", "c", "b", "c"])
+        y = np.array(["A", "B", "A", "A", "B", "A"])
+        X = np.column_stack([x1, [categories.index(c) for c in x2]])
+        labels = np.array([CLASS_NAMES.index(c) for c in y])
+
+        forest = RandomForest(n_trees=self.n_trees, max_samples=self.sample_size, n_jobs=1, seed=self.seed).fit(X, labels)
+
+        def data_table(rows, color):
+            return Table(
+                [[str(x1[i]), x2[i], y[i]] for i in rows],
+                col_labels=[cached_text("X1"), cached_text("X2"), cached_text("Y")],
+                line_config={"stroke_width": 1, "color": color}
+            )
+
+        data_table_mob = data_table(range(len(y)), GRAY).scale(0.4)
+        data_label = cached_text("Original Data", font_size=24).next_to(data_table_mob, DOWN)
+        data_group = VGroup(data_table_mob, data_label).shift(LEFT * 4)
+
+        self.play(Create(data_table_mob), Write(data_label))
         self.wait(1)
 
         # 2. Bootstrapping (Bagging)
-        bagging_label = Text("1. Bootstrap Sampling", font_size=28).next_to(title, DOWN, buff=1.0).shift(RIGHT * 3)
+        bagging_label = cached_text("1. Bootstrap Sampling", font_size=28).next_to(title, DOWN, buff=1.0).shift(RIGHT * 3)
         self.play(Write(bagging_label))
 
-        # Create 3 sample tables
-        # CORRECTED TABLE 1:
-        sample_1 = Table(
-            [["1", "a", "A"],
-             ["3", "a", "A"],
-             ["1", "a", "A"],
-             ["6", "c", "A"]],
-            col_labels=[Text("X1"), Text("X2"), Text("Y")],
-            line_config={"stroke_width": 1, "color": BLUE}
-        ).scale(0.3)
-
-        # CORRECTED TABLE 2:
-        sample_2 = Table(
-            [["5", "b", "B"],
-             ["2", "b", "B"],
-             ["4", "c", "A"],
-             ["5", "b", "B"]],
-            col_labels=[Text("X1"), Text("X2"), Text("Y")],
-            line_config={"stroke_width": 1, "color": GREEN}
-        ).scale(0.3)
-
-        # CORRECTED TABLE 3:
-        sample_3 = Table(
-            [["4", "c", "A"],
-             ["1", "a", "A"],
-             ["3", "a", "A"],
-             ["2", "b", "B"]],
-            col_labels=[Text("X1"), Text("X2"), Text("Y")],
-            line_config={"stroke_width": 1, "color": ORANGE}
-        ).scale(0.3)
-
-        samples = VGroup(sample_1, sample_2, sample_3).arrange(DOWN, buff=0.5).next_to(bagging_label, DOWN, buff=0.5)
+        # One table per tree, holding exactly the rows its bootstrap sample drew (repeats included)
+        colors = [BLUE, GREEN, ORANGE]
+        tree_colors = [colors[t % len(colors)] for t in range(self.n_trees)]
+        samples = VGroup(*[
+            data_table(rows, color).scale(0.3) for rows, color in zip(forest.samples, tree_colors)
+        ]).arrange(DOWN, buff=0.5).next_to(bagging_label, DOWN, buff=0.5)
 
         # Animate arrows from data to samples
         arrows = VGroup()
@@ -73,90 +105,108 @@ class RandomForestScene(Scene):
         self.wait(1)
 
         # 3. Build Trees
-        tree_label = Text("2. Build Decision Trees", font_size=28).next_to(samples, RIGHT, buff=1.5).align_to(
+        tree_label = cached_text("2. Build Decision Trees", font_size=28).next_to(samples, RIGHT, buff=1.5).align_to(
             bagging_label, UP)
         self.play(Write(tree_label))
 
-        # Create 3 simple tree diagrams
-        tree_1 = self.create_simple_tree(BLUE)
-        tree_2 = self.create_simple_tree(GREEN)
-        tree_3 = self.create_simple_tree(ORANGE)
+        def split_label(feature, threshold):
+            if feature == 0:
+                return f"X1 ≤ {threshold:g}"
+            return "X2 ∈ {" + ",".join(categories[:int(threshold) + 1]) + "}"
 
-        trees = VGroup(tree_1, tree_2, tree_3).arrange(DOWN, buff=1.2).next_to(tree_label, DOWN, buff=0.7)
+        # The trees the engine actually grew on each sample
+        class_colors = [RED_A, BLUE_A]
+        drawn = [tree_diagram(tree, color, class_colors, split_label)
+                 for tree, color in zip(forest.trees, tree_colors)]
+        trees = VGroup(*[diagram.scale(0.8) for diagram, _ in drawn]).arrange(DOWN, buff=1.2).next_to(
+            tree_label, DOWN, buff=0.7)
 
         # Animate arrows from samples to trees
         tree_arrows = VGroup()
-        for i in range(3):
+        for i in range(self.n_trees):
             arrow = Arrow(samples[i].get_right(), trees[i].get_left(), buff=0.1, stroke_width=3)
             tree_arrows.add(arrow)
 
         self.play(Create(tree_arrows), Create(trees))
         self.wait(1)
 
-        # 4. Get Predictions
-        pred_1 = Text("Pred: 'A'", color=RED_A, font_size=24).next_to(tree_1, RIGHT, buff=0.5)
-        pred_2 = Text("Pred: 'B'", color=BLUE_A, font_size=24).next_to(tree_2, RIGHT, buff=0.5)
-        pred_3 = Text("Pred: 'A'", color=RED_A, font_size=24).next_to(tree_3, RIGHT, buff=0.5)
-        predictions = VGroup(pred_1, pred_2, pred_3)
+        # 4. Get Predictions: the query row goes down every tree to one leaf
+        query_x = [[self.query[0], categories.index(self.query[1])]]
+        query_label = cached_text(f"Query: X1 = {self.query[0]}, X2 = {self.query[1]}", font_size=24).next_to(
+            data_group, DOWN, buff=0.5)
+        self.play(Write(query_label))
+
+        leaves = forest.apply(query_x)[:, 0] - forest.roots  # Node index within each tree
+        tree_votes = forest.tree_predictions(query_x)[:, 0]
+        self.play(*[Indicate(shapes[leaf], color=YELLOW) for (_, shapes), leaf in zip(drawn, leaves)])
+
+        predictions = VGroup(*[
+            cached_text(f"Pred: '{CLASS_NAMES[vote]}'", color=class_colors[vote], font_size=24).next_to(tree, RIGHT, buff=0.5)
+            for tree, vote in zip(trees, tree_votes)
+        ])
 
         self.play(Write(predictions))
         self.wait(1)
 
         # 5. Voting
-        vote_label = Text("3. Majority Vote", font_size=28).next_to(data_group, DOWN, buff=2.0).align_to(data_group,
-                                                                                                         LEFT)
+        vote_label = cached_text("3. Majority Vote", font_size=28).next_to(query_label, DOWN, buff=1.0).align_to(data_group,
+                                                                                                                 LEFT)
         final_box = Rectangle(width=4, height=2, color=YELLOW).next_to(vote_label, DOWN, buff=0.5)
-        final_label = Text("Final Prediction", font_size=24).next_to(final_box, DOWN)
+        final_label = cached_text("Final Prediction", font_size=24).next_to(final_box, DOWN)
 
         self.play(Write(vote_label), Create(final_box), Write(final_label))
 
-        # Animate predictions moving to the vote box
-        self.play(
-            pred_1.animate.move_to(final_box.get_center() + UP * 0.5 + LEFT * 1),
-            pred_2.animate.move_to(final_box.get_center()),
-            pred_3.animate.move_to(final_box.get_center() + UP * 0.5 + RIGHT * 1)
-        )
+        # Animate predictions moving to the vote box, spread along its top
+        slots = np.linspace(-1.2, 1.2, self.n_trees) if self.n_trees > 1 else [0.0]
+        self.play(*[
+            pred.animate.move_to(final_box.get_center() + UP * 0.5 + RIGHT * x)
+            for pred, x in zip(predictions, slots)
+        ])
         self.wait(1)
 
-        # Show final result
-        final_result = Text("'A'", color=RED_A, font_size=36).move_to(final_box.get_center()).shift(DOWN * 0.4)
-
-        # Highlight the "A" votes and fade the "B" vote
+        # Show final result with the real vote counts
+        votes = forest.predict_votes(query_x)[0]
+        winner = np.argmax(votes)
+        tally = cached_text(", ".join(f"{name}: {count}" for name, count in zip(CLASS_NAMES, votes)),
+                            font_size=20).move_to(final_box.get_center())
+        final_result = cached_text(f"'{CLASS_NAMES[winner]}'", color=class_colors[winner], font_size=36).move_to(
+            final_box.get_center()).shift(DOWN * 0.6)
+
+        # Highlight the winning votes and fade the others
+        majority = VGroup(*[pred for pred, vote in zip(predictions, tree_votes) if vote == winner])
+        minority = [pred for pred, vote in zip(predictions, tree_votes) if vote != winner]
         self.play(
-            FadeOut(pred_2),
-            pred_1.animate.move_to(final_box.get_center() + DOWN * 0.4 + LEFT * 0.5),
-            pred_3.animate.move_to(final_box.get_center() + DOWN * 0.4 + RIGHT * 0.5),
+            *[FadeOut(pred) for pred in minority],
+            majority.animate.arrange(RIGHT, buff=0.3).move_to(final_box.get_center() + DOWN * 0.6),
+            Write(tally),
         )
-        # Transform the A's into the final result
-        self.play(Transform(VGroup(pred_1, pred_3), final_result))
+        # Transform the winning votes into the final result
+        self.play(Transform(majority, final_result))
         self.wait(3)
 
-    # Helper function to create a simple tree mobject
-    def create_simple_tree(self, color):
-        root = Circle(radius=0.2, color=color, fill_opacity=0.5)
-        l1_node1 = Circle(radius=0.15, color=color, fill_opacity=0.5)
-        l1_node2 = Circle(radius=0.15, color=color, fill_opacity=0.5)
-
-        nodes = VGroup(l1_node1, l1_node2).arrange(RIGHT, buff=0.5).next_to(root, DOWN, buff=0.5)
-
-        line1 = Line(root.get_bottom(), l1_node1.get_top())
-        line2 = Line(root.get_bottom(), l1_node2.get_top())
-
-        # Leaves
-        leaf1 = Square(side_length=0.2, color=GRAY).next_to(l1_node1, DOWN, buff=0.3)
-        leaf2 = Square(side_length=0.2, color=GRAY).next_to(l1_node1, DOWN, buff=0.3).shift(RIGHT * 0.3)
-        leaf3 = Square(side_length=0.2, color=GRAY).next_to(l1_node2, DOWN, buff=0.3)
-
-        line3 = Line(l1_node1.get_bottom(), leaf1.get_top())
-        line4 = Line(l1_node1.get_bottom(), leaf2.get_top())
-        line5 = Line(l1_node2.get_bottom(), leaf3.get_top())
-
-        tree = VGroup(root, nodes, line1, line2, leaf1, leaf2, leaf3, line3, line4, line5)
-        return tree.scale(0.8)
-
 
 class RandomForestAnalogy(Scene):
+    # A real forest of many trees on a larger data set; a 3x3 grid of them is shown,
+    # but the final answer counts the votes of the whole forest
+    n_trees = 101
+    n_rows = 2000
+    max_depth = 6
+    seed = 0
+
     def construct(self):
+        # Two classes that depend on an interaction of the features, plus label noise
+        rng = np.random.default_rng(self.seed)
+        X = rng.normal(size=(self.n_rows, 4))
+        y = (X[:, 0] + X[:, 1] * X[:, 2] + 0.5 * rng.normal(size=self.n_rows) > 0).astype(int)
+        # Grown in-process: render_all.py already runs one scene per core
+        model = RandomForest(n_trees=self.n_trees, max_depth=self.max_depth, n_jobs=1, seed=self.seed).fit(X, y)
+
+        # The query is a point the trees disagree on (about two thirds to one third),
+        # so the vote has something to decide
+        candidates = rng.normal(size=(200, 4))
+        share = model.predict_votes(candidates)[:, 0] / self.n_trees
+        query_x = candidates[np.argmin(np.abs(share - 0.65))][np.newaxis]
+
         # --------------------------------------------------
         # Phase 1: Training ("Growing the Forest")
         # --------------------------------------------------
@@ -166,12 +216,15 @@ class RandomForestAnalogy(Scene):
         # subtitle = Text("The 'Forest' is grown from data", font_size=24).next_to(title, DOWN, buff=0.1)
         # self.play(Write(title), Write(subtitle))
         self.camera.background_color = "#1e1e1e"
-        # Create a grid of 9 "trees"
+        # A grid of the first 9 trees: deeper trees are drawn in a lighter green,
+        # and the canopy grows with the number of leaves
+        shown = model.trees[:9]
+        depths = np.array([tree_depth(tree) for tree in shown])
+        n_leaves = np.array([np.count_nonzero(tree["feature"] < 0) for tree in shown])
+        shades = color_gradient([GREEN_E, GREEN_C], self.max_depth + 1)
         forest = VGroup()
-        for i in range(9):
-            # Use a slightly different green for variety
-            color = random.choice([GREEN_C, GREEN_D, GREEN_E])
-            tree = self.create_simple_tree(color)
+        for depth, leaves in zip(depths, n_leaves):
+            tree = self.create_simple_tree(shades[depth], canopy_scale=0.35 + 0.2 * leaves / n_leaves.max())
             forest.add(tree)
 
         # Arrange the trees in a 3x3 grid
@@ -224,17 +277,14 @@ class RandomForestAnalogy(Scene):
         )
         self.play(FadeOut(query_arrows))  # Clean up arrows
 
-        # Each tree "votes"
-        # We'll pre-define the votes (e.g., 6 vote 'A', 3 vote 'B')
-        votes_list = ["A", "A", "B", "A", "B", "A", "A", "B", "A"]
-        vote_colors = {"A": RED_E, "B": BLUE_E}
+        # Each tree "votes" with the class of the leaf the query reaches
+        tree_votes = model.tree_predictions(query_x)[:, 0]
+        vote_colors = [RED_E, BLUE_E]
 
         vote_mobjects = VGroup()
-        for i, tree in enumerate(forest):
-            vote_text = votes_list[i]
-            vote_color = vote_colors[vote_text]
-            vote = Text(vote_text, color=vote_color, font_size=32).next_to(tree, DOWN, buff=0.2)
-            vote_mobjects.add(vote)
+        for tree, vote in zip(forest, tree_votes):
+            vote_mobjects.add(
+                cached_text(CLASS_NAMES[vote], color=vote_colors[vote], font_size=32).next_to(tree, DOWN, buff=0.2))
 
         self.play(Write(vote_mobjects))
         self.wait(1)
@@ -248,42 +298,44 @@ class RandomForestAnalogy(Scene):
 
         # Create a "Final Answer" box
         final_box = Rectangle(width=3, height=1.5, color=YELLOW).to_edge(DOWN, buff=1.5)
-        final_label = Text("Final Answer", font_size=24).next_to(final_box, UP)
+        final_label = cached_text("Final Answer", font_size=24).next_to(final_box, UP)
 
         self.play(Create(final_box), Write(final_label))
         self.wait(0.5)
 
-        # Animate votes moving to the box
-        # We'll separate them by vote type
-        group_A = VGroup()
-        group_B = VGroup()
+        # The nine votes on screen are only part of it: the whole forest is counted
+        votes = model.predict_votes(query_x)[0]
+        winner = np.argmax(votes)
+        tally = cached_text(
+            f"All {self.n_trees} trees: " + ", ".join(f"{name} {count}" for name, count in zip(CLASS_NAMES, votes)),
+            font_size=24).next_to(final_box, DOWN)
+        self.play(Write(tally))
 
-        for vote in vote_mobjects:
-            if vote.text == "A":
-                group_A.add(vote)
-            else:
-                group_B.add(vote)
+        # Separate the shown votes by class
+        majority = VGroup(*[vote for vote, v in zip(vote_mobjects, tree_votes) if v == winner])
+        minority = VGroup(*[vote for vote, v in zip(vote_mobjects, tree_votes) if v != winner])
 
         # Fade out the minority vote and move the majority vote
-        final_result = Text("A", color=RED_E, font_size=48).move_to(final_box.get_center())
+        final_result = cached_text(CLASS_NAMES[winner], color=vote_colors[winner], font_size=48).move_to(
+            final_box.get_center())
 
         self.play(
-            FadeOut(group_B, shift=DOWN * 0.5),
-            group_A.animate.move_to(final_box.get_center())
+            FadeOut(minority, shift=DOWN * 0.5),
+            majority.animate.move_to(final_box.get_center())
         )
 
         # Transform the majority votes into the single final answer
         self.play(
-            Transform(group_A, final_result),
+            Transform(majority, final_result),
             FadeOut(forest)  # Fade out the forest to focus on the result
         )
 
         self.wait(3)
 
     # Helper function to create a simple graphical "tree"
-    def create_simple_tree(self, color):
+    def create_simple_tree(self, color, canopy_scale=0.5):
         # A green triangle for the leaves
-        canopy = Triangle(fill_opacity=1, color=color, stroke_width=0).scale(0.5)
+        canopy = Triangle(fill_opacity=1, color=color, stroke_width=0).scale(canopy_scale)
         canopy.set_sheen(0.1, DR)
 
         # A brown rectangle for the trunk
@@ -291,4 +343,4 @@ class RandomForestAnalogy(Scene):
         trunk.next_to(canopy, DOWN, buff=0)
 
         tree = VGroup(canopy, trunk)
-        return tree
\ No newline at end of file
+        return tree
@@ -0,0 +1,70 @@
+import numpy as np
+
+
+# Simple linear regression engine for LinearRegressionScene.
+# y ~ slope * x + intercept is fitted in closed form and by mini-batch gradient
+# descent. The mean squared error only depends on the data through five means
+# (x, y, x^2, xy, y^2), so once those are taken the full-data loss of any
+# number of (slope, intercept) pairs costs nothing more per data point; that
+# keeps both the loss surface and the loss along a descent path cheap for
+# millions of points.
+
+
+def make_data(n, slope=0.85, intercept=1.0, noise=0.6, x_range=(1, 8), seed=0):
+    # n points scattered around a known line, with x uniform over x_range
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(*x_range, size=n)
+    y = slope * x + intercept + rng.normal(scale=noise, size=n)
+    return x, y
+
+
+def moments(x, y):
+    # The means the squared error is made of: E[x], E[y], E[x^2], E[xy], E[y^2]
+    return np.array([x.mean(), y.mean(), np.dot(x, x) / len(x), np.dot(x, y) / len(x), np.dot(y, y) / len(x)])
+
+
+def least_squares(x, y):
+    # The exact best fit: slope = cov(x, y) / var(x), and the line passes through the means
+    mx, my, mxx, mxy, _ = moments(x, y)
+    slope = (mxy - mx * my) / (mxx - mx ** 2)
+    return slope, my - slope * mx
+
+
+def mse(m, slope, intercept):
+    # Mean squared error of the line(s) from the data moments; slope and intercept may be arrays
+    mx, my, mxx, mxy, myy = m
+    return (myy - 2 * slope * mxy - 2 * intercept * my + slope ** 2 * mxx
+            + 2 * slope * intercept * mx + intercept ** 2)
+
+
+def loss_surface(x, y, slope_range, intercept_range, resolution=(200, 200)):
+    # MSE over a regular (slope, intercept) grid, in one vectorized evaluation.
+    # Returns (S, B, L), each of shape (n_intercepts, n_slopes), with row 0 at intercept_range[0].
+    slopes = np.linspace(*slope_range, resolution[0])
+    intercepts = np.linspace(*intercept_range, resolution[1])
+    S, B = np.meshgrid(slopes, intercepts)
+    return S, B, mse(moments(x, y), S, B)
+
+
+def gradient_descent(x, y, steps=100, learning_rate=0.02, batch_size=32, start=(0.0, 0.0), decay=0.0, seed=0):
+    # Mini-batch gradient descent on the MSE, each step on batch_size distinct points drawn
+    # at random (all batches are drawn up front, so a step never touches more than its own
+    # batch). batch_size=None, or one no smaller than the data, uses every point at every step. Step k uses learning_rate / (1 + decay * k),
+    # so with decay > 0 the batch noise dies down and the path settles. Returns a dict of
+    #   params  (steps + 1, 2)  (slope, intercept) before each step and after the last
+    #   loss    (steps + 1,)    the full-data MSE at those parameters
+    rng = np.random.default_rng(seed)
+    params = np.empty((steps + 1, 2))
+    params[0] = start
+    batches = None
+    if batch_size is not None and batch_size < len(x):
+        batches = np.array([rng.choice(len(x), batch_size, replace=False) for _ in range(steps)])
+
+    for step in range(steps):
+        xb, yb = (x, y) if batches is None else (x[batches[step]], y[batches[step]])
+        slope, intercept = params[step]
+        residual = yb - (slope * xb + intercept)
+        gradient = -2 * np.array([np.dot(xb, residual), residual.sum()]) / len(xb)
+        params[step + 1] = params[step] - learning_rate / (1 + decay * step) * gradient
+
+    return {"params": params, "loss": mse(moments(x, y), params[:, 0], params[:, 1])}
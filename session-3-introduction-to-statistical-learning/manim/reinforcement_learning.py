@@ -1,10 +1,25 @@
 from manim import *
+import numpy as np
+
+from glyph_cache import CachedDecimal, cached_text
+from gridworld import GridWorld, greedy_path, q_learning, value_iteration
 
 
 class ReinforcementLearningScene(Scene):
+    # A one-row corridor with a hazard in the middle. The agent can step right, step left,
+    # or jump two cells to the right, and learns from a few hundred episodes to jump the hazard.
+    n_episodes = 200
+    batch_size = 20
+    seed = 0
+
     def construct(self):
+        # The environment and everything the agent learns in it, computed up front
+        env = GridWorld(1, 5, start=(0, 0), goal=(0, 4), hazards=[(0, 2)], actions=[[0, 1], [0, -1], [0, 2]])
+        action_names = ["→", "←", "jump"]
+        history = q_learning(env, self.n_episodes, self.batch_size, seed=self.seed)
+
         # 0. Title and Environment Setup
-        title = Text("Reinforcement Learning", font_size=36).to_edge(UP)
+        title = cached_text("Reinforcement Learning", font_size=36).to_edge(UP)
         self.play(Write(title))
 
         # Create the "environment": a simple grid path
@@ -16,34 +31,55 @@ class ReinforcementLearningScene(Scene):
         hazard_pos = grid[2].get_center()
         goal_pos = grid[4].get_center()
 
-        hazard = Text("X", color=RED, font_size=48).move_to(hazard_pos)
+        hazard = cached_text("X", color=RED, font_size=48).move_to(hazard_pos)
         goal = Star(color=GREEN, fill_opacity=1).scale(0.4).move_to(goal_pos)
 
         env_labels = VGroup(
-            Text("Start", font_size=20).next_to(grid[0], DOWN),
-            Text("Hazard!", font_size=20).next_to(grid[2], DOWN),
-            Text("Goal!", font_size=20).next_to(grid[4], DOWN)
+            cached_text("Start", font_size=20).next_to(grid[0], DOWN),
+            cached_text("Hazard!", font_size=20).next_to(grid[2], DOWN),
+            cached_text("Goal!", font_size=20).next_to(grid[4], DOWN)
         )
 
         self.play(Create(grid), Write(hazard), Write(goal), Write(env_labels))
         self.wait(1)
 
+        def replay(agent, path, run_time):
+            # Steps slide, jumps arc over the cell in between, bumps into the wall wiggle
+            for a, b in zip(path[:-1], path[1:]):
+                if a == b:
+                    self.play(Wiggle(agent), run_time=run_time)
+                elif abs(b - a) == 2:
+                    arc = ArcBetweenPoints(grid[a].get_center(), grid[b].get_center(), angle=-PI / 1.5)
+                    self.play(MoveAlongPath(agent, arc), run_time=run_time)
+                else:
+                    self.play(agent.animate.move_to(grid[b].get_center()), run_time=run_time)
+
+        def outcome(path):
+            # The reward at the end of an episode
+            if path[-1] == env.goal:
+                return cached_text(f"+{env.goal_reward:g}", color=GREEN, font_size=36)
+            if env.terminal[path[-1]]:
+                return cached_text(f"{env.hazard_reward:g}", color=RED, font_size=36)
+            return cached_text("Out of steps", color=RED, font_size=28)
+
         # --------------------------------------------------
-        # Phase 1: Exploration (Trial 1 - Failure)
+        # Phase 1: Exploration (Trial 1)
         # --------------------------------------------------
-        subtitle = Text("Trial 1: Exploration", font_size=28).next_to(title, DOWN, buff=0.5)
+        subtitle = cached_text("Trial 1: Exploration", font_size=28).next_to(title, DOWN, buff=0.5)
         self.play(Write(subtitle))
 
         # Create the "Agent"
         agent = Circle(radius=0.25, color=BLUE, fill_opacity=1).move_to(start_pos)
-        agent_label = Text("Agent", font_size=20).next_to(agent, UP)
+        agent_label = cached_text("Agent", font_size=20).next_to(agent, UP)
         self.play(FadeIn(agent), Write(agent_label))
+        self.play(FadeOut(agent_label))
 
-        # Agent moves into the hazard
-        self.play(agent.animate.move_to(hazard_pos), FadeOut(agent_label))
+        # The first episode the agent actually played, with purely random moves
+        first_episode = history["paths"][0]
+        replay(agent, first_episode, run_time=0.5)
 
-        # Receives negative reward
-        reward = Text("-10", color=RED, font_size=36).next_to(agent, UP)
+        # Receives its reward
+        reward = outcome(first_episode).next_to(agent, UP)
         self.play(Write(reward))
         self.wait(1)
 
@@ -53,39 +89,36 @@ class ReinforcementLearningScene(Scene):
         # --------------------------------------------------
         # Phase 2: Learning (Policy is Updated)
         # --------------------------------------------------
-        new_subtitle = Text("Policy is Updated...", font_size=28).move_to(subtitle)
-
-        # Show a "brain" or "policy table" update
-        policy_table = Table(
-            [["S0", "→ +1"],
-             ["S1", "→ -10"],  # State 1 has a bad action
-             ["S2", "→ +20"],
-             ["S3", "→ +5"]],
-            row_labels=[Text("S0"), Text("S1"), Text("S2"), Text("S3")],
-            col_labels=[Text("State"), Text("Value")]
-        ).scale(0.3).to_edge(RIGHT, buff=1.0)
-
-        self.play(Transform(subtitle, new_subtitle), FadeIn(policy_table))
-
-        # "Update" the bad value
-        new_row = Table([["S1", "→ -50"]]).scale(0.3).move_to(policy_table.get_rows()[2])
-        self.play(Transform(policy_table.get_rows()[2], new_row), run_time=1.5)
+        new_subtitle = cached_text("Policy is Updated...", font_size=28).move_to(subtitle)
+
+        # The "policy table": best action and its learned value in every non-terminal state
+        def policy_table(Q):
+            states = np.flatnonzero(~env.terminal)
+            best = Q[states].argmax(axis=1)
+            return Table(
+                [[f"S{s}", f"{action_names[a]} {Q[s, a]:+.2f}"] for s, a in zip(states, best)],
+                col_labels=[cached_text("State"), cached_text("Value")]
+            ).scale(0.3).to_edge(RIGHT, buff=1.0)
+
+        table = policy_table(history["q"][1])  # After the first batch of episodes
+        self.play(Transform(subtitle, new_subtitle), FadeIn(table))
+
+        # ...and after all of them
+        self.play(Transform(table, policy_table(history["q"][-1])), run_time=1.5)
         self.wait(1)
 
         # --------------------------------------------------
-        # Phase 3: Exploitation (Trial 2 - Success)
+        # Phase 3: Exploitation (Trial 2)
         # --------------------------------------------------
-        new_subtitle = Text("Trial 2: Exploitation (Optimal Path)", font_size=28).move_to(subtitle)
-        self.play(Transform(subtitle, new_subtitle), FadeOut(policy_table))
+        new_subtitle = cached_text("Trial 2: Exploitation (Optimal Path)", font_size=28).move_to(subtitle)
+        self.play(Transform(subtitle, new_subtitle), FadeOut(table))
 
-        # Agent now knows to avoid the hazard. We'll add a "jump" to show a new policy.
-        # It takes an "Up" and "Over" path
-        path = ArcBetweenPoints(start_pos + UP * 0.5, goal_pos + UP * 0.5, angle=-PI / 1.5)
+        # The agent now follows its best action in every cell: it learned to jump the hazard
+        best_path = greedy_path(env, history["q"][-1])
+        replay(agent, best_path, run_time=0.7)
 
-        self.play(MoveAlongPath(agent, path), run_time=2.0)
-
-        # Receives positive reward
-        reward = Text("+20", color=GREEN, font_size=36).next_to(agent, UP)
+        # Receives its reward
+        reward = outcome(best_path).next_to(agent, UP)
         self.play(Write(reward))
 
         self.play(Indicate(agent, color=GREEN), Indicate(goal, color=GREEN))
@@ -96,41 +129,62 @@ from manim import *
 
 
 class RLGridWorldScene(Scene):
+    # The gridworld and its training run. Everything below is laid out from these,
+    # so larger grids (e.g. 50x50 with thousands of episodes) need no other change,
+    # as long as the hazards leave some route from the start to the goal.
+    n_rows = 4
+    n_cols = 4
+    start = (3, 0)
+    goal = (0, 3)
+    hazards = [(1, 1), (1, 2), (2, 2)]
+    n_episodes = 2000
+    batch_size = 100
+    seed = 0
+
     def construct(self):
+        # The environment, the exact solution and a Q-learning run, computed up front
+        env = GridWorld(self.n_rows, self.n_cols, self.start, self.goal, self.hazards)
+        optimal_values, optimal_q, _ = value_iteration(env)
+        history = q_learning(env, self.n_episodes, self.batch_size, seed=self.seed)
+        n_batches = len(history["q"]) - 1
+
         # 0. Title
-        title = Text("Reinforcement Learning", font_size=36).to_edge(UP)
+        title = cached_text("Reinforcement Learning", font_size=36).to_edge(UP)
         self.play(Write(title), run_time=0.33)
 
         # --------------------------------------------------
         # Phase 1: Setup the Environment
         # --------------------------------------------------
-        subtitle = Text("The Environment", font_size=28).next_to(title, DOWN, buff=0.5)
+        subtitle = cached_text("The Environment", font_size=28).next_to(title, DOWN, buff=0.5)
         self.play(Write(subtitle), run_time=0.33)
 
-        # Create a 4x4 grid
+        # The grid always fills the same square on screen
+        side = 4.32 / max(self.n_rows, self.n_cols)
+        size = side / 1.08  # Marker size relative to a 4x4 grid
         grid = VGroup(*[
-            VGroup(*[Square(side_length=1.2) for _ in range(4)])
+            VGroup(*[Square(side_length=side, stroke_width=min(4, 16 * size)) for _ in range(self.n_cols)])
                       .arrange(RIGHT, buff=0)
-            for _ in range(4)
+            for _ in range(self.n_rows)
         ]).arrange(DOWN, buff=0)
-
-        # --- THIS IS THE CORRECTED LINE ---
-        grid.scale(0.9).move_to(DOWN * 0.5)
-        # --- END OF CORRECTION ---
+        grid.move_to(DOWN * 0.5)
 
         self.play(Create(grid), run_time=0.33)
 
         # Define key locations (cells)
-        # Manim's indexing: grid[row][col]
-        start_cell = grid[3][0]
-        goal_cell = grid[0][3]
-        hazard_cells = [grid[1][1], grid[1][2], grid[2][2]]
+        # Manim's indexing: grid[row][col], the same as the environment's
+        def center(state):
+            row, col = env.cell(state)
+            return grid[row][col].get_center()
+
+        start_cell = grid[self.start[0]][self.start[1]]
+        goal_cell = grid[self.goal[0]][self.goal[1]]
+        hazard_cells = [grid[row][col] for row, col in self.hazards]
 
         # Add Start, Goal, and Hazard markers
-        start = Text("S", font_size=24, color=WHITE).move_to(start_cell.get_center())
-        goal = Star(color=GREEN, fill_opacity=1).scale(0.4).move_to(goal_cell.get_center())
+        start = cached_text("S", font_size=24, color=WHITE).scale(size).move_to(start_cell.get_center())
+        goal = Star(color=GREEN, fill_opacity=1).scale(0.4 * size).move_to(goal_cell.get_center())
         hazards = VGroup(*[
-            Text("X", font_size=36, color=RED).move_to(cell.get_center())
+            cached_text("X", font_size=36, color=RED).scale(size).move_to(cell.get_center())
             for cell in hazard_cells
         ])
 
@@ -138,28 +192,36 @@ class RLGridWorldScene(Scene):
         self.wait(0.33)
 
         # Create the Agent
-        agent = Circle(radius=0.25, color=BLUE, fill_opacity=1).move_to(start_cell.get_center())
+        agent = Circle(radius=0.25 * size, color=BLUE, fill_opacity=1).move_to(start_cell.get_center())
         self.play(FadeIn(agent), run_time=0.33)
         self.wait(0.33)
 
+        def trace(path):
+            # The path through cell centres, with bumps into the wall (repeated cells) dropped
+            keep = np.concatenate([[True], path[1:] != path[:-1]])
+            return VMobject().set_points_as_corners([center(s) for s in path[keep]])
+
+        def outcome(path):
+            # The reward that ended the episode
+            if path[-1] == env.goal:
+                return cached_text(f"+{env.goal_reward:g}", color=GREEN, font_size=36)
+            if env.terminal[path[-1]]:
+                return cached_text(f"{env.hazard_reward:g}", color=RED, font_size=36)
+            return cached_text("Out of steps", color=RED, font_size=28)
+
         # --------------------------------------------------
-        # Phase 2: Trial 1 (Exploration & Failure)
+        # Phase 2: Trial 1 (Exploration)
         # --------------------------------------------------
-        new_subtitle = Text("Trial 1: Exploration (Random Moves)", font_size=28).move_to(subtitle)
+        new_subtitle = cached_text("Trial 1: Exploration (Random Moves)", font_size=28).move_to(subtitle)
         self.play(Transform(subtitle, new_subtitle), run_time=0.33)
 
-        # Path: (3,0) -> (2,0) -> (2,1) -> (2,2) [HIT HAZARD]
-        path_1 = [
-            grid[2][0].get_center(),
-            grid[2][1].get_center(),
-            grid[2][2].get_center()  # Hazard
-        ]
-
-        for pos in path_1:
-            self.play(agent.animate.move_to(pos), run_time=0.13)
+        # The first episode of training: every move is random
+        first_episode = history["paths"][0]
+        self.play(MoveAlongPath(agent, trace(first_episode)), rate_func=linear,
+                  run_time=min(0.13 * len(first_episode), 3))
 
-            # Show negative reward
-        reward = Text("-10", color=RED, font_size=36).next_to(agent, UP)
+        # Show its reward
+        reward = outcome(first_episode).next_to(agent, UP)
         self.play(Write(reward), run_time=0.33)
         self.wait(0.33)
 
@@ -168,48 +230,80 @@ class RLGridWorldScene(Scene):
         self.wait(0.33)
 
         # --------------------------------------------------
-        # Phase 3: "Learning"
+        # Phase 3: Learning
         # --------------------------------------------------
-        new_subtitle = Text("...Policy Table is Updated...", font_size=28).move_to(subtitle)
-
-        # Flash the bad path to show it's "learned"
-        bad_path_group = VGroup(*[grid[2][0], grid[2][1], grid[2][2]])
-        self.play(Transform(subtitle, new_subtitle),
-                  Flash(bad_path_group, color=RED, line_length=0.2), run_time=0.33)
+        new_subtitle = cached_text("...Q-Values are Learned...", font_size=28).move_to(subtitle)
+
+        # The value of each cell (its best Q-value) as a heatmap under the grid, coloured on
+        # the scale of the exact values from value iteration; terminal cells stay clear
+        palette = np.array([[*color.to_rgb(), 0.6] for color in color_gradient([RED_E, GREY_E, GREEN_D], 64)]) * 255
+        low, high = optimal_values[~env.terminal].min(), env.goal_reward
+
+        def value_pixels(Q):
+            levels = np.clip((Q.max(axis=1) - low) / (high - low) * 63, 0, 63).astype(int)
+            pixels = palette[levels]
+            pixels[env.terminal, 3] = 0
+            return pixels.reshape(self.n_rows, self.n_cols, 4)  # Row 0 is the top, as in the grid
+
+        heatmap = ImageMobject(value_pixels(history["q"][0]).astype(np.uint8))
+        heatmap.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        heatmap.stretch_to_fit_width(grid.width).stretch_to_fit_height(grid.height).move_to(grid)
+        heatmap.set_z_index(-1)
+
+        episodes = CachedDecimal(0, prefix=r"\text{Episodes: }", num_decimal_places=0, font_size=24)
+        episodes.next_to(grid, RIGHT, buff=0.5)
+        self.play(Transform(subtitle, new_subtitle), FadeIn(heatmap), FadeIn(episodes), run_time=0.33)
+
+        batch = ValueTracker(0)
+
+        def update_values(mob):
+            b = int(batch.get_value())
+            heatmap.pixel_array[:] = value_pixels(history["q"][b])
+            episodes.set_value(min(b * self.batch_size, self.n_episodes))
+
+        learning_driver = Dot().set_opacity(0)  # Invisible dot
+        learning_driver.add_updater(update_values)
+        self.add(learning_driver)
+        self.play(batch.animate.set_value(n_batches), run_time=3, rate_func=linear)
+        learning_driver.remove_updater(update_values)
+
+        # The learned policy: the best action in every cell, while the grid is small enough to read
+        final_q = history["q"][-1]
+        if max(self.n_rows, self.n_cols) <= 12:
+            policy = VGroup(*[
+                Arrow(ORIGIN, 0.35 * side * np.array([env.actions[a][1], -env.actions[a][0], 0]), buff=0,
+                      stroke_width=3, max_tip_length_to_length_ratio=0.35, color=WHITE).move_to(center(s))
+                for s, a in zip(np.flatnonzero(~env.terminal), final_q[~env.terminal].argmax(axis=1))
+                if s != env.start
+            ])
+            self.play(FadeIn(policy), run_time=0.33)
         self.wait(0.5)
 
         # --------------------------------------------------
         # Phase 4: Trial 2 (Exploitation & Success)
         # --------------------------------------------------
-        new_subtitle = Text("Trial 2: Exploitation (Optimal Path)", font_size=28).move_to(subtitle)
+        new_subtitle = cached_text("Trial 2: Exploitation (Optimal Path)", font_size=28).move_to(subtitle)
         self.play(Transform(subtitle, new_subtitle), run_time=0.33)
 
-        # The optimal path
-        optimal_path = [
-            grid[3][1].get_center(),
-            grid[3][2].get_center(),
-            grid[3][3].get_center(),
-            grid[2][3].get_center(),
-            grid[1][3].get_center(),
-            grid[0][3].get_center()  # Goal
-        ]
-
-        # Show the path first
-        path_line = VGroup()
-        last_pos = start_cell.get_center()
-        for pos in optimal_path:
-            path_line.add(Line(last_pos, pos, color=GREEN, stroke_width=3))
-            last_pos = pos
-
-        self.play(Create(path_line), run_time=0.33)
+        # The learned path, checked against the shortest one value iteration finds
+        optimal_path = greedy_path(env, final_q)
+        exact_path = greedy_path(env, optimal_q)
+        path_line = trace(optimal_path).set_stroke(GREEN, width=3)
+        path_steps = VGroup(
+            cached_text(f"Q-learning: {len(optimal_path) - 1} steps", font_size=20),
+            cached_text(f"Value iteration: {len(exact_path) - 1} steps", font_size=20),
+        ).arrange(DOWN, aligned_edge=LEFT).next_to(episodes, DOWN, buff=0.5, aligned_edge=LEFT)
+
+        self.play(FadeIn(path_steps), run_time=0.33)
 
         # Move the agent along the path
-        for pos in optimal_path:
-            self.play(agent.animate.move_to(pos), run_tine=0.1)
+        if len(optimal_path) > 1:
+            self.play(Create(path_line), run_time=0.33)
+            self.play(MoveAlongPath(agent, path_line), rate_func=linear, run_time=0.1 * (len(optimal_path) - 1))
 
-            # Show positive reward
-        reward = Text("+20", color=GREEN, font_size=36).next_to(agent, UP)
+        # Show its reward
+        reward = outcome(optimal_path).next_to(agent, UP)
         self.play(Write(reward), run_time=0.33)
 
         self.play(Indicate(agent, color=GREEN), Indicate(goal, color=GREEN), run_time=0.33)
-        self.wait(1)
\ No newline at end of file
+        self.wait(1)
@@ -0,0 +1,292 @@
+import argparse
+import ast
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from render_cache import RenderCache, scene_cache_key
+
+
+# Batch renderer for every Scene in this directory.
+# Usage: python render_all.py [-q l|m|h|p|k] [--jobs N] [--only SceneA SceneB ...] [--force]
+#                             [--chunk-seconds S]
+#
+# Scenes are discovered by parsing the modules (nothing is imported), then
+# rendered by separate `manim render` processes spread over a process pool.
+# The longest scenes are started first, so a full rebuild takes roughly as
+# long as the longest scene rather than the sum of all of them.
+# Scenes whose source, dependencies and config are unchanged since they were
+# last rendered are restored from the render cache instead (see render_cache.py).
+# Long scenes built on chunking.ChunkedScene are split into time chunks that
+# render on separate workers, and the pieces are joined with ffmpeg (no re-encode).
+
+HERE = Path(__file__).resolve().parent
+SCENE_BASES = {"Scene", "ThreeDScene", "MovingCameraScene", "ZoomedScene"}
+MANIFEST_NAME = "render_manifest.json"
+CHUNK_ENV = "MANIM_CHUNK"  # Read by chunking.current_chunk
+
+
+def _constant(node, names):
+    # Value of a literal, a known name or `self.<attr>`, else None
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return float(node.value)
+    if isinstance(node, ast.Name):
+        return names.get(node.id)
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self":
+        return names.get(node.attr)
+    return None
+
+
+def estimate_duration(class_node, inherited_names=None):
+    # Rough length of a scene in seconds, read from its `self.wait(...)` and
+    # `self.play(..., run_time=...)` calls. Used only to order the render queue.
+    names = dict(inherited_names or {})
+    for node in ast.walk(class_node):
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            key = target.id if isinstance(target, ast.Name) else getattr(target, "attr", None)
+            value = _constant(node.value, names)
+            if key and value is not None:
+                names[key] = value
+
+    total = 0.0
+    for node in ast.walk(class_node):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+            continue
+        if node.func.attr in ("wait", "chunked_wait"):
+            total += (_constant(node.args[0], names) or 1.0) if node.args else 1.0
+        elif node.func.attr == "play":
+            run_time = next((kw.value for kw in node.keywords if kw.arg == "run_time"), None)
+            total += (_constant(run_time, names) or 1.0) if run_time is not None else 1.0
+    return total, names
+
+
+def discover_scenes(directory=HERE):
+    # Every Scene subclass defined in the modules of `directory`, with its estimated length
+    scenes = []
+    for path in sorted(directory.glob("*.py")):
+        if path.name == Path(__file__).name:
+            continue
+        tree = ast.parse(path.read_text(), filename=str(path))
+        known = {}  # Scene classes in this module, so subclasses of them are found too
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            bases = [base.id for base in node.bases if isinstance(base, ast.Name)]
+            if not any(base in SCENE_BASES or base in known for base in bases):
+                continue
+            parent_names = next((known[base][1] for base in bases if base in known), None)
+            estimate, names = estimate_duration(node, parent_names)
+            if not estimate and parent_names is not None:
+                estimate = next(known[base][0] for base in bases if base in known)
+            # Scenes with a chunked_wait can be split over several workers
+            chunked = any(
+                isinstance(call, ast.Call) and getattr(call.func, "attr", None) == "chunked_wait"
+                for call in ast.walk(node)
+            ) or any(known[base][2] for base in bases if base in known)
+            known[node.name] = (estimate, names, chunked)
+            scenes.append({"module": path.name, "scene": node.name, "estimate": estimate, "chunked": chunked})
+    return scenes
+
+
+def find_output(media_dir, module, name):
+    # The newest rendered file with this name (videos, or images for last-frame renders)
+    candidates = [
+        p for folder in ("videos", "images")
+        for p in (media_dir / folder / Path(module).stem).rglob(f"{name}.*")
+        if "partial_movie_files" not in p.parts
+    ]
+    return max(candidates, key=lambda p: p.stat().st_mtime) if candidates else None
+
+
+def render_scene(module, scene, quality, media_dir, extra_args=(), chunk=(0, 1)):
+    # Render one scene, or one time chunk of it, in its own manim process. Runs inside a pool worker.
+    index, count = chunk
+    name = scene if count == 1 else f"{scene}_chunk{index:03d}"
+    command = [sys.executable, "-m", "manim", "render", f"-q{quality}", "--media_dir", str(media_dir),
+               *extra_args, module, scene]
+    env = dict(os.environ)
+    if count > 1:
+        command += ["-o", name]
+        env[CHUNK_ENV] = f"{index}/{count}"
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=HERE, env=env, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+
+    output = find_output(media_dir, module, name) if result.returncode == 0 else None
+    return {
+        "module": module,
+        "scene": scene,
+        "chunk": index,
+        "status": "ok" if result.returncode == 0 else "failed",
+        "seconds": round(seconds, 2),
+        "output": str(output) if output else None,
+        "error": None if result.returncode == 0 else (result.stderr or result.stdout)[-2000:],
+    }
+
+
+def concat_chunks(chunk_outputs, destination):
+    # Join the chunk videos without re-encoding: they share codec, size and frame rate
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is needed to join chunked renders")
+    list_path = Path(destination).with_suffix(".chunks.txt")
+    list_path.write_text("".join(f"file '{Path(p).resolve()}'\n" for p in chunk_outputs))
+    try:
+        subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(list_path),
+                        "-c", "copy", str(destination)], check=True, capture_output=True, text=True)
+    finally:
+        list_path.unlink(missing_ok=True)
+    for path in chunk_outputs:
+        Path(path).unlink(missing_ok=True)
+
+
+def merge_chunks(scene, chunk_results):
+    # One result for a scene rendered in chunks; `seconds` is the summed render time
+    chunk_results = sorted(chunk_results, key=lambda r: r["chunk"])
+    result = {
+        "module": chunk_results[0]["module"],
+        "scene": scene,
+        "chunks": len(chunk_results),
+        "status": "ok",
+        "seconds": round(sum(r["seconds"] for r in chunk_results), 2),
+        "output": None,
+        "error": None,
+    }
+    errors = [r["error"] or f"chunk {r['chunk']} produced no output" for r in chunk_results if not r["output"]]
+    if errors:
+        result.update(status="failed", error="\n".join(errors)[-2000:])
+        return result
+
+    first = Path(chunk_results[0]["output"])
+    destination = first.with_name(f"{scene}{first.suffix}")
+    try:
+        concat_chunks([r["output"] for r in chunk_results], destination)
+    except (RuntimeError, subprocess.CalledProcessError) as e:
+        result.update(status="failed", error=str(getattr(e, "stderr", None) or e)[-2000:])
+        return result
+    result["output"] = str(destination)
+    return result
+
+
+def load_manifest(media_dir):
+    path = media_dir / MANIFEST_NAME
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every scene in this directory in parallel.")
+    parser.add_argument("-q", "--quality", default="h", choices=list("lmhpk"))
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--only", nargs="+", metavar="SCENE", help="Render only these scenes")
+    parser.add_argument("--media-dir", type=Path, default=HERE / "media")
+    parser.add_argument("--force", action="store_true", help="Render every scene, even unchanged ones")
+    parser.add_argument("--cache-size", type=float, default=4.0, help="Render cache size limit in GB")
+    parser.add_argument("--chunk-seconds", type=float, default=60.0,
+                        help="Split chunkable scenes expected to take longer than this (0 disables)")
+    parser.add_argument("--dry-run", action="store_true", help="List the render queue and exit")
+    args = parser.parse_args()
+
+    scenes = discover_scenes()
+    if args.only:
+        scenes = [s for s in scenes if s["scene"] in args.only]
+
+    # Longest first: measured times from the last run win over static estimates
+    previous = load_manifest(args.media_dir).get("scenes", {})
+    for s in scenes:
+        measured = previous.get(s["scene"], {}).get("seconds")
+        s["expected"] = measured if measured is not None else s["estimate"]
+        s["key"] = scene_cache_key(s["module"], s["scene"], args.quality)
+    scenes.sort(key=lambda s: s["expected"], reverse=True)
+
+    cache_dir = args.media_dir / "render_cache"
+    cache = RenderCache(cache_dir, max_bytes=int(args.cache_size * 1024 ** 3))
+
+    if args.dry_run:
+        for s in scenes:
+            cached = cache.get(s["key"])[0] is not None and not args.force
+            print(f"{s['expected']:>8.1f}s  {s['module']:<35} {s['scene']:<30} {'cached' if cached else ''}")
+        return
+
+    start = time.perf_counter()
+    results = {}
+
+    # Unchanged scenes are copied back from the cache; only the rest go to the pool
+    pending = []
+    for s in scenes:
+        record = None if args.force else cache.restore(s["key"])
+        if record is None:
+            pending.append(s)
+            continue
+        results[s["scene"]] = {
+            "module": s["module"],
+            "scene": s["scene"],
+            "status": "cached",
+            "seconds": record["seconds"],
+            "output": record["output"],
+            "error": None,
+            "key": s["key"],
+        }
+        print(f"[cached] {s['scene']:<30}")
+
+    # One task per scene, or per time chunk for long chunkable scenes; longest tasks first
+    tasks = []
+    for s in pending:
+        count = 1
+        if s["chunked"] and args.chunk_seconds > 0:
+            count = max(1, min(args.jobs, math.ceil(s["expected"] / args.chunk_seconds)))
+        s["chunks"] = count
+        tasks += [(s["expected"] / count, s, (index, count)) for index in range(count)]
+    tasks.sort(key=lambda task: task[0], reverse=True)
+
+    def finish(s, result):
+        result["key"] = s["key"]
+        if result["status"] == "ok" and result["output"]:
+            cache.put(s["key"], result["output"], module=s["module"], scene=s["scene"], seconds=result["seconds"])
+        results[s["scene"]] = result
+        print(f"[{result['status']:>6}] {result['scene']:<30} {result['seconds']:>8.1f}s")
+
+    chunk_results = {s["scene"]: [] for s in pending}
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {
+            pool.submit(render_scene, s["module"], s["scene"], args.quality, args.media_dir, chunk=chunk): s
+            for _, s, chunk in tasks
+        }
+        for future in as_completed(futures):
+            s, result = futures[future], future.result()
+            if s["chunks"] == 1:
+                finish(s, result)
+                continue
+            chunk_results[s["scene"]].append(result)
+            if len(chunk_results[s["scene"]]) == s["chunks"]:
+                finish(s, merge_chunks(s["scene"], chunk_results[s["scene"]]))
+
+    wall_time = time.perf_counter() - start
+    manifest = {
+        "quality": args.quality,
+        "jobs": args.jobs,
+        "wall_seconds": round(wall_time, 2),
+        # Scenes left out of this run (e.g. with --only) keep their last record and measured time
+        "scenes": {**previous, **results},
+    }
+    args.media_dir.mkdir(parents=True, exist_ok=True)
+    (args.media_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+
+    failed = [r["scene"] for r in results.values() if r["status"] == "failed"]
+    rendered = [r for r in results.values() if r["status"] == "ok"]
+    total = sum(r["seconds"] for r in rendered)
+    print(f"\nRendered {len(rendered)}/{len(results)} scenes in {wall_time:.1f}s "
+          f"(sum of scene times {total:.1f}s, {len(results) - len(rendered) - len(failed)} cached)")
+    if failed:
+        print("Failed: " + ", ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
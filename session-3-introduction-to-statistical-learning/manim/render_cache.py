@@ -0,0 +1,154 @@
+import ast
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+
+# Content-addressed cache of finished scene renders, used by render_all.py.
+# A scene's key is the hash of everything that can change its output:
+#   - the source of the scene class and of every class in its module that it uses
+#     (base classes, helper classes), directly or through other code it uses,
+#   - the module-level code around it (imports, helpers, constants, seeds),
+#   - the full source of every local module it imports, followed transitively,
+#   - manim.cfg (frame rate, resolution, seed, ...), the quality flag and the manim version.
+# Editing one scene therefore only invalidates that scene, while editing a shared
+# module such as nbody.py invalidates every scene that uses it.
+#
+# Within a scene that did change, manim's own partial movie cache reuses every
+# play() whose hash is unchanged, so only the animations from the edited point
+# on are encoded again (see max_files_cached and seed in manim.cfg).
+
+HERE = Path(__file__).resolve().parent
+
+
+def _local_imports(tree, directory):
+    # Names of the modules in `directory` imported by a parsed module
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    return {name for name in names if (directory / f"{name}.py").exists()}
+
+
+def _dependency_sources(tree, directory):
+    # Full source of every local module reachable through imports, in a stable order
+    seen, pending = {}, sorted(_local_imports(tree, directory))
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        source = (directory / f"{name}.py").read_text()
+        seen[name] = source
+        pending.extend(sorted(_local_imports(ast.parse(source), directory) - seen.keys()))
+    return [(name, seen[name]) for name in sorted(seen)]
+
+
+def _scene_sources(tree, source, scene):
+    # Source of the scene class, all module-level code that is not a class definition, and
+    # every other class any of that code names (base classes, helpers such as LorenzEnsemble),
+    # followed transitively. Other scenes in the module are left out.
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    wanted = {scene} if scene in classes else set()
+    pending = [scene] + [node for node in tree.body if not isinstance(node, ast.ClassDef)]
+    while pending:
+        item = pending.pop()
+        node = classes.get(item) if isinstance(item, str) else item
+        if node is None:
+            continue
+        for name in {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}:
+            if name in classes and name not in wanted:
+                wanted.add(name)
+                pending.append(name)
+
+    return [
+        ast.get_source_segment(source, node)
+        for node in tree.body
+        if not isinstance(node, ast.ClassDef) or node.name in wanted
+    ]
+
+
+def _manim_version():
+    # Read from the package metadata, so computing a key never imports manim
+    try:
+        from importlib.metadata import version
+        return version("manim")
+    except Exception:
+        return None
+
+
+def scene_cache_key(module, scene, quality, extra_args=(), directory=HERE):
+    source = (directory / module).read_text()
+    tree = ast.parse(source)
+    config_path = directory / "manim.cfg"
+    parts = {
+        "scene": scene,
+        "sources": _scene_sources(tree, source, scene),
+        "dependencies": _dependency_sources(tree, directory),
+        "config": config_path.read_text() if config_path.exists() else "",
+        "quality": quality,
+        "extra_args": list(extra_args),
+        "manim": _manim_version(),
+    }
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class RenderCache:
+    # Finished renders stored as <key><suffix> next to a small <key>.json record.
+    # Hits refresh the entry's modification time, and once the store grows past
+    # `max_bytes` the least recently used renders are dropped first.
+    def __init__(self, cache_dir, max_bytes=4 * 1024 ** 3):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _record_path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        # The cached render for `key` (as a path inside the store) and its record, or (None, None)
+        record_path = self._record_path(key)
+        if not record_path.exists():
+            return None, None
+        record = json.loads(record_path.read_text())
+        path = self.cache_dir / f"{key}{record['suffix']}"
+        if not path.exists():
+            return None, None
+        os.utime(path)  # Mark as recently used
+        os.utime(record_path)
+        return path, record
+
+    def restore(self, key, destination=None):
+        # Copy a cached render back to where manim would have written it
+        path, record = self.get(key)
+        if path is None:
+            return None
+        destination = Path(destination or record["output"])
+        if not destination.exists() or destination.stat().st_size != path.stat().st_size:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, destination)
+        return record
+
+    def put(self, key, output, **record):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        output = Path(output)
+        path = self.cache_dir / f"{key}{output.suffix}"
+        # Copy to a temporary file first so concurrent workers never see a partial entry
+        tmp_path = path.with_name(f"{key}.{os.getpid()}.tmp{output.suffix}")
+        shutil.copyfile(output, tmp_path)
+        tmp_path.replace(path)
+        self._record_path(key).write_text(json.dumps({"suffix": output.suffix, "output": str(output), **record}))
+        self.evict()
+
+    def evict(self):
+        entries = [p for p in self.cache_dir.iterdir() if p.suffix != ".json" and ".tmp." not in p.name]
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+            self._record_path(path.stem).unlink(missing_ok=True)
@@ -0,0 +1,73 @@
+import numpy as np
+
+
+# Batched stochastic differential equation engine for the SDE scenes.
+# An SDE  dX_t = a(X_t, t) dt + b(X_t, t) dW_t  is described by its drift a and
+# diffusion b. Both are callables taking (x, t) with x an array over all paths.
+
+
+def brownian(sigma=1.0):
+    # dX_t = sigma dW_t
+    return (
+        lambda x, t: np.zeros_like(x),
+        lambda x, t: np.full_like(x, sigma),
+    )
+
+
+def geometric_brownian_motion(mu=0.05, sigma=0.3):
+    # dX_t = mu X_t dt + sigma X_t dW_t
+    return (
+        lambda x, t: mu * x,
+        lambda x, t: sigma * x,
+    )
+
+
+def ornstein_uhlenbeck(theta=1.0, mean=0.0, sigma=0.5):
+    # dX_t = theta (mean - X_t) dt + sigma dW_t  (mean-reverting)
+    return (
+        lambda x, t: theta * (mean - x),
+        lambda x, t: np.full_like(x, sigma),
+    )
+
+
+def euler_maruyama(drift, diffusion, x0, t_end, n_steps, n_paths, seed=None):
+    # Simulate `n_paths` sample paths on a grid of `n_steps` equal steps over [0, t_end].
+    # All Brownian increments (steps x paths) are drawn in one call from a seeded
+    # Generator, and each step advances every path at once.
+    # Returns (t, X) with t of shape (n_steps + 1,) and X of shape (n_steps + 1, n_paths).
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    dt = t_end / n_steps
+    t = np.linspace(0, t_end, n_steps + 1)
+    dW = rng.normal(scale=np.sqrt(dt), size=(n_steps, n_paths))
+
+    X = np.empty((n_steps + 1, n_paths))
+    X[0] = x0
+    for k in range(n_steps):
+        X[k + 1] = X[k] + drift(X[k], t[k]) * dt + diffusion(X[k], t[k]) * dW[k]
+    return t, X
+
+
+def brownian_path_chunks(chunk_steps, dt, total_time=None, x0=0.0, sigma=1.0, seed=None):
+    # Lazily yield a Brownian path as (t, W) segments of `chunk_steps` steps each.
+    # Each segment starts at the last sample of the previous one, so they join up.
+    # Only one chunk is ever held in memory, and the Generator carries its state
+    # from chunk to chunk: for a given seed the path does not depend on the chunk size.
+    # With total_time=None the path goes on forever.
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    n_total = None if total_time is None else int(round(total_time / dt))
+    step, x = 0, x0
+
+    while n_total is None or step < n_total:
+        n = chunk_steps if n_total is None else min(chunk_steps, n_total - step)
+        W = np.empty(n + 1)
+        W[0] = x
+        np.cumsum(rng.normal(scale=sigma * np.sqrt(dt), size=n), out=W[1:])
+        W[1:] += x
+        t = (step + np.arange(n + 1)) * dt
+        yield t, W
+        step, x = step + n, W[-1]
+
+
+def path_statistics(X, quantiles=(0.05, 0.95)):
+    # Mean and quantile band across paths at every time step
+    return X.mean(axis=1), np.quantile(X, quantiles, axis=1)
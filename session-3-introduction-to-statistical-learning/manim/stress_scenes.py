@@ -0,0 +1,20 @@
+from deterministic_vs_stochastic import SDE_Scene
+from lorentz_attractor import LorenzAttractor
+from orbital_mechanics import ThreeBodyProblemLoop
+
+
+# Production-scale variants of the physics scenes, used by bench_scenes.py.
+# They only change class attributes, so they exercise exactly the same code.
+
+
+class LorenzAttractorStress(LorenzAttractor):
+    num_particles = 1000
+    duration = 20
+
+
+class ThreeBodyProblemLoopStress(ThreeBodyProblemLoop):
+    num_bodies = 200
+
+
+class SDE_SceneStress(SDE_Scene):
+    num_paths = 500
@@ -1,72 +1,116 @@
 from manim import *
 import numpy as np
 
+from contours import contour_image
+from glyph_cache import CachedDecimal, cached_text
+from point_cloud import axes_to_screen
+from pso import BENCHMARKS, ParticleSwarm, shifted
+
 
 class SwarmOptimizationScene(Scene):
+    # Benchmark function ("rastrigin", "rosenbrock" or "sphere") and the swarm run on it
+    objective = "rastrigin"
+    num_particles = 2000
+    iterations = 60
+    seed = 0
+
     def construct(self):
         # 0. Title and Environment Setup
-        title = Text("Swarm Optimization (PSO)", font_size=36).to_edge(UP)
+        title = cached_text("Swarm Optimization (PSO)", font_size=36).to_edge(UP)
         self.play(Write(title), run_time=0.33)
 
         # Create a "search space" (a simple plane)
+        x_range, y_range = (-8, 8), (-5, 5)
         axes = NumberPlane(
-            x_range=(-8, 8, 1),
-            y_range=(-5, 5, 1),
+            x_range=(*x_range, 1),
+            y_range=(*y_range, 1),
             x_length=12,
             y_length=7,
             axis_config={"include_tip": False, "color": GREY_B},
+            background_line_style={"stroke_opacity": 0.3},
         ).add_coordinates()
 
+        # The benchmark function, moved so that its global optimum sits at (5, 2)
+        function, function_optimum = BENCHMARKS[self.objective]
+        optimum_xy = np.array([5.0, 2.0])
+        objective = shifted(function, optimum_xy - function_optimum)
+        surface = contour_image(axes, objective, x_range, y_range)
+
         # Define the "Global Optimum" - the target
-        optimum_pos = axes.c2p(5, 2)
-        optimum = Star(color=GREEN, fill_opacity=1).scale(0.4).move_to(optimum_pos)
-        optimum_label = Text("Optimum", font_size=20).next_to(optimum, DOWN)
+        optimum_pos = axes.c2p(*optimum_xy)
+        optimum = Star(color=GREEN, fill_opacity=1).scale(0.4).move_to(optimum_pos).set_z_index(2)
+        optimum_label = cached_text("Optimum", font_size=20).next_to(optimum, DOWN).set_z_index(2)
 
-        self.play(Create(axes), FadeIn(optimum), Write(optimum_label), run_time=0.33)
+        self.play(FadeIn(surface), Create(axes), FadeIn(optimum), Write(optimum_label), run_time=0.33)
         self.wait(1)
 
+        # The whole optimization is run up front; the scene plays back its snapshots
+        swarm_engine = ParticleSwarm(objective, self.num_particles, [x_range, y_range], seed=self.seed)
+        history = swarm_engine.run(self.iterations)
+        positions = axes_to_screen(axes, history["positions"][..., 0], history["positions"][..., 1])
+        pbest = axes_to_screen(axes, history["pbest"][..., 0], history["pbest"][..., 1])
+        gbest = axes_to_screen(axes, history["gbest"][:, 0], history["gbest"][:, 1])
+
         # --------------------------------------------------
         # Phase 1: Initialize Swarm (Particles)
         # --------------------------------------------------
-        subtitle = Text("Iteration 1: Particles Explore", font_size=28).next_to(title, DOWN, buff=0.5)
+        subtitle = cached_text("Iteration 1: Particles Explore", font_size=28).next_to(title, DOWN, buff=0.5)
         self.play(Write(subtitle))
 
-        # Create 5 particles (agents) at random spots
-        particles = VGroup(*[
-            Dot(color=WHITE, radius=0.1).move_to(axes.c2p(np.random.uniform(-7, 0), np.random.uniform(-4, 4)))
-            for _ in range(5)
-        ])
-        self.play(LaggedStart(*[FadeIn(p, scale=1.5) for p in particles], lag_ratio=0.1))
+        # The whole swarm is a single point cloud; five particles are followed as dots
+        swarm = PMobject(stroke_width=2).add_points(positions[0], color=WHITE)
+        tracked = np.arange(5)
+        particles = VGroup(*[Dot(color=WHITE, radius=0.1).move_to(positions[0][i]) for i in tracked]).set_z_index(3)
+        self.play(FadeIn(swarm), LaggedStart(*[FadeIn(p, scale=1.5) for p in particles], lag_ratio=0.1))
+
+        iteration = ValueTracker(0)
+
+        def swarm_at(t):
+            # Positions between two snapshots, so the playback is smooth at any frame rate
+            i = min(int(t), self.iterations - 1)
+            alpha = min(t - i, 1.0)
+            return (1 - alpha) * positions[i] + alpha * positions[i + 1]
+
+        def update_swarm(mob):
+            points = swarm_at(iteration.get_value())
+            swarm.set_points(points)
+            for dot, i in zip(particles, tracked):
+                dot.move_to(points[i])
+
+        swarm_driver = Dot().set_opacity(0)  # Invisible dot
+        swarm_driver.add_updater(update_swarm)
+        self.add(swarm_driver)
+
+        # A few real iterations, so the personal and global bests mean something
+        self.play(iteration.animate.set_value(3), run_time=2, rate_func=linear)
 
         # --------------------------------------------------
         # Phase 2: Update Velocities
         # --------------------------------------------------
-        new_subtitle = Text("Particles update based on 'best' positions", font_size=28).move_to(subtitle)
+        new_subtitle = cached_text("Particles update based on 'best' positions", font_size=28).move_to(subtitle)
         self.play(Transform(subtitle, new_subtitle))
 
-        # 1. Show "Personal Best" (pbest)
-        # We'll create "ghosts" of their best positions
+        # 1. Show "Personal Best" (pbest): the best place each particle has visited so far
         pbest_markers = VGroup(*[
-            Dot(color=BLUE, radius=0.05, fill_opacity=0.5).move_to(p.get_center() + RIGHT * 0.5)
-            for p in particles
-        ])
+            Dot(color=BLUE, radius=0.05, fill_opacity=0.5).move_to(pbest[3][i])
+            for i in tracked
+        ]).set_z_index(3)
         pbest_arrows = VGroup(*[
             Arrow(p.get_center(), pb.get_center(), buff=0.1, max_tip_length_to_length_ratio=0.1)
             for p, pb in zip(particles, pbest_markers)
-        ])
-        pbest_label = Text("Personal Best", color=BLUE, font_size=20).to_edge(RIGHT, buff=1.0).shift(UP * 1)
+        ]).set_z_index(3)
+        pbest_label = cached_text("Personal Best", color=BLUE, font_size=20).to_edge(RIGHT, buff=1.0).shift(UP * 1)
 
         self.play(Write(pbest_label), Create(pbest_markers), Create(pbest_arrows))
         self.wait(1)
 
-        # 2. Show "Global Best" (gbest)
-        # The gbest is the pbest closest to the optimum (we'll just pick one)
-        gbest_marker = Star(color=YELLOW, fill_opacity=0.7).scale(0.3).move_to(pbest_markers[2].get_center())
+        # 2. Show "Global Best" (gbest): the best personal best of the whole swarm
+        gbest_marker = Star(color=YELLOW, fill_opacity=0.7).scale(0.3).move_to(gbest[3]).set_z_index(3)
         gbest_arrows = VGroup(*[
             Arrow(p.get_center(), gbest_marker.get_center(), buff=0.1, color=YELLOW, max_tip_length_to_length_ratio=0.1)
             for p in particles
-        ])
-        gbest_label = Text("Global Best", color=YELLOW, font_size=20).next_to(pbest_label, DOWN)
+        ]).set_z_index(3)
+        gbest_label = cached_text("Global Best", color=YELLOW, font_size=20).next_to(pbest_label, DOWN)
 
         self.play(Write(gbest_label), FadeIn(gbest_marker, scale=1.5), Create(gbest_arrows))
         self.wait(1.5)
@@ -74,22 +118,29 @@ class SwarmOptimizationScene(Scene):
         # --------------------------------------------------
         # Phase 3: Move Particles & Converge
         # --------------------------------------------------
-        new_subtitle = Text("Iteration 2: Particles Converge", font_size=28).move_to(subtitle)
+        new_subtitle = cached_text("The swarm converges", font_size=28).move_to(subtitle)
+        counter = CachedDecimal(4, prefix=r"\text{Iteration: }", num_decimal_places=0, font_size=24)
+        best_value = CachedDecimal(history["gbest_value"][3], prefix=r"f(g_{best}) =", num_decimal_places=4,
+                                   font_size=24)
+        readouts = VGroup(counter, best_value).arrange(DOWN, aligned_edge=LEFT).to_corner(DR, buff=0.5)
         self.play(Transform(subtitle, new_subtitle),
-                  FadeOut(pbest_markers, pbest_arrows, gbest_arrows, pbest_label, gbest_label))
-
-        # Particles move towards a mix of pbest and gbest (and their own momentum)
-        # We'll just animate them all moving towards the global optimum
-        self.play(
-            particles.animate.move_to(optimum_pos).shift(LEFT * 1.5),
-            FadeOut(gbest_marker)  # GBest is now the optimum
-        )
+                  FadeOut(pbest_markers, pbest_arrows, gbest_arrows, pbest_label, gbest_label),
+                  FadeIn(readouts))
+
+        # Each particle is pulled by its momentum, its personal best and the global best;
+        # the global best marker and the readouts follow the engine's snapshots
+        def update_bests(mob):
+            i = min(int(iteration.get_value()), self.iterations)
+            gbest_marker.move_to(gbest[i])
+            counter.set_value(i + 1)
+            best_value.set_value(history["gbest_value"][i])
+
+        swarm_driver.add_updater(update_bests)
+        self.play(iteration.animate.set_value(self.iterations), run_time=8, rate_func=linear)
         self.wait(1)
 
         # Final convergence
-        new_subtitle = Text("Iteration 3: Convergence", font_size=28).move_to(subtitle)
-        self.play(Transform(subtitle, new_subtitle))
-
-        self.play(particles.animate.move_to(optimum_pos))
+        new_subtitle = cached_text(f"Iteration {self.iterations + 1}: Convergence", font_size=28).move_to(subtitle)
+        self.play(Transform(subtitle, new_subtitle), FadeOut(gbest_marker))
         self.play(Indicate(particles, color=GREEN), Indicate(optimum, color=GREEN))
-        self.wait(3)
\ No newline at end of file
+        self.wait(3)
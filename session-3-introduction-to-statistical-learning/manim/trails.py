@@ -0,0 +1,68 @@
+from manim import *
+import numpy as np
+
+
+class FadingTrail(VMobject):
+    # A fading tail behind a moving point, drawn as a single path.
+    # Works like manim's TracedPath, but the points live in a fixed-size ring
+    # buffer: once the tail is full, each new point overwrites the oldest one.
+    # The fade is a precomputed opacity gradient from the oldest point (transparent)
+    # to the newest one (opaque), so a frame never creates or removes mobjects.
+    def __init__(
+        self,
+        traced_point_func,
+        stroke_color=WHITE,
+        stroke_width=2,
+        max_points=40,
+        min_distance=0.05,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.traced_point_func = traced_point_func
+        self.min_distance = min_distance
+
+        # Ring buffer of points: `head` is the next slot to write
+        self.buffer = np.zeros((max_points + 1, 3))
+        self.head = 0
+        self.count = 0
+
+        self.set_stroke(stroke_color, width=stroke_width, opacity=list(np.linspace(0, 1, 8)))
+        self.add_updater(lambda m: m.update_trail())
+
+    def ordered_points(self):
+        # Buffer contents from oldest to newest
+        if self.count < len(self.buffer):
+            return self.buffer[:self.count]
+        return np.concatenate([self.buffer[self.head:], self.buffer[:self.head]])
+
+    def last_point(self):
+        return self.buffer[self.head - 1]
+
+    def push(self, point):
+        self.buffer[self.head] = point
+        self.head = (self.head + 1) % len(self.buffer)
+        self.count = min(self.count + 1, len(self.buffer))
+
+    def update_trail(self):
+        current_pos = self.traced_point_func()
+
+        # Only add a new point if the traced point has moved
+        if self.count == 0 or np.linalg.norm(current_pos - self.last_point()) > self.min_distance:
+            self.push(current_pos)
+            points = self.ordered_points()
+            if len(points) > 1:
+                self.set_points_as_corners(points)
+        return self
+
+    def reset(self):
+        # Drop the whole tail, e.g. when the traced point jumps back to its start
+        self.head = 0
+        self.count = 0
+        self.clear_points()
+        return self
+
+    def get_gradient_start_and_end_points(self):
+        # Run the opacity gradient from the oldest point to the newest one
+        if self.count < 2:
+            return super().get_gradient_start_and_end_points()
+        return self.buffer[(self.head - self.count) % len(self.buffer)], self.last_point()